@@ -1,19 +1,14 @@
 
-from langgraph.graph import StateGraph, END
+import threading
 from typing import TypedDict, List, Dict, Optional
-from backend.ai_core.agent.nodes import (
-    receive_user_input,
-    infer_user_role,
-    call_retrieve_rag_context,
-    generate_response,
-    update_memory,
-    return_response,
-)
 
 class AgentState(TypedDict):
     input: str
+    # Keyword hits by category for this input, from one matcher pass in receive_user_input
+    keywords: Dict[str, list]
     user_name: str
     history: List[Dict[str, str]]
+    summary: str
     role_confidence: Dict[str, float]
     is_recruiter: bool
     retrieved_docs: List[str]
@@ -25,7 +20,19 @@ class AgentState(TypedDict):
 def create_chatbot_graph():
     """
     Creates and configures the chatbot's graph.
+    langgraph and the node modules (Gemini SDK, FAISS) are imported here
+    so importing the API does not pay for them.
     """
+    from langgraph.graph import StateGraph, END
+    from backend.ai_core.agent.nodes import (
+        receive_user_input,
+        infer_user_role,
+        call_retrieve_rag_context,
+        generate_response,
+        update_memory,
+        return_response,
+    )
+
     # Define the state machine
     workflow = StateGraph(AgentState)
 
@@ -48,3 +55,22 @@ def create_chatbot_graph():
 
     # Compile the graph
     return workflow.compile()
+
+
+_graph_lock = threading.Lock()
+
+
+def get_chatbot_graph(app_state):
+    """
+    Returns the compiled graph cached on app.state, building it on first use.
+    Safe to call from the warm-up thread and request handlers concurrently.
+    """
+    graph = getattr(app_state, "graph", None)
+    if graph is not None:
+        return graph
+    with _graph_lock:
+        graph = getattr(app_state, "graph", None)
+        if graph is None:
+            graph = create_chatbot_graph()
+            app_state.graph = graph
+    return graph
@@ -7,14 +7,17 @@ from backend.ai_core.components.rag_retriever import retrieve_rag_context
 from backend.ai_core.components.response_generator import generate_ai_response
 from backend.ai_core.components.memory_updater import update_conversation_memory
 from backend.ai_core.utils.logger import log_interaction
+from backend.ai_core.utils.chat_metrics import stage
 
 logger = logging.getLogger(__name__)
 
 def receive_user_input(state: Dict) -> Dict:
-    return process_user_input(state)
+    with stage("input"):
+        return process_user_input(state)
 
 def infer_user_role(state: Dict) -> Dict:
-    return analyze_user_role(state)
+    with stage("role"):
+        return analyze_user_role(state)
 
 async def call_retrieve_rag_context(state: Dict) -> Dict:
     return await retrieve_rag_context(state)
@@ -24,7 +27,8 @@ async def generate_response(state: Dict) -> Dict:
     return await asyncio.to_thread(generate_ai_response, state)
 
 def update_memory(state: Dict) -> Dict:
-    return update_conversation_memory(state)
+    with stage("memory"):
+        return update_conversation_memory(state)
 
 def return_response(state: Dict) -> Dict:
     final_response = state.get("response", "No response generated.")
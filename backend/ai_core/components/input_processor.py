@@ -1,5 +1,6 @@
 import logging
 from typing import Dict
+from backend.ai_core.utils.keyword_matcher import keyword_matcher
 
 logger = logging.getLogger(__name__)
 
@@ -26,6 +27,8 @@ def process_user_input(state: Dict) -> Dict:
         state["history"] = []
     if not state.get("user_name"):
         state["user_name"] = "there"
+    # One pass over the input for every keyword list; role and retrieval read the hits from here
+    state["keywords"] = keyword_matcher.find(state.get("input") or "")
 
-    logger.info(f"State initialized for user: {state.get('user_name', 'unknown')}")
+    logger.debug(f"State initialized for user: {state.get('user_name', 'unknown')}")
     return state
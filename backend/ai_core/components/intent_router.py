@@ -0,0 +1,250 @@
+"""
+Nearest-centroid intent routing for RAG metadata filters.
+
+Each intent has a handful of labelled example questions. On first use they are
+embedded with the retrieval model and averaged into one unit-length centroid
+per intent. A query is routed with the vector already computed for the FAISS
+search, so routing costs a small matrix product and no extra model call.
+
+The cosine similarities become weights through a softmax. Intents are taken in
+order of weight until INTENT_FILTER_COVERAGE is reached (at most
+INTENT_MAX_TYPES of them), and their document types are unioned into a single
+filter. No filter is applied when the best similarity is below
+INTENT_MIN_SIMILARITY, or when the weight is spread over too many intents to
+reach the coverage. An unfiltered search is cheaper than a wrong partition.
+"""
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import structlog
+
+from backend.config import (
+    INTENT_FILTER_COVERAGE,
+    INTENT_MAX_TYPES,
+    INTENT_MIN_SIMILARITY,
+    INTENT_ROUTER_ENABLED,
+    INTENT_TEMPERATURE,
+)
+
+logger = structlog.get_logger(__name__)
+
+RETRY_BASE_SECONDS = 30.0
+RETRY_MAX_SECONDS = 600.0
+
+EXPERIENCE_TYPES = ["experience", "work_experience", "responsibility"]
+
+# Document types per intent (the "type" metadata written by the knowledge loaders), with example questions
+INTENTS: Dict[str, Dict[str, List[str]]] = {
+    "current_role": {
+        "types": EXPERIENCE_TYPES,
+        "examples": [
+            "Where are you working right now?",
+            "What is your current job?",
+            "What do you do at your current company?",
+            "What is your present role and title?",
+            "Which company do you work for at the moment?",
+        ],
+    },
+    "experience": {
+        "types": EXPERIENCE_TYPES,
+        "examples": [
+            "What is your work experience?",
+            "Where have you worked before?",
+            "Tell me about your previous jobs and internships.",
+            "What were your responsibilities in your last position?",
+            "How many years of professional experience do you have?",
+            "Describe your career history.",
+        ],
+    },
+    "project": {
+        "types": ["project"],
+        "examples": [
+            "What projects have you built?",
+            "Show me your portfolio.",
+            "Tell me about your credit scoring project.",
+            "Which GitHub repositories are you most proud of?",
+            "What have you worked on in machine learning?",
+            "Describe a side project you made.",
+        ],
+    },
+    "skills": {
+        "types": ["skills"],
+        "examples": [
+            "What are your technical skills?",
+            "Which programming languages do you know?",
+            "What technologies and frameworks do you use?",
+            "Are you good at Python and deep learning?",
+            "What is your tech stack?",
+        ],
+    },
+    "certificate": {
+        "types": ["certificate"],
+        "examples": [
+            "What certifications do you have?",
+            "Are you certified in anything?",
+            "Which courses have you completed with a certificate?",
+            "List your professional certificates.",
+        ],
+    },
+    "education": {
+        "types": ["education"],
+        "examples": [
+            "What did you study?",
+            "Which university did you attend?",
+            "What degree do you have?",
+            "Tell me about your education background.",
+            "When did you graduate?",
+        ],
+    },
+    "moment": {
+        "types": ["moment"],
+        "examples": [
+            "What are your most memorable moments?",
+            "Show me your gallery.",
+            "What was a proud moment in your life?",
+            "Share a highlight from your journey.",
+        ],
+    },
+    "friend": {
+        "types": ["friend", "friends"],
+        "examples": [
+            "Who is your best friend?",
+            "Tell me about your friends.",
+            "Who are the people closest to you?",
+            "Are you in a relationship?",
+        ],
+    },
+    "hobbies": {
+        "types": ["hobbies", "books"],
+        "examples": [
+            "What are your hobbies?",
+            "What do you do for fun?",
+            "What are your interests outside of work?",
+            "What is your favorite book?",
+            "Do you play any sports?",
+        ],
+    },
+    "spiritual_beliefs": {
+        "types": ["spiritual_beliefs"],
+        "examples": [
+            "What is your religion?",
+            "Are you a person of faith?",
+            "What principles guide your life?",
+            "What do you believe in spiritually?",
+        ],
+    },
+    "contact": {
+        "types": ["contact"],
+        "examples": [
+            "How can I contact you?",
+            "What is your email address?",
+            "How do I reach out to you?",
+            "Can I get your LinkedIn or phone number?",
+        ],
+    },
+}
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    return matrix / np.where(norms == 0, 1.0, norms)
+
+
+class IntentRouter:
+    def __init__(self, intents: Dict[str, Dict[str, List[str]]] = INTENTS):
+        self.intents = intents
+        self.labels = list(intents)
+        self._centroids: Optional[np.ndarray] = None
+        # After a failed build, the next attempt waits RETRY_BASE_SECONDS, doubling up to RETRY_MAX_SECONDS
+        self._failures = 0
+        self._retry_at = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def ready(self) -> bool:
+        return self._centroids is not None
+
+    def fit(self, embed_documents) -> None:
+        """Embed the example questions (one batch) and build the centroids."""
+        texts: List[str] = []
+        owners: List[int] = []
+        for i, label in enumerate(self.labels):
+            for example in self.intents[label]["examples"]:
+                texts.append(example)
+                owners.append(i)
+        vectors = _normalize(np.asarray(embed_documents(texts), dtype=np.float32))
+        owner_index = np.asarray(owners)
+        centroids = np.stack([vectors[owner_index == i].mean(axis=0) for i in range(len(self.labels))])
+        self._centroids = _normalize(centroids)
+        logger.info(f"Intent router ready: {len(self.labels)} intents from {len(texts)} examples")
+
+    def ensure_ready(self, blocking: bool = True) -> bool:
+        """
+        Build the centroids with the retrieval model if they are not built yet
+        (blocking: embeds the examples). False when they cannot be built now;
+        with blocking=False also while another thread is building them.
+        """
+        if not INTENT_ROUTER_ENABLED:
+            return False
+        if self._centroids is not None:
+            return True
+        if time.monotonic() < self._retry_at:
+            return False
+        if not self._lock.acquire(blocking=blocking):
+            return False
+        try:
+            if self._centroids is None and time.monotonic() >= self._retry_at:
+                from backend.vector_db.faiss_manager import faiss_manager
+
+                try:
+                    embeddings = faiss_manager.embeddings
+                    if embeddings is None:
+                        raise RuntimeError("embedding model is not available")
+                    self.fit(embeddings.embed_documents)
+                    self._failures = 0
+                except Exception as e:
+                    self._failures += 1
+                    delay = min(RETRY_MAX_SECONDS, RETRY_BASE_SECONDS * 2 ** (self._failures - 1))
+                    self._retry_at = time.monotonic() + delay
+                    # The keyword filter is used meanwhile
+                    logger.error(f"Building intent centroids failed: {e}; retrying in {delay:.0f}s")
+        finally:
+            self._lock.release()
+        return self._centroids is not None
+
+    def weights(self, query_vector: Sequence[float]) -> Dict[str, Tuple[float, float]]:
+        """Intent -> (cosine similarity, softmax weight), best first."""
+        query = _normalize(np.asarray(query_vector, dtype=np.float32))
+        similarities = self._centroids @ query
+        scaled = (similarities - similarities.max()) / max(INTENT_TEMPERATURE, 1e-6)
+        weights = np.exp(scaled)
+        weights /= weights.sum()
+        order = np.argsort(-weights)
+        return {self.labels[i]: (float(similarities[i]), float(weights[i])) for i in order}
+
+    def route(self, query_vector: Sequence[float]) -> Optional[Dict]:
+        """The metadata filter for a query vector, or None to search unfiltered."""
+        ranked = list(self.weights(query_vector).items())
+        if not ranked or ranked[0][1][0] < INTENT_MIN_SIMILARITY:
+            return None
+        chosen: List[str] = []
+        covered = 0.0
+        for label, (_, weight) in ranked[: max(1, INTENT_MAX_TYPES)]:
+            chosen.append(label)
+            covered += weight
+            if covered >= INTENT_FILTER_COVERAGE:
+                break
+        if covered < INTENT_FILTER_COVERAGE:
+            return None
+        if chosen == ["current_role"]:
+            return {"is_current": True}
+        types: List[str] = []
+        for label in chosen:
+            types.extend(t for t in self.intents[label]["types"] if t not in types)
+        return {"type": types}
+
+
+intent_router = IntentRouter()
+
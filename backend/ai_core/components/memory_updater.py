@@ -1,21 +1,10 @@
 import logging
 from typing import Dict
-import json
-import os
 from datetime import datetime
 
-logger = logging.getLogger(__name__)
+from backend.services.chat_history import chat_history_writer
 
-def _log_chat_history(log_entry: Dict):
-    """Appends a chat log entry to the history file."""
-    log_dir = "logs"
-    os.makedirs(log_dir, exist_ok=True)
-    file_path = os.path.join(log_dir, "chat_history.jsonl")
-    try:
-        with open(file_path, 'a', encoding='utf-8') as f:
-            f.write(json.dumps(log_entry) + '\n')
-    except Exception as e:
-        logger.error(f"Failed to write to chat history log: {e}")
+logger = logging.getLogger(__name__)
 
 def update_conversation_memory(state: Dict) -> Dict:
     """
@@ -26,24 +15,18 @@ def update_conversation_memory(state: Dict) -> Dict:
     user_name = state.get("user_name", "anonymous")
 
     if user_input and response:
-        # Update in-memory history for the current request context
+        # The session windows this and hands evicted turns to the summariser
         if not isinstance(state.get("history"), list):
             state["history"] = []
         state["history"].append({"user": user_input, "assistant": response})
-        state["history"] = state["history"][-4:]
-        logger.info("In-memory conversation history updated.")
+        logger.debug("In-memory conversation history updated.")
 
-        # Persist off the hot path so the client is not blocked on disk I/O
-        log_entry = {
+        # Queued for the batched history writer; the client is never blocked on disk I/O
+        chat_history_writer.submit({
             "timestamp": datetime.utcnow().isoformat(),
             "user_name": user_name,
             "user_input": user_input,
             "ai_response": response
-        }
-        try:
-            import threading
-            threading.Thread(target=_log_chat_history, args=(log_entry,), daemon=True).start()
-        except Exception:
-            _log_chat_history(log_entry)
+        })
 
     return state
\ No newline at end of file
@@ -2,85 +2,97 @@ import asyncio
 import structlog
 from typing import Dict, Optional, List
 from backend.vector_db.faiss_manager import faiss_manager
-from backend.config import FAISS_SEARCH_K, MAX_RETRIEVED_DOCS, GREETING_KEYWORDS
+from backend.config import FAISS_SEARCH_K, MAX_RETRIEVED_DOCS
+from backend.ai_core.components.intent_router import intent_router
+from backend.ai_core.utils import chat_metrics
+from backend.ai_core.utils.keyword_matcher import keyword_matcher
 
 logger = structlog.get_logger(__name__)
 
 
-def _is_greeting(query: str) -> bool:
+def _is_greeting(query: str, keywords: Optional[Dict[str, list]] = None) -> bool:
     q = query.lower().strip()
     if not q:
         return True
     if len(q) < 4:
         return True
-    return any(q == g or q.startswith(g + " ") or q.startswith(g + "!") or q.startswith(g + ",") for g in GREETING_KEYWORDS)
+    if keywords is None:
+        keywords = keyword_matcher.find(query)
+    # Only a greeting that opens the message counts (hit offsets include leading whitespace)
+    lowered = query.lower()
+    offset = len(lowered) - len(lowered.lstrip())
+    return any(hit.start == offset for hit in keywords.get("greeting", ()))
 
 
-def get_metadata_filter(query: str) -> Optional[Dict]:
+def get_metadata_filter(query: str, keywords: Optional[Dict[str, list]] = None) -> Optional[Dict]:
     """
     Analyzes the query to determine if a metadata filter should be applied.
+    Fallback for when the intent router is disabled or its centroids cannot be built.
     """
-    query_lower = query.lower()
+    if keywords is None:
+        keywords = keyword_matcher.find(query)
 
-    if "current" in query_lower and ("job" in query_lower or "role" in query_lower or "experience" in query_lower):
+    if "current" in keywords and "type:experience" in keywords:
         return {"is_current": True}
 
-    if "project" in query_lower or "portfolio" in query_lower:
-        return {"type": "project"}
-    if "skill" in query_lower or "technolog" in query_lower:
-        return {"type": "skills"}
-    if "experience" in query_lower or "job" in query_lower or "work" in query_lower or "role" in query_lower:
-        return {"type": "experience"}
-    if "certificate" in query_lower or "certification" in query_lower or "certified" in query_lower:
-        return {"type": "certificate"}
-    if "moment" in query_lower or "gallery" in query_lower or "memorable" in query_lower:
-        return {"type": "moment"}
-    if "friend" in query_lower or "best friend" in query_lower or "friends" in query_lower or "relationship" in query_lower:
-        return {"type": "friend"}
-    if "education" in query_lower or "degree" in query_lower or "university" in query_lower:
-        return {"type": "education"}
-    if "hobby" in query_lower or "hobbies" in query_lower or "interest" in query_lower or "interests" in query_lower:
-        return {"type": "hobbies"}
-    if "spiritual" in query_lower or "faith" in query_lower or "belief" in query_lower or "principles" in query_lower or "religion" in query_lower:
-        return {"type": "spiritual_beliefs"}
-    if "contact" in query_lower or "email" in query_lower or "reach out" in query_lower:
-        return {"type": "contact"}
+    # Priority follows the order of METADATA_FILTER_KEYWORDS
+    for category in keyword_matcher.categories:
+        if category.startswith("type:") and category in keywords:
+            return {"type": category[len("type:"):]}
     return None
 
 
 async def retrieve_rag_context(state: Dict) -> Dict:
     """
     Fast RAG: one FAISS search on the user query (no extra LLM decomposition call).
-    Greetings skip retrieval entirely.
+    Greetings skip retrieval entirely. The query is embedded once; the intent
+    router and the unfiltered retry reuse the vector.
     """
     user_input = state.get("input", "")
+    keywords = state.get("keywords")
 
-    if _is_greeting(user_input):
-        logger.info("Greeting detected — skipping RAG retrieval")
+    if _is_greeting(user_input, keywords):
+        logger.debug("Greeting detected — skipping RAG retrieval")
+        chat_metrics.greeting_short_circuits.inc()
+        chat_metrics.note(greeting=True, docs=0)
         state["retrieved_docs"] = []
         return state
 
-    metadata_filter = get_metadata_filter(user_input)
-    if metadata_filter:
-        logger.info(f"Applying metadata filter: {metadata_filter}")
-
     try:
-        docs = await asyncio.to_thread(
-            faiss_manager.search,
-            user_input,
-            k=FAISS_SEARCH_K,
-            filter=metadata_filter,
-        )
-
-        # If a tight filter returned nothing, retry once without filter
-        if not docs and metadata_filter:
+        with chat_metrics.stage("retrieval_embed"):
+            query_vector = await asyncio.to_thread(faiss_manager.embed_query, user_input)
+
+        # Centroids are built by the warm-up; until then (or while a retry is building them
+        # in a worker thread) the keyword filter is used instead of waiting
+        ready = intent_router.ready or await asyncio.to_thread(intent_router.ensure_ready, False)
+        if ready:
+            router = "intent"
+            metadata_filter = intent_router.route(query_vector)
+        else:
+            router = "keyword"
+            metadata_filter = get_metadata_filter(user_input, keywords)
+        chat_metrics.metadata_filters.inc(router=router, filtered=str(metadata_filter is not None).lower())
+        if metadata_filter:
+            logger.debug(f"Applying metadata filter: {metadata_filter}")
+
+        with chat_metrics.stage("faiss_search"):
             docs = await asyncio.to_thread(
-                faiss_manager.search,
-                user_input,
+                faiss_manager.search_by_vector,
+                query_vector,
                 k=FAISS_SEARCH_K,
-                filter=None,
+                filter=metadata_filter,
             )
 
+            # If a tight filter returned nothing, retry once without filter
+            if not docs and metadata_filter:
+                chat_metrics.retrieval_unfiltered_retries.inc()
+                docs = await asyncio.to_thread(
+                    faiss_manager.search_by_vector,
+                    query_vector,
+                    k=FAISS_SEARCH_K,
+                    filter=None,
+                )
+
         unique_docs: List = []
         seen = set()
         for doc in docs:
@@ -92,7 +104,8 @@ async def retrieve_rag_context(state: Dict) -> Dict:
                 break
 
         state["retrieved_docs"] = unique_docs
-        logger.info(f"Retrieved {len(unique_docs)} documents for RAG")
+        chat_metrics.note(docs=len(unique_docs), metadata_filter=metadata_filter)
+        logger.debug(f"Retrieved {len(unique_docs)} documents for RAG")
     except Exception as e:
         logger.error(f"FAISS search failed: {e}", exc_info=True)
         state["retrieved_docs"] = []
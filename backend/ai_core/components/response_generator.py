@@ -3,6 +3,7 @@ import logging
 from typing import Dict
 from backend.ai_core.models.gemini import gemini_client
 from backend.ai_core.utils.prompt_templates import get_system_prompt
+from backend.ai_core.utils.chat_metrics import note, stage
 
 logger = logging.getLogger(__name__)
 
@@ -27,20 +28,23 @@ def generate_ai_response(state: Dict) -> Dict:
     retrieved_docs = state.get("retrieved_docs", [])
     is_recruiter = state.get("is_recruiter", False)
     history = state.get("history", [])
+    summary = state.get("summary") or ""
 
     try:
         role = "recruiter" if is_recruiter else "visitor"
 
-        system_prompt = get_system_prompt(role, user_name, retrieved_docs)
-        response_text = gemini_client.generate_response(system_prompt, history, user_input)
+        with stage("prompt_build"):
+            system_prompt = get_system_prompt(role, user_name, retrieved_docs)
+        response_text = gemini_client.generate_response(system_prompt, history, user_input, summary)
 
         if "[SEND_CV]" in response_text:
             response_text = response_text.replace("[SEND_CV]", "").strip()
             state["file_url"] = "/assets/Dagmawi Teferi's cv.pdf"
-            logger.info("CV request detected via token. Attaching CV url to response.")
+            note(cv_attached=True)
+            logger.debug("CV request detected via token. Attaching CV url to response.")
 
         state["response"] = format_links(response_text)
-        logger.info(f"Generated response for {user_name}: {response_text[:100]}...")
+        logger.debug(f"Generated response for {user_name}: {response_text[:100]}...")
 
     except Exception as e:
         logger.error(f"Error during response generation: {e}", exc_info=True)
@@ -1,17 +1,32 @@
 import logging
 from typing import Dict
-from backend.config import RECRUITER_KEYWORDS
+from backend.config import ROLE_CONFIDENCE_DECAY, ROLE_RECRUITER_ENTER, ROLE_RECRUITER_EXIT
+from backend.ai_core.utils import chat_metrics
+from backend.ai_core.utils.keyword_matcher import keyword_matcher
 
 logger = logging.getLogger(__name__)
 
+NEUTRAL = 0.5
+
 def analyze_user_role(state: Dict) -> Dict:
     """
     Infers the user's role (recruiter or visitor) based on keywords in their input.
+
+    role_confidence and the previous is_recruiter come from the session, so
+    evidence accumulates across turns. Before each turn the confidence decays
+    toward neutral, so an old signal fades unless it is repeated; the
+    enter/exit thresholds keep the role from flapping between turns.
     """
-    user_input = state.get("input", "").lower()
-    role_confidence = state.get("role_confidence") or {"visitor": 0.5, "recruiter": 0.5}
+    keywords = state.get("keywords")
+    if keywords is None:
+        keywords = keyword_matcher.find(state.get("input", ""))
+    role_confidence = state.get("role_confidence") or {"visitor": NEUTRAL, "recruiter": NEUTRAL}
+    previous = state.get("is_recruiter")
+
+    for role in ("visitor", "recruiter"):
+        role_confidence[role] = NEUTRAL + (role_confidence.get(role, NEUTRAL) - NEUTRAL) * ROLE_CONFIDENCE_DECAY
 
-    if any(word in user_input for word in RECRUITER_KEYWORDS):
+    if "recruiter" in keywords:
         role_confidence["recruiter"] += 0.4 # Increased confidence boost
     else:
         role_confidence["visitor"] += 0.1
@@ -21,8 +36,17 @@ def analyze_user_role(state: Dict) -> Dict:
         role_confidence["visitor"] /= total
         role_confidence["recruiter"] /= total
 
+    threshold = ROLE_RECRUITER_EXIT if previous else ROLE_RECRUITER_ENTER
+    is_recruiter = role_confidence["recruiter"] > threshold
     state["role_confidence"] = role_confidence
-    state["is_recruiter"] = role_confidence["recruiter"] > 0.65
-    
-    logger.info(f"Inferred role: {'Recruiter' if state['is_recruiter'] else 'Visitor'} with confidence: {role_confidence}")
+    state["is_recruiter"] = is_recruiter
+
+    role = "recruiter" if is_recruiter else "visitor"
+    chat_metrics.role_decisions.inc(role=role)
+    # None on the first turn of a session: nothing to switch from
+    if previous is not None and bool(previous) != is_recruiter:
+        chat_metrics.role_switches.inc(to=role)
+        chat_metrics.note(role_switched=True)
+
+    logger.debug(f"Inferred role: {role} with confidence: {role_confidence}")
     return state
@@ -0,0 +1,108 @@
+"""
+Fingerprint manifest for the CSV exports under backend/data.
+
+For every file it records (size, mtime, content hash) plus the stable id of
+each row document, so a rebuild can skip unchanged files entirely and, for a
+changed file, touch only the rows that were added, changed or removed.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+from typing import Dict, Iterable, List, Optional
+
+from backend.config import CSV_MANIFEST_PATH
+
+logger = logging.getLogger(__name__)
+
+_HASH_CHUNK_BYTES = 1 << 20
+
+
+def row_hash(page_content: str) -> str:
+    return hashlib.sha1(page_content.encode("utf-8")).hexdigest()[:16]
+
+
+def make_csv_doc_id(file_path: str, row_digest: str) -> str:
+    return f"csv:{os.path.basename(file_path)}:{row_digest}"
+
+
+def file_content_hash(file_path: str) -> str:
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(_HASH_CHUNK_BYTES), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class CsvManifest:
+    """JSON manifest: {filename: {size, mtime_ns, sha256, rows: [doc ids]}}."""
+
+    def __init__(self, path: str = CSV_MANIFEST_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._files: Dict[str, Dict[str, object]] = self._read()
+
+    def _read(self) -> Dict[str, Dict[str, object]]:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return data.get("files", {}) if isinstance(data, dict) else {}
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable CSV manifest {self.path}: {e}")
+            return {}
+
+    def save(self) -> None:
+        with self._lock:
+            payload = {"files": self._files}
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(payload, f)
+        os.replace(tmp_path, self.path)
+
+    def filenames(self) -> List[str]:
+        with self._lock:
+            return list(self._files)
+
+    def row_ids(self, filename: str) -> List[str]:
+        with self._lock:
+            return list(self._files.get(filename, {}).get("rows", []))
+
+    def is_unchanged(self, file_path: str) -> bool:
+        """
+        Cheap check first (size + mtime); only if those moved is the file hashed.
+        A touched-but-identical file is treated as unchanged and its fingerprint refreshed.
+        """
+        filename = os.path.basename(file_path)
+        with self._lock:
+            entry = self._files.get(filename)
+        if not entry:
+            return False
+        stat = os.stat(file_path)
+        if entry.get("size") == stat.st_size and entry.get("mtime_ns") == stat.st_mtime_ns:
+            return True
+        if entry.get("size") != stat.st_size:
+            return False
+        if file_content_hash(file_path) != entry.get("sha256"):
+            return False
+        with self._lock:
+            entry["mtime_ns"] = stat.st_mtime_ns
+        return True
+
+    def record(self, file_path: str, row_ids: Iterable[str]) -> None:
+        stat = os.stat(file_path)
+        entry = {
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "sha256": file_content_hash(file_path),
+            "rows": sorted(set(row_ids)),
+        }
+        with self._lock:
+            self._files[os.path.basename(file_path)] = entry
+
+    def forget(self, filename: str) -> Optional[Dict[str, object]]:
+        with self._lock:
+            return self._files.pop(filename, None)
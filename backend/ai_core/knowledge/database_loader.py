@@ -162,36 +162,31 @@ def load_entity_document(doc_type: str, row_id: int) -> Optional[Document]:
         db.close()
 
 
-def load_database_content() -> List[Document]:
+def load_model_documents(model_cls) -> List[Document]:
     """
-    Fetches portfolio data from PostgreSQL and converts it into LangChain Documents.
+    Loads every row of one indexed table as Documents.
+    Opens its own session so several tables can be loaded concurrently over separate pooled connections.
     """
-    documents: List[Document] = []
+    converter = _CONVERTERS[model_cls]
     db = SessionLocal()
-
     try:
-        for edu in db.query(models.Education).all():
-            documents.append(education_to_document(edu))
-
-        for exp in db.query(models.WorkExperience).all():
-            documents.append(experience_to_document(exp))
-
-        for proj in db.query(models.Project).all():
-            documents.append(project_to_document(proj))
+        return [converter(row) for row in db.query(model_cls).all()]
+    finally:
+        db.close()
 
-        for skill in db.query(models.TechnicalSkill).all():
-            documents.append(skill_to_document(skill))
 
-        for cert in db.query(models.Certificate).all():
-            documents.append(certificate_to_document(cert))
+def load_database_content() -> List[Document]:
+    """
+    Fetches portfolio data from PostgreSQL and converts it into LangChain Documents.
+    """
+    documents: List[Document] = []
 
-        for moment in db.query(models.MemorableMoment).all():
-            documents.append(moment_to_document(moment))
+    try:
+        for model_cls in MODEL_TO_DOC_TYPE:
+            documents.extend(load_model_documents(model_cls))
 
         logger.info(f"Loaded {len(documents)} documents from database.")
         return documents
     except Exception as e:
         logger.error(f"Error loading database content: {e}")
         return []
-    finally:
-        db.close()
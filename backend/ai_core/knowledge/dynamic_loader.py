@@ -1,8 +1,15 @@
-import re
-import pandas as pd
+import os
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, Dict, Iterator, List, Optional
 from langchain_core.documents import Document
 from backend.ai_core.utils.logger import log_interaction
-import time
+from backend.ai_core.knowledge.csv_manifest import row_hash
+from backend.config import CSV_CHUNK_SIZE
+
+if TYPE_CHECKING:
+    import pandas as pd
+
 
 def load_github_data() -> list[Document]:
     return []
@@ -10,73 +17,189 @@ def load_github_data() -> list[Document]:
 def get_repo_languages(languages_url: str, token: str) -> list[str]:
     return []
 
+
+# ---------------------------------------------------------------------------
+# Column-wise document builders, one per known export schema.
+# Each receives a DataFrame chunk and returns its Documents; string formatting
+# is done on whole columns instead of row-by-row Series access.
+# ---------------------------------------------------------------------------
+
+def _col(df: "pd.DataFrame", name: str, default: str = "N/A") -> "pd.Series":
+    """A column as strings, or the default for every row if the export lacks it."""
+    import pandas as pd
+
+    if name in df.columns:
+        return df[name].astype(str)
+    return pd.Series(default, index=df.index, dtype=object)
+
+
+def _raw(df: "pd.DataFrame", name: str, default: str = "N/A") -> list:
+    if name in df.columns:
+        return df[name].tolist()
+    return [default] * len(df)
+
+
+def _chat_documents(df: "pd.DataFrame", source: str) -> List[Document]:
+    content = (
+        "Chat Entry:\nChat ID: " + _col(df, "chat_title")
+        + "\nSender: " + _col(df, "sender_name")
+        + "\nMessage Count: " + _col(df, "chat_message_count")
+    )
+    return [
+        Document(page_content=text, metadata={"source": source, "type": "chat_entry", "chat_title": title})
+        for text, title in zip(content.tolist(), _raw(df, "chat_title"))
+    ]
+
+
+def _linkedin_documents(df: "pd.DataFrame", source: str) -> List[Document]:
+    full_name = (_col(df, "First Name", "") + " " + _col(df, "Last Name", "")).str.strip()
+    headline = _col(df, "Headline", "")
+    summary = _col(df, "Summary", "")
+    industry = _col(df, "Industry", "")
+    location = _col(df, "Geo Location", "")
+
+    content = (
+        "LinkedIn Profile for " + full_name + ":\nHeadline: " + headline
+        + "\nSummary: " + summary + "\nIndustry: " + industry
+        + "\nLocation: " + location + "\n"
+    )
+    # Heuristic current-job extraction, vectorized over the whole column
+    current_job = headline.str.extract(r"(?P<title>[^,]+) at (?P<company>[^,]+)")
+
+    documents = []
+    for i, text in enumerate(content.tolist()):
+        metadata = {
+            "source": source,
+            "type": "linkedin_profile",
+            "name": full_name.iat[i],
+            "headline": headline.iat[i],
+            "summary": summary.iat[i],
+            "industry": industry.iat[i],
+            "location": location.iat[i],
+        }
+        title = current_job["title"].iat[i]
+        if isinstance(title, str):
+            metadata["current_title"] = title.strip()
+            metadata["current_company"] = current_job["company"].iat[i].strip()
+            metadata["is_current"] = True
+        documents.append(Document(page_content=text, metadata=metadata))
+    return documents
+
+
+def _favorited_documents(df: "pd.DataFrame", source: str) -> List[Document]:
+    content = (
+        "Favorited Item: " + _col(df, "title") + " by " + _col(df, "author")
+        + ". Category: " + _col(df, "category")
+    )
+    return [
+        Document(page_content=text, metadata={"source": source, "type": "favorited_item", "title": title})
+        for text, title in zip(content.tolist(), _raw(df, "title"))
+    ]
+
+
+def _followers_documents(df: "pd.DataFrame", source: str) -> List[Document]:
+    content = "Follower: " + _col(df, "follower_name") + ". Follower ID: " + _col(df, "follower_id")
+    return [
+        Document(page_content=text, metadata={"source": source, "type": "follower", "follower_name": name})
+        for text, name in zip(content.tolist(), _raw(df, "follower_name"))
+    ]
+
+
+def _following_documents(df: "pd.DataFrame", source: str) -> List[Document]:
+    content = "Following: " + _col(df, "following_name") + ". Following ID: " + _col(df, "following_id")
+    return [
+        Document(page_content=text, metadata={"source": source, "type": "following", "following_name": name})
+        for text, name in zip(content.tolist(), _raw(df, "following_name"))
+    ]
+
+
+def _common_word_documents(df: "pd.DataFrame", source: str) -> List[Document]:
+    content = "Common Word: " + _col(df, "word") + ". Count: " + _col(df, "count")
+    return [
+        Document(page_content=text, metadata={"source": source, "type": "common_word", "word": word})
+        for text, word in zip(content.tolist(), _raw(df, "word"))
+    ]
+
+
+def _generic_documents(df: "pd.DataFrame", source: str) -> List[Document]:
+    """Any other CSV: every column goes into the content and the metadata."""
+    if df.empty or not len(df.columns):
+        return []
+    parts = [f"{col}: " + df[col].astype(str) for col in df.columns]
+    content = parts[0]
+    for part in parts[1:]:
+        content = content + "; " + part
+
+    records = df.rename(columns=lambda col: col.lower().replace(" ", "_")).to_dict("records")
+    return [
+        Document(page_content=text, metadata={"source": source, "type": "csv_data", **record})
+        for text, record in zip(content.tolist(), records)
+    ]
+
+
+@dataclass(frozen=True)
+class CsvSchema:
+    doc_type: str
+    build: Callable[["pd.DataFrame", str], List[Document]]
+
+
+# Known exports keyed by file name; anything else falls back to the generic schema
+CSV_SCHEMAS: Dict[str, CsvSchema] = {
+    "top_10_chats_and_senders.csv": CsvSchema("chat_entry", _chat_documents),
+    "cleaned_Linkdin_data.csv": CsvSchema("linkedin_profile", _linkedin_documents),
+    "cleaned_favorited_data.csv": CsvSchema("favorited_item", _favorited_documents),
+    "cleaned_followers_data.csv": CsvSchema("follower", _followers_documents),
+    "cleaned_following_data.csv": CsvSchema("following", _following_documents),
+    "top_20_common_words.csv": CsvSchema("common_word", _common_word_documents),
+}
+GENERIC_CSV_SCHEMA = CsvSchema("csv_data", _generic_documents)
+
+
+def schema_for_file(file_path: str) -> CsvSchema:
+    """Resolve the schema once per file (exact name first, then the legacy substring match)."""
+    filename = os.path.basename(file_path)
+    schema = CSV_SCHEMAS.get(filename)
+    if schema is not None:
+        return schema
+    for known_name, known_schema in CSV_SCHEMAS.items():
+        if known_name in file_path:
+            return known_schema
+    return GENERIC_CSV_SCHEMA
+
+
+def iter_csv_batches(file_path: str, chunksize: Optional[int] = None) -> Iterator[List[Document]]:
+    """
+    Stream a CSV as batches of Documents, one batch per `chunksize` rows,
+    so large exports can be embedded without holding the whole file in memory.
+    Each document carries a `row_hash` (its stable id); duplicate rows are emitted once.
+    """
+    import pandas as pd  # deferred: only needed when CSVs are actually ingested
+
+    schema = schema_for_file(file_path)
+    seen = set()
+    with pd.read_csv(file_path, chunksize=chunksize or CSV_CHUNK_SIZE) as reader:
+        for chunk in reader:
+            documents = []
+            for doc in schema.build(chunk, file_path):
+                digest = row_hash(doc.page_content)
+                if digest in seen:
+                    continue
+                seen.add(digest)
+                doc.metadata["row_hash"] = digest
+                documents.append(doc)
+            if documents:
+                yield documents
+
+
+def iter_csv_documents(file_path: str, chunksize: Optional[int] = None) -> Iterator[Document]:
+    for batch in iter_csv_batches(file_path, chunksize):
+        yield from batch
+
+
 def load_csv_data(file_path: str) -> list[Document]:
     start_time = time.time()
     try:
-        df = pd.read_csv(file_path)
-        documents = []
-        for index, row in df.iterrows():
-            if 'top_10_chats_and_senders.csv' in file_path:
-                content = f"""Chat Entry:
-Chat ID: {row.get('chat_title', 'N/A')}
-Sender: {row.get('sender_name', 'N/A')}
-Message Count: {row.get('chat_message_count', 'N/A')}"""
-            elif 'cleaned_Linkdin_data.csv' in file_path:
-                first_name = row.get('First Name', '')
-                last_name = row.get('Last Name', '')
-                full_name = f"{first_name} {last_name}".strip()
-                headline = row.get('Headline', '')
-                summary = row.get('Summary', '')
-                industry = row.get('Industry', '')
-                location = row.get('Geo Location', '')
-                
-                content = f"""LinkedIn Profile for {full_name}:
-Headline: {headline}
-Summary: {summary}
-Industry: {industry}
-Location: {location}
-"""
-                # Add more specific metadata for LinkedIn data
-                metadata = {
-                    "source": file_path,
-                    "type": "linkedin_profile",
-                    "name": full_name,
-                    "headline": headline,
-                    "summary": summary,
-                    "industry": industry,
-                    "location": location
-                }
-                # Attempt to extract current job information from headline or summary
-                # This is a heuristic and might need refinement based on actual data
-                current_job_match = re.search(r'(?P<title>[^,]+) at (?P<company>[^,]+)', headline)
-                if current_job_match:
-                    metadata["current_title"] = current_job_match.group('title').strip()
-                    metadata["current_company"] = current_job_match.group('company').strip()
-                    metadata["is_current"] = True
-                
-                documents.append(Document(page_content=content, metadata=metadata))
-            elif 'cleaned_favorited_data.csv' in file_path:
-                content = f"Favorited Item: {row.get('title', 'N/A')} by {row.get('author', 'N/A')}. Category: {row.get('category', 'N/A')}"
-                documents.append(Document(page_content=content, metadata={"source": file_path, "type": "favorited_item", "title": row.get('title', 'N/A')}))
-            elif 'cleaned_followers_data.csv' in file_path:
-                content = f"Follower: {row.get('follower_name', 'N/A')}. Follower ID: {row.get('follower_id', 'N/A')}"
-                documents.append(Document(page_content=content, metadata={"source": file_path, "type": "follower", "follower_name": row.get('follower_name', 'N/A')}))
-            elif 'cleaned_following_data.csv' in file_path:
-                content = f"Following: {row.get('following_name', 'N/A')}. Following ID: {row.get('following_id', 'N/A')}"
-                documents.append(Document(page_content=content, metadata={"source": file_path, "type": "following", "following_name": row.get('following_name', 'N/A')}))
-            elif 'top_20_common_words.csv' in file_path:
-                content = f"Common Word: {row.get('word', 'N/A')}. Count: {row.get('count', 'N/A')}"
-                documents.append(Document(page_content=content, metadata={"source": file_path, "type": "common_word", "word": row.get('word', 'N/A')}))
-            else:
-                # Generic handling for any other CSVs, try to make content more descriptive
-                content_parts = []
-                metadata = {"source": file_path, "type": "csv_data"}
-                for col in df.columns:
-                    value = row[col]
-                    content_parts.append(f"{col}: {value}")
-                    metadata[col.lower().replace(' ', '_')] = value # Add all columns as metadata
-                content = "; ".join(content_parts)
-                documents.append(Document(page_content=content, metadata=metadata))
+        documents = list(iter_csv_documents(file_path))
         end_time = time.time()
         log_interaction("CSV data loaded", f"File: {file_path}, Rows: {len(documents)}, Time: {end_time - start_time:.2f} seconds")
         return documents
@@ -1,13 +1,6 @@
-from sentence_transformers import SentenceTransformer
 import logging
 from backend.config import EMBEDDINGS_MODEL_NAME
-from langchain_huggingface import HuggingFaceEmbeddings
 
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - [%(name)s] - %(levelname)s - %(message)s',
-    handlers=[logging.StreamHandler()]
-)
 logger = logging.getLogger(__name__)
 
 class EmbeddingsManager:
@@ -20,6 +13,10 @@ class EmbeddingsManager:
             return
         logger.info(f"Initializing embeddings with model: {EMBEDDINGS_MODEL_NAME}")
         try:
+            # Heavy imports (torch via sentence_transformers) are deferred to first use
+            from sentence_transformers import SentenceTransformer
+            from langchain_huggingface import HuggingFaceEmbeddings
+
             SentenceTransformer(EMBEDDINGS_MODEL_NAME)
             self.model = HuggingFaceEmbeddings(
                 model_name=EMBEDDINGS_MODEL_NAME,
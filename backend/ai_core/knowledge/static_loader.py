@@ -6,6 +6,14 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+STATIC_KNOWLEDGE_DIR = "backend/ai_core/knowledge"
+STATIC_KNOWLEDGE_FILES = ("github_knowledge_base.json", "personal_knowledge_base.json")
+
+
+def static_knowledge_paths() -> List[str]:
+    return [os.path.join(STATIC_KNOWLEDGE_DIR, filename) for filename in STATIC_KNOWLEDGE_FILES]
+
+
 def load_static_content() -> tuple[List[Document], Dict]:
     """
     Loads static content from JSON files and returns a tuple:
@@ -13,7 +21,7 @@ def load_static_content() -> tuple[List[Document], Dict]:
     """
     documents = []
     profile_data = {}
-    knowledge_dir = "backend/ai_core/knowledge"
+    knowledge_dir = STATIC_KNOWLEDGE_DIR
 
     for filename in os.listdir(knowledge_dir):
         if filename.endswith(".json"):
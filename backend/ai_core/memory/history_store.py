@@ -0,0 +1,96 @@
+"""
+SQLite tier for chat sessions, shared by every worker on the host.
+
+One row per session: the serialised session, a version bumped on every save
+and the last-update time. WAL mode lets workers read while another writes;
+expired rows are pruned every PRUNE_EVERY saves.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+BUSY_TIMEOUT_SECONDS = 5.0
+PRUNE_EVERY = 200
+
+SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS chat_sessions (
+        session_id TEXT PRIMARY KEY,
+        version INTEGER NOT NULL,
+        updated_at REAL NOT NULL,
+        data TEXT NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_chat_sessions_updated_at ON chat_sessions (updated_at)",
+)
+
+
+class SqliteSessionStore:
+    def __init__(self, path: str, ttl_seconds: float):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self._local = threading.local()
+        self._schema_lock = threading.Lock()
+        self._ready = False
+        self._saves = 0
+
+    def _conn(self) -> sqlite3.Connection:
+        # Called from to_thread workers; one connection per thread
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            self._ensure_schema()
+            conn = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT_SECONDS, isolation_level=None)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _ensure_schema(self) -> None:
+        if self._ready:
+            return
+        with self._schema_lock:
+            if self._ready:
+                return
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT_SECONDS, isolation_level=None)
+            try:
+                conn.execute("PRAGMA journal_mode=WAL")
+                for statement in SCHEMA:
+                    conn.execute(statement)
+            finally:
+                conn.close()
+            self._ready = True
+
+    def _fresh_after(self) -> float:
+        return time.time() - self.ttl_seconds
+
+    def version(self, session_id: str) -> Optional[int]:
+        row = self._conn().execute(
+            "SELECT version FROM chat_sessions WHERE session_id = ? AND updated_at >= ?",
+            (session_id, self._fresh_after()),
+        ).fetchone()
+        return row[0] if row else None
+
+    def load(self, session_id: str) -> Optional[Dict]:
+        row = self._conn().execute(
+            "SELECT data FROM chat_sessions WHERE session_id = ? AND updated_at >= ?",
+            (session_id, self._fresh_after()),
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def save(self, session_id: str, version: int, updated_at: float, data: Dict) -> None:
+        conn = self._conn()
+        conn.execute(
+            "INSERT INTO chat_sessions (session_id, version, updated_at, data) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (session_id) DO UPDATE SET version = excluded.version, "
+            "updated_at = excluded.updated_at, data = excluded.data",
+            (session_id, version, updated_at, json.dumps(data, ensure_ascii=False, separators=(",", ":"))),
+        )
+        self._saves += 1
+        if self._saves % PRUNE_EVERY == 0:
+            self.prune()
+
+    def prune(self) -> int:
+        return self._conn().execute("DELETE FROM chat_sessions WHERE updated_at < ?", (self._fresh_after(),)).rowcount
@@ -0,0 +1,193 @@
+"""
+Server-side conversation sessions, so a chat request only carries the new
+message and its session_id instead of the whole transcript.
+
+A session holds what the pipeline needs between turns:
+  - history: the last MAX_HISTORY_TURNS turns
+  - role_confidence and is_recruiter: the running output of analyze_user_role
+  - summary: a running summary of turns that fell out of the window, and the
+    evicted turns still waiting to be folded into it (see summarizer)
+
+Sessions live in an in-process LRU (CHAT_SESSION_CACHE_SIZE entries, idle TTL
+CHAT_SESSION_TTL_SECONDS). With CHAT_SESSION_DB set they are also written
+through to a SQLite file shared by all workers (history_store); a cached copy
+is revalidated against the stored version before use, so a worker never
+continues from a stale copy when the previous turn was served elsewhere.
+
+Session ids are only ever issued by the server; an unknown or expired id
+starts a new session under a new id.
+"""
+import logging
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional
+
+from backend.config import CHAT_SESSION_CACHE_SIZE, CHAT_SESSION_DB, CHAT_SESSION_TTL_SECONDS, MAX_HISTORY_TURNS
+from backend.ai_core.memory.history_store import SqliteSessionStore
+from backend.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+_lookups = metrics.counter("chat_session_lookups_total", "Session lookups by where they were answered (memory, store, miss)")
+_cached = metrics.gauge("chat_sessions_cached", "Sessions held in the in-process LRU")
+
+MAX_PENDING_TURNS = 20
+
+
+@dataclass
+class ConversationSession:
+    session_id: str
+    history: List[Dict[str, str]] = field(default_factory=list)
+    role_confidence: Optional[Dict[str, float]] = None
+    # None until the first turn has been classified
+    is_recruiter: Optional[bool] = None
+    summary: str = ""
+    # Turns so far, how many of them the summary covers, and evicted turns not yet summarised
+    turns: int = 0
+    summary_turns: int = 0
+    pending: List[Dict[str, str]] = field(default_factory=list)
+    version: int = 0
+    updated_at: float = field(default_factory=time.time)
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "ConversationSession":
+        known = {name: data[name] for name in cls.__dataclass_fields__ if name in data}
+        return cls(**known)
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+    def copy(self) -> "ConversationSession":
+        return ConversationSession.from_dict(self.to_dict())
+
+    def set_history(self, history: List[Dict[str, str]]) -> None:
+        """Take the history after a turn; turns beyond the window move to `pending`."""
+        self.turns += max(0, len(history) - len(self.history))
+        if len(history) > MAX_HISTORY_TURNS:
+            self.pending.extend(history[:-MAX_HISTORY_TURNS])
+            history = history[-MAX_HISTORY_TURNS:]
+        self.history = list(history)
+        # Bounded even if summarising keeps failing; the oldest evicted turns are skipped (counted as covered)
+        if len(self.pending) > MAX_PENDING_TURNS:
+            dropped = len(self.pending) - MAX_PENDING_TURNS
+            self.pending = self.pending[dropped:]
+            self.summary_turns += dropped
+
+    def take_summary(self, summary: str, summary_turns: int) -> None:
+        """Adopt a summary covering the first `summary_turns` turns, dropping the pending turns it covers."""
+        if summary_turns <= self.summary_turns:
+            return
+        self.pending = self.pending[summary_turns - self.summary_turns:]
+        self.summary = summary
+        self.summary_turns = summary_turns
+
+
+class SessionManager:
+    def __init__(
+        self,
+        capacity: int = CHAT_SESSION_CACHE_SIZE,
+        ttl_seconds: float = CHAT_SESSION_TTL_SECONDS,
+        store: Optional[SqliteSessionStore] = None,
+    ):
+        self.capacity = max(1, capacity)
+        self.ttl_seconds = ttl_seconds
+        self.store = store
+        self._lock = threading.Lock()
+        self._sessions: "OrderedDict[str, ConversationSession]" = OrderedDict()
+        metrics.add_collector(lambda: _cached.set(len(self._sessions)))
+
+    @staticmethod
+    def new_id() -> str:
+        return secrets.token_urlsafe(16)
+
+    def _expired(self, session: ConversationSession) -> bool:
+        return time.time() - session.updated_at > self.ttl_seconds
+
+    def _cached(self, session_id: str) -> Optional[ConversationSession]:
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                return None
+            if self._expired(session):
+                del self._sessions[session_id]
+                return None
+            self._sessions.move_to_end(session_id)
+            return session.copy()
+
+    def _remember(self, session: ConversationSession) -> None:
+        with self._lock:
+            self._sessions[session.session_id] = session.copy()
+            self._sessions.move_to_end(session.session_id)
+            while len(self._sessions) > self.capacity:
+                self._sessions.popitem(last=False)
+
+    def get(self, session_id: str) -> Optional[ConversationSession]:
+        """The live session, or None when unknown or expired. Blocking when a store is configured."""
+        session = self._cached(session_id)
+        if self.store is None:
+            _lookups.inc(result="memory" if session is not None else "miss")
+            return session
+        try:
+            if session is not None and self.store.version(session_id) == session.version:
+                _lookups.inc(result="memory")
+                return session
+            data = self.store.load(session_id)
+        except Exception as e:
+            logger.error(f"Session store lookup failed for {session_id}: {e}")
+            _lookups.inc(result="memory" if session is not None else "miss")
+            return session
+        if data is None:
+            _lookups.inc(result="miss")
+            return None
+        session = ConversationSession.from_dict(data)
+        self._remember(session)
+        _lookups.inc(result="store")
+        return session
+
+    def get_or_create(
+        self, session_id: Optional[str], seed_history: Optional[List[Dict[str, str]]] = None
+    ) -> ConversationSession:
+        """
+        The session for `session_id`, or a new one (with a fresh id) seeded from
+        history the client sent, for clients that do not keep a session yet.
+        """
+        session = self.get(session_id) if session_id else None
+        if session is None:
+            session = ConversationSession(session_id=self.new_id())
+            session.set_history(list(seed_history or []))
+        return session
+
+    def save(self, session: ConversationSession) -> None:
+        """
+        Write the session back. A summary saved meanwhile (by the summariser,
+        possibly in another worker) is kept rather than overwritten.
+        """
+        latest = self.get(session.session_id)
+        if latest is not None:
+            session.take_summary(latest.summary, latest.summary_turns)
+            session.version = max(session.version, latest.version)
+        session.version += 1
+        session.updated_at = time.time()
+        self._remember(session)
+        if self.store is not None:
+            try:
+                self.store.save(session.session_id, session.version, session.updated_at, session.to_dict())
+            except Exception as e:
+                # The in-process copy still serves this worker
+                logger.error(f"Failed to persist chat session {session.session_id}: {e}")
+
+    def apply_summary(self, session_id: str, summary: str, summary_turns: int) -> None:
+        """Store a summary computed from the session's pending turns (off the request path)."""
+        session = self.get(session_id)
+        if session is None or summary_turns <= session.summary_turns:
+            return
+        session.take_summary(summary, summary_turns)
+        self.save(session)
+
+
+session_manager = SessionManager(
+    store=SqliteSessionStore(CHAT_SESSION_DB, CHAT_SESSION_TTL_SECONDS) if CHAT_SESSION_DB else None
+)
@@ -0,0 +1,115 @@
+"""
+Rolling conversation summary, updated after the response has been sent.
+
+When turns leave a session's history window they wait in `pending`; once
+CHAT_SUMMARY_BATCH_TURNS have accumulated, the chat endpoint schedules fold()
+as a background task. fold() asks Gemini to merge them into the running
+summary (capped at CHAT_SUMMARY_MAX_TOKENS) and stores it on the session. If
+the call fails, an extractive summary of the user's questions is used instead,
+so pending turns never pile up.
+
+Together with the token budget in token_utils this keeps the prompt for a long
+conversation at a flat size: summary + the last few turns.
+"""
+import threading
+import time
+from typing import Dict, List, Set
+
+import structlog
+
+from backend.config import CHAT_SUMMARY_BATCH_TURNS, CHAT_SUMMARY_MAX_TOKENS, LLM_MODEL_NAME
+from backend.ai_core.memory.session_manager import ConversationSession, session_manager
+from backend.ai_core.utils.token_utils import clip_to_tokens
+from backend.utils.metrics import metrics
+
+logger = structlog.get_logger(__name__)
+
+SUMMARY_INSTRUCTION = (
+    "You maintain a running summary of a chat between a visitor and Dagmawi's portfolio assistant. "
+    "Merge the new turns into the existing summary. Keep names, the visitor's role and goals, topics "
+    "asked about and any commitments made; drop pleasantries. Write plain prose in the third person, "
+    f"at most {CHAT_SUMMARY_MAX_TOKENS * 3 // 4} words."
+)
+
+_summaries = metrics.counter("chat_summaries_total", "Running-summary updates by method (llm, extractive)")
+_summary_seconds = metrics.histogram("chat_summary_seconds", "Time to fold evicted turns into the running summary")
+
+_model = None
+_model_lock = threading.Lock()
+_in_progress: Set[str] = set()
+_in_progress_lock = threading.Lock()
+
+
+def _get_model():
+    global _model
+    if _model is None:
+        with _model_lock:
+            if _model is None:
+                from backend.ai_core.models.gemini import get_genai
+
+                genai = get_genai()
+                _model = genai.GenerativeModel(
+                    model_name=LLM_MODEL_NAME,
+                    system_instruction=SUMMARY_INSTRUCTION,
+                    generation_config=genai.GenerationConfig(temperature=0.2, max_output_tokens=CHAT_SUMMARY_MAX_TOKENS * 2),
+                )
+    return _model
+
+
+def _transcript(turns: List[Dict[str, str]]) -> str:
+    lines = []
+    for turn in turns:
+        if turn.get("user"):
+            lines.append(f"Visitor: {clip_to_tokens(turn['user'], 200)}")
+        if turn.get("assistant"):
+            lines.append(f"Assistant: {clip_to_tokens(turn['assistant'], 200)}")
+    return "\n".join(lines)
+
+
+def extractive_summary(summary: str, turns: List[Dict[str, str]]) -> str:
+    questions = "; ".join(clip_to_tokens(turn["user"], 30) for turn in turns if turn.get("user"))
+    merged = f"{summary} Later the visitor asked: {questions}" if summary else f"The visitor asked: {questions}"
+    # Keep the most recent part when over the cap
+    limit = CHAT_SUMMARY_MAX_TOKENS * 4
+    return merged if len(merged) <= limit else "…" + merged[-limit:]
+
+
+def summarize(summary: str, turns: List[Dict[str, str]]) -> str:
+    prompt = f"Existing summary:\n{summary or '(none)'}\n\nNew turns:\n{_transcript(turns)}\n\nUpdated summary:"
+    try:
+        response = _get_model().generate_content(prompt)
+        text = (response.text or "").strip() if response else ""
+        if text:
+            _summaries.inc(method="llm")
+            return clip_to_tokens(text, CHAT_SUMMARY_MAX_TOKENS)
+        logger.warning("Empty summary from Gemini; using an extractive summary")
+    except Exception as e:
+        logger.warning(f"Summarising conversation failed ({e}); using an extractive summary")
+    _summaries.inc(method="extractive")
+    return extractive_summary(summary, turns)
+
+
+def due(session: ConversationSession) -> bool:
+    return len(session.pending) >= max(1, CHAT_SUMMARY_BATCH_TURNS)
+
+
+def fold(session_id: str) -> None:
+    """Fold the session's pending turns into its summary (blocking; run as a background task)."""
+    with _in_progress_lock:
+        if session_id in _in_progress:
+            return  # the running fold picks up from the stored session next time
+        _in_progress.add(session_id)
+    try:
+        session = session_manager.get(session_id)
+        if session is None or not session.pending:
+            return
+        turns = list(session.pending)
+        start = time.perf_counter()
+        summary = summarize(session.summary, turns)
+        _summary_seconds.observe(time.perf_counter() - start)
+        session_manager.apply_summary(session_id, summary, session.summary_turns + len(turns))
+    except Exception as e:
+        logger.error(f"Failed to update the summary for session {session_id}: {e}", exc_info=True)
+    finally:
+        with _in_progress_lock:
+            _in_progress.discard(session_id)
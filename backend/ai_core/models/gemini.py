@@ -1,8 +1,7 @@
 import os
+import threading
 import time
 from dotenv import load_dotenv
-import google.generativeai as genai
-from google.api_core import exceptions as google_exceptions
 from backend.config import (
     LLM_MODEL_NAME,
     LLM_TEMPERATURE,
@@ -10,15 +9,37 @@ from backend.config import (
     MAX_OUTPUT_TOKENS,
 )
 import structlog
+from backend.ai_core.utils import chat_metrics
+from backend.ai_core.utils.token_utils import build_history_messages
+from backend.utils.tracing import span
 
 logger = structlog.get_logger(__name__)
 
 load_dotenv()
-api_key = os.getenv("GOOGLE_API_KEY")
-if not api_key:
-    logger.error("GOOGLE_API_KEY not found in environment variables.")
-    raise ValueError("GOOGLE_API_KEY is not set.")
-genai.configure(api_key=api_key)
+
+_genai = None
+_configure_lock = threading.Lock()
+
+
+def get_genai():
+    """
+    Import and configure the Gemini SDK on first use.
+    Keeps google.generativeai (and its grpc stack) out of the API import path.
+    """
+    global _genai
+    if _genai is not None:
+        return _genai
+    with _configure_lock:
+        if _genai is None:
+            import google.generativeai as genai
+
+            api_key = os.getenv("GOOGLE_API_KEY")
+            if not api_key:
+                logger.error("GOOGLE_API_KEY not found in environment variables.")
+                raise ValueError("GOOGLE_API_KEY is not set.")
+            genai.configure(api_key=api_key)
+            _genai = genai
+    return _genai
 
 
 class GeminiClient:
@@ -41,7 +62,9 @@ class GeminiClient:
         # Cache by prompt hash so we do not rebuild the model object every time for identical prompts
         key = (LLM_MODEL_NAME, self.temperature, hash(system_prompt))
         model = self._model_cache.get(key)
+        chat_metrics.gemini_model_cache.inc(result="hit" if model is not None else "miss")
         if model is None:
+            genai = get_genai()
             model = genai.GenerativeModel(
                 model_name=LLM_MODEL_NAME,
                 system_instruction=system_prompt,
@@ -56,34 +79,53 @@ class GeminiClient:
                 self._model_cache.pop(next(iter(self._model_cache)))
         return model
 
-    def generate_response(self, system_prompt: str, history: list, user_input: str) -> str:
+    @staticmethod
+    def _generate(model, messages):
+        """
+        Streamed generate_content so time-to-first-token can be measured; the
+        chunks are drained here and the response is read as a whole.
+        """
+        start = time.perf_counter()
+        response = model.generate_content(contents=messages, stream=True)
+        first = True
+        for _ in response:
+            if first:
+                chat_metrics.observe_stage("gemini_ttfb", time.perf_counter() - start)
+                first = False
+        return response
+
+    def generate_response(self, system_prompt: str, history: list, user_input: str, summary: str = "") -> str:
+        from google.api_core import exceptions as google_exceptions
+
         model = self._get_model(system_prompt)
 
         if len(history) > MAX_HISTORY_TURNS:
             history = history[-MAX_HISTORY_TURNS:]
 
-        formatted_history = []
-        for turn in history:
-            user_part = (turn.get("user") or "").strip()
-            assistant_part = (turn.get("assistant") or "").strip()
-            if user_part:
-                formatted_history.append({"role": "user", "parts": [user_part]})
-            if assistant_part:
-                formatted_history.append({"role": "model", "parts": [assistant_part]})
+        # Running summary + the most recent turns, within CHAT_PROMPT_HISTORY_TOKENS
+        formatted_history = build_history_messages(summary, history)
 
         messages = formatted_history + [{"role": "user", "parts": [user_input]}]
 
         for attempt in range(self.retries):
             try:
-                response = model.generate_content(contents=messages)
+                with chat_metrics.stage("gemini_total"), span(
+                    "gen_ai.generate", LLM_MODEL_NAME, attempt=attempt + 1, history_messages=len(formatted_history)
+                ):
+                    response = self._generate(model, messages)
 
                 if response and response.text:
                     usage = getattr(response, "usage_metadata", None)
                     if usage:
-                        logger.info(
+                        prompt_tokens = getattr(usage, "prompt_token_count", None)
+                        output_tokens = getattr(usage, "candidates_token_count", None)
+                        chat_metrics.gemini_prompt_tokens.inc(prompt_tokens or 0)
+                        chat_metrics.gemini_output_tokens.inc(output_tokens or 0)
+                        chat_metrics.note(prompt_tokens=prompt_tokens, output_tokens=output_tokens)
+                        logger.debug(
                             "Gemini response ready",
-                            prompt_tokens=getattr(usage, "prompt_token_count", None),
-                            output_tokens=getattr(usage, "candidates_token_count", None),
+                            prompt_tokens=prompt_tokens,
+                            output_tokens=output_tokens,
                         )
                     return response.text.strip()
 
@@ -99,11 +141,14 @@ class GeminiClient:
                     f"Gemini API error (attempt {attempt + 1}/{self.retries}): {e}. "
                     f"Retrying in {self.delay} seconds..."
                 )
+                chat_metrics.gemini_retries.inc(reason=type(e).__name__)
+                chat_metrics.note(gemini_retries=attempt + 1)
                 time.sleep(self.delay)
             except Exception as e:
                 logger.error(f"An unexpected exception occurred in generate_response: {e}", exc_info=True)
                 break
 
+        chat_metrics.gemini_failures.inc()
         logger.error(f"Failed to generate response after {self.retries} attempts.")
         return "I'm facing a technical issue and can't respond right now. Please try again in a few moments."
 
@@ -0,0 +1,72 @@
+"""
+Chat pipeline metrics (exported on /api/metrics) and the per-request summary.
+
+chat_stage_seconds{stage} covers every graph node and the slow parts inside
+them: input, role, retrieval_embed, faiss_search, prompt_build, gemini_ttfb,
+gemini_total, memory.
+
+The chat endpoint opens a request summary; stage() timings and note()d facts
+from every node land in it (through a context variable, which asyncio tasks
+and to_thread workers inherit) and are logged as one line per request.
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, Optional
+
+from backend.utils.metrics import metrics
+
+stage_seconds = metrics.histogram("chat_stage_seconds", "Time spent in each chat pipeline stage")
+request_seconds = metrics.histogram("chat_request_seconds", "End-to-end /api/chat latency")
+requests_total = metrics.counter("chat_requests_total", "Chat requests by outcome")
+greeting_short_circuits = metrics.counter(
+    "chat_greeting_short_circuits_total", "Turns answered without retrieval because the input was a greeting"
+)
+retrieval_unfiltered_retries = metrics.counter(
+    "chat_retrieval_unfiltered_retries_total", "Searches retried without the metadata filter after an empty result"
+)
+metadata_filters = metrics.counter(
+    "chat_metadata_filters_total", "Retrieval filter decisions by router (intent, keyword) and whether a filter was applied"
+)
+role_decisions = metrics.counter("chat_role_decisions_total", "Role inferred per turn (recruiter, visitor)")
+role_switches = metrics.counter(
+    "chat_role_switches_total", "Turns whose inferred role differs from the session's previous turn, by new role"
+)
+
+gemini_prompt_tokens = metrics.counter("gemini_prompt_tokens_total", "Prompt tokens reported by Gemini")
+gemini_output_tokens = metrics.counter("gemini_output_tokens_total", "Output tokens reported by Gemini")
+gemini_retries = metrics.counter("gemini_retries_total", "Gemini calls retried after a transient error")
+gemini_failures = metrics.counter("gemini_failures_total", "Turns that fell back to an apology after Gemini errors")
+gemini_model_cache = metrics.counter("gemini_model_cache_total", "GenerativeModel cache lookups by result")
+
+_summary: ContextVar[Optional[Dict[str, object]]] = ContextVar("chat_request_summary", default=None)
+
+
+def start_request_summary() -> Dict[str, object]:
+    summary: Dict[str, object] = {"stages_ms": {}}
+    _summary.set(summary)
+    return summary
+
+
+def note(**fields) -> None:
+    """Add facts (doc count, role, tokens, ...) to the current request's summary."""
+    summary = _summary.get()
+    if summary is not None:
+        summary.update(fields)
+
+
+def observe_stage(stage_name: str, seconds: float) -> None:
+    stage_seconds.observe(seconds, stage=stage_name)
+    summary = _summary.get()
+    if summary is not None:
+        stages = summary["stages_ms"]
+        stages[stage_name] = round(stages.get(stage_name, 0.0) + seconds * 1000, 1)
+
+
+@contextmanager
+def stage(stage_name: str) -> Iterator[None]:
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe_stage(stage_name, time.perf_counter() - start)
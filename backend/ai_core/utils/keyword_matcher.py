@@ -0,0 +1,147 @@
+"""
+One-pass keyword matching for the keyword lists in backend/config.py.
+
+Every list (recruiter, greeting, search and the RAG metadata-filter keywords)
+is compiled into a single Aho–Corasick automaton. find() lowers the input once,
+walks it once and returns every hit for every category. The automaton is built
+as a full transition table (failure links folded in), so each character costs
+one dict lookup.
+
+Keywords match whole words: a hit must start and end at a word boundary, so
+"role" does not match "control" and "work" does not match "network". A keyword
+ending in "*" is a stem, so only its start must be at a boundary
+("recruit*" matches "recruiter" and "recruiting").
+
+reload() rebuilds the automaton from the current config lists and swaps it in
+atomically, so matching in other threads is never interrupted. Call it after
+the lists change, e.g. following importlib.reload(backend.config).
+"""
+import threading
+from collections import deque
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import structlog
+
+from backend import config
+
+logger = structlog.get_logger(__name__)
+
+STEM = "*"
+
+
+class KeywordHit(NamedTuple):
+    category: str
+    keyword: str
+    start: int
+    end: int
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+class _Automaton:
+    __slots__ = ("delta", "outputs")
+
+    def __init__(self, categories: Dict[str, Iterable[str]]):
+        # Trie
+        goto: List[Dict[str, int]] = [{}]
+        # Per state: (category, keyword, length, is_stem) for every keyword ending here
+        outputs: List[List[Tuple[str, str, int, bool]]] = [[]]
+        for category, keywords in categories.items():
+            for raw in keywords:
+                keyword = raw.strip().lower()
+                is_stem = keyword.endswith(STEM)
+                keyword = keyword.rstrip(STEM)
+                if not keyword:
+                    continue
+                state = 0
+                for ch in keyword:
+                    nxt = goto[state].get(ch)
+                    if nxt is None:
+                        nxt = len(goto)
+                        goto[state][ch] = nxt
+                        goto.append({})
+                        outputs.append([])
+                    state = nxt
+                outputs[state].append((category, keyword, len(keyword), is_stem))
+
+        # Failure links, breadth first; fold them into a full transition table and merge outputs
+        fail = [0] * len(goto)
+        delta: List[Dict[str, int]] = [dict(goto[0])]
+        delta.extend({} for _ in range(len(goto) - 1))
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            outputs[state] = outputs[state] + outputs[fail[state]]
+            transitions = dict(delta[fail[state]])
+            transitions.update(goto[state])
+            delta[state] = transitions
+            for ch, nxt in goto[state].items():
+                fail[nxt] = delta[fail[state]].get(ch, 0)
+                queue.append(nxt)
+
+        self.delta = delta
+        self.outputs = [tuple(out) for out in outputs]
+
+
+class KeywordMatcher:
+    def __init__(self, categories: Optional[Dict[str, Iterable[str]]] = None):
+        self._lock = threading.Lock()
+        self._automaton = _Automaton({})
+        self.categories: List[str] = []
+        self.reload(categories)
+
+    def reload(self, categories: Optional[Dict[str, Iterable[str]]] = None) -> None:
+        """Rebuild from `categories`, or from the current config lists when omitted."""
+        if categories is None:
+            categories = config_categories()
+        automaton = _Automaton(categories)
+        with self._lock:
+            self._automaton = automaton
+            self.categories = list(categories)
+        logger.debug(f"Keyword matcher compiled: {len(categories)} categories, {len(automaton.delta)} states")
+
+    def scan(self, text: str) -> List[KeywordHit]:
+        """Every whole-word keyword occurrence in `text` (offsets into the lowered text), in order of where it ends."""
+        automaton = self._automaton
+        delta = automaton.delta
+        outputs = automaton.outputs
+        text = (text or "").lower()
+        size = len(text)
+        hits: List[KeywordHit] = []
+        state = 0
+        for i, ch in enumerate(text):
+            state = delta[state].get(ch, 0)
+            if outputs[state]:
+                for category, keyword, length, is_stem in outputs[state]:
+                    start = i + 1 - length
+                    if start > 0 and _is_word_char(text[start - 1]):
+                        continue
+                    if not is_stem and i + 1 < size and _is_word_char(text[i + 1]):
+                        continue
+                    hits.append(KeywordHit(category, keyword, start, i + 1))
+        return hits
+
+    def find(self, text: str) -> Dict[str, List[KeywordHit]]:
+        """Hits grouped by category; categories without a hit are absent."""
+        found: Dict[str, List[KeywordHit]] = {}
+        for hit in self.scan(text):
+            found.setdefault(hit.category, []).append(hit)
+        return found
+
+
+def config_categories() -> Dict[str, List[str]]:
+    """The keyword lists from backend.config, read at call time so a reloaded config is picked up."""
+    categories: Dict[str, List[str]] = {
+        "recruiter": list(config.RECRUITER_KEYWORDS),
+        "search": list(config.SEARCH_KEYWORDS),
+        "greeting": list(config.GREETING_KEYWORDS),
+        "current": list(config.CURRENT_ROLE_KEYWORDS),
+    }
+    for doc_type, keywords in config.METADATA_FILTER_KEYWORDS.items():
+        categories[f"type:{doc_type}"] = list(keywords)
+    return categories
+
+
+keyword_matcher = KeywordMatcher()
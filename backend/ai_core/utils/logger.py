@@ -3,4 +3,4 @@ import structlog
 logger = structlog.get_logger(__name__)
 
 def log_interaction(user_input, response):
-    logger.info("User Interaction", user_input=user_input, response=response)
\ No newline at end of file
+    logger.debug("User Interaction", user_input=user_input, response=response)
\ No newline at end of file
@@ -0,0 +1,72 @@
+"""
+Token estimates and the token-budgeted conversation part of the prompt.
+
+Counts are estimated locally (about four characters per token for English
+text) rather than with a count_tokens round trip per turn; the budget only has
+to keep prompt size flat, not be exact.
+"""
+from typing import Dict, List
+
+from backend.config import CHAT_PROMPT_HISTORY_TOKENS, CHAT_PROMPT_TURN_MAX_TOKENS
+
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    return (len(text or "") + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def clip_to_tokens(text: str, max_tokens: int) -> str:
+    """Cut `text` to roughly `max_tokens`, at a word boundary where possible."""
+    text = (text or "").strip()
+    limit = max_tokens * CHARS_PER_TOKEN
+    if len(text) <= limit:
+        return text
+    cut = text[:limit]
+    space = cut.rfind(" ")
+    if space > limit // 2:
+        cut = cut[:space]
+    return cut.rstrip() + "…"
+
+
+def build_history_messages(
+    summary: str,
+    history: List[Dict[str, str]],
+    budget: int = CHAT_PROMPT_HISTORY_TOKENS,
+    turn_max_tokens: int = CHAT_PROMPT_TURN_MAX_TOKENS,
+) -> List[Dict]:
+    """
+    Gemini `contents` for the conversation so far: the running summary, then
+    as many of the most recent turns as fit in `budget` tokens. Each side of a
+    turn is clipped to `turn_max_tokens`, so long answers are not replayed in full.
+    """
+    remaining = budget
+    summary_messages: List[Dict] = []
+    summary = (summary or "").strip()
+    if summary:
+        text = clip_to_tokens(f"Summary of our earlier conversation: {summary}", budget // 2)
+        summary_messages = [
+            {"role": "user", "parts": [text]},
+            {"role": "model", "parts": ["Noted."]},
+        ]
+        remaining -= estimate_tokens(text) + 1
+
+    turns: List[List[Dict]] = []
+    for turn in reversed(history or []):
+        user_part = clip_to_tokens(turn.get("user") or "", turn_max_tokens)
+        assistant_part = clip_to_tokens(turn.get("assistant") or "", turn_max_tokens)
+        cost = estimate_tokens(user_part) + estimate_tokens(assistant_part)
+        if cost > remaining:
+            break
+        remaining -= cost
+        messages = []
+        if user_part:
+            messages.append({"role": "user", "parts": [user_part]})
+        if assistant_part:
+            messages.append({"role": "model", "parts": [assistant_part]})
+        turns.append(messages)
+
+    result = list(summary_messages)
+    for messages in reversed(turns):
+        result.extend(messages)
+    return result
@@ -0,0 +1,33 @@
+"""Add knowledge_outbox table for durable CDC fan-out
+
+Revision ID: c4d8e2f1a907
+Revises: a1b2c3d4e5f6
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'c4d8e2f1a907'
+down_revision = 'a1b2c3d4e5f6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'knowledge_outbox',
+        sa.Column('seq', sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column('op', sa.String(length=16), nullable=False),
+        sa.Column('doc_type', sa.String(length=32), nullable=False),
+        sa.Column('row_id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('seq'),
+    )
+    op.create_index(op.f('ix_knowledge_outbox_created_at'), 'knowledge_outbox', ['created_at'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_knowledge_outbox_created_at'), table_name='knowledge_outbox')
+    op.drop_table('knowledge_outbox')
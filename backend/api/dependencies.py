@@ -4,9 +4,10 @@ Common dependencies and utilities for API endpoints.
 from typing import TypeVar, Type
 
 from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from backend.database import SessionLocal
+from backend.database import SessionLocal, get_async_db  # noqa: F401  (re-exported for endpoints)
 
 T = TypeVar('T')
 
@@ -47,3 +48,19 @@ def get_object_or_404(db: Session, model: Type[T], object_id: int) -> T:
         )
     
     return obj
+
+
+async def get_object_or_404_async(db: AsyncSession, model: Type[T], object_id: int) -> T:
+    """
+    Async-session variant of get_object_or_404.
+    Raises HTTPException 404 if the object does not exist.
+    """
+    obj = await db.get(model, object_id)
+
+    if not obj:
+        raise HTTPException(
+            status_code=404,
+            detail=f"{model.__name__} with id {object_id} not found"
+        )
+
+    return obj
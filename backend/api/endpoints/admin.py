@@ -1,5 +1,4 @@
 import asyncio
-import json
 import os
 import logging
 from collections import defaultdict
@@ -8,7 +7,8 @@ from typing import List, Optional, Union
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Request, WebSocket, UploadFile, File, Form
 from pydantic import BaseModel
-from sqlalchemy import func
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from backend.api.auth.jwt import (
@@ -17,10 +17,18 @@ from backend.api.auth.jwt import (
     require_admin,
     ACCESS_TOKEN_EXPIRE_DAYS
 )
-from backend.api.dependencies import get_db, get_object_or_404
+from backend.api.dependencies import get_async_db, get_db, get_object_or_404_async
+from backend.config import LOGS_DIR
 from backend.models import sql_models as models
 from backend.models import schemas
 from backend.services.file_upload import FileUploadService
+from backend.services.public_content import collection_body_async
+from backend.services.response_cache import cached_response
+from backend.services.stats_counters import stats_counters
+from backend.services.transcript_store import transcript_store
+from backend.utils.log_reader import LineFilter, entry_level, is_index_file, read_page
+from backend.utils.log_tailer import log_tailers
+from backend.utils.shared_files import is_lock_file
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -33,6 +41,10 @@ class TokenResponse(BaseModel):
     access_token: str
     token_type: str = "bearer"
 
+async def _cached_list(request: Request, key: str, db: AsyncSession):
+    """Public list endpoints: serialised once, then served from memory until a commit changes the table."""
+    return cached_response(request, await collection_body_async(db, key))
+
 @router.post("/admin/login", response_model=TokenResponse, tags=["Authentication"])
 async def admin_login(request: LoginRequest):
     if not verify_credentials(request.username, request.password):
@@ -49,9 +61,23 @@ async def admin_login(request: LoginRequest):
     
     return {"access_token": access_token, "token_type": "bearer"}
 
-@router.get("/admin/chats", tags=["Legacy"])
-async def get_chat_logs(authenticated: bool = Depends(require_admin)):
-    return {"message": "Chat logs endpoint (to be implemented)"}
+@router.get("/admin/chats", tags=["Chats"])
+def get_chat_logs(
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    user_name: Optional[str] = None,
+    q: Optional[str] = Query(None, description="Full-text search over questions and answers"),
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    authenticated: bool = Depends(require_admin)
+):
+    """Chat transcripts, newest first, keyset-paginated: pass next_cursor back as cursor."""
+    if transcript_store is None:
+        raise HTTPException(status_code=404, detail="Transcript store is disabled (CHAT_TRANSCRIPT_DB)")
+    try:
+        return transcript_store.page(limit, cursor=cursor, user_name=user_name, q=q, since=since, until=until)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 @router.post("/admin/content", tags=["Legacy"])
 async def post_content(
@@ -62,11 +88,10 @@ async def post_content(
 
 @router.get("/admin/logs", response_model=List[str], tags=["Logs"])
 def list_log_files(authenticated: bool = Depends(require_admin)):
-    from backend.main import LOGS_DIR as log_dir
     try:
         log_files = [
-            f for f in os.listdir(log_dir)
-            if os.path.isfile(os.path.join(log_dir, f))
+            f for f in os.listdir(LOGS_DIR)
+            if os.path.isfile(os.path.join(LOGS_DIR, f)) and not is_index_file(f) and not is_lock_file(f)
         ]
         return log_files
     except FileNotFoundError:
@@ -79,71 +104,81 @@ def get_log_file_content(
     filename: str,
     limit: int = Query(100, ge=1, le=1000),
     offset: int = Query(0, ge=0),
+    tail: bool = Query(False, description="Page back from the end: offset counts lines skipped from EOF"),
+    level: Optional[str] = Query(None, description="Comma-separated levels, e.g. error,warning"),
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
     authenticated: bool = Depends(require_admin)
 ):
-    from backend.main import LOGS_DIR as log_dir
-    file_path = os.path.join(log_dir, filename)
+    file_path = os.path.join(LOGS_DIR, filename)
     
-    if not os.path.isfile(file_path):
+    if is_index_file(filename) or is_lock_file(filename) or not os.path.isfile(file_path):
         raise HTTPException(status_code=404, detail="Log file not found")
     
+    levels = {part.strip() for part in level.split(",") if part.strip()} if level else None
     try:
-        with open(file_path, 'r') as f:
-            paginated_lines = []
-            for i, line in enumerate(f):
-                if i < offset:
-                    continue
-                if i >= offset + limit:
-                    break
-                paginated_lines.append(line)
-            
-            parsed_logs = defaultdict(list)
-            for line in paginated_lines:
-                try:
-                    log_entry = json.loads(line)
-                    log_level = log_entry.get("log_level", "unknown")
-                    parsed_logs[log_level].append(log_entry)
-                except json.JSONDecodeError:
-                    parsed_logs["parsing_errors"].append(line.strip())
-            
-            return {
-                "filename": filename,
-                "limit": limit,
-                "offset": offset,
-                "logs": parsed_logs
-            }
+        page = read_page(file_path, limit, offset, tail=tail, line_filter=LineFilter(levels, since, until))
     except Exception as e:
         raise HTTPException(
             status_code=500,
             detail=f"Error reading or parsing file: {str(e)}"
         )
 
+    parsed_logs = defaultdict(list)
+    for entry in page["entries"]:
+        parsed_logs[entry_level(entry)].append(entry)
+    
+    return {
+        "filename": filename,
+        "limit": limit,
+        "offset": offset,
+        "tail": tail,
+        "next_offset": page["next_offset"],
+        "total_lines": page["total_lines"],
+        "logs": parsed_logs
+    }
+
 @router.websocket("/admin/logs/stream/{filename}")
-async def stream_log_file(websocket: WebSocket, filename: str):
+async def stream_log_file(
+    websocket: WebSocket,
+    filename: str,
+    level: Optional[str] = None,
+    q: Optional[str] = None
+):
+    """New lines as they are written, batched per frame; optional level (comma list) and keyword filters."""
     await websocket.accept()
-    from backend.main import LOGS_DIR as log_dir
-    file_path = os.path.join(log_dir, filename)
+    file_path = os.path.join(LOGS_DIR, filename)
     
-    if not os.path.isfile(file_path):
+    if is_index_file(filename) or is_lock_file(filename) or not os.path.isfile(file_path):
         await websocket.close(code=4004, reason="Log file not found")
         return
     
+    levels = {part.strip() for part in level.split(",") if part.strip()} if level else None
+    subscriber = log_tailers.subscribe(file_path, levels, q)
+
+    async def send():
+        while True:
+            await websocket.send_text(await subscriber.next_batch())
+
+    async def receive():
+        # Only here to notice the client going away
+        while (await websocket.receive())["type"] != "websocket.disconnect":
+            pass
+
+    tasks = [asyncio.create_task(send()), asyncio.create_task(receive())]
     try:
-        with open(file_path, 'r') as f:
-            f.seek(0, 2)
-            while True:
-                line = f.readline()
-                if not line:
-                    await asyncio.sleep(0.5)
-                    continue
-                await websocket.send_text(line)
+        await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
     except Exception:
         pass
+    finally:
+        for task in tasks:
+            task.cancel()
+        log_tailers.unsubscribe(file_path, subscriber)
 
 @router.post("/admin/cv/upload", response_model=schemas.CVResponse, tags=["CV"])
 async def upload_cv(
     file: UploadFile = File(...),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     authenticated: bool = Depends(require_admin)
 ):
     logger.info(f"CV upload started - Filename: {getattr(file, 'filename', 'N/A')}")
@@ -153,8 +188,8 @@ async def upload_cv(
             logger.info(f"CV uploaded to Supabase: {public_url}")
             db_cv = models.CV(url=public_url)
             db.add(db_cv)
-            db.commit()
-            db.refresh(db_cv)
+            await db.commit()
+            await db.refresh(db_cv)
             return db_cv
         except Exception as e:
             logger.error(f"Failed to upload CV: {str(e)}")
@@ -162,30 +197,30 @@ async def upload_cv(
     raise HTTPException(status_code=400, detail="No valid file provided")
 
 @router.get("/admin/cv", response_model=List[schemas.CVResponse], tags=["CV"])
-def get_cvs(db: Session = Depends(get_db)):
-    return db.query(models.CV).all()
+async def get_cvs(request: Request, db: AsyncSession = Depends(get_async_db)):
+    return await _cached_list(request, "cvs", db)
 
 @router.delete("/admin/cv/{cv_id}", tags=["CV"])
 async def delete_cv(
     cv_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     authenticated: bool = Depends(require_admin)
 ):
-    db_cv = get_object_or_404(db, models.CV, cv_id)
-    db.delete(db_cv)
-    db.commit()
+    db_cv = await get_object_or_404_async(db, models.CV, cv_id)
+    await db.delete(db_cv)
+    await db.commit()
     return {"message": "CV deleted successfully"}
 
 @router.post("/admin/skills", response_model=schemas.TechnicalSkillResponse, tags=["Technical Skills"])
 async def create_skill(
     skill: schemas.TechnicalSkillCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     authenticated: bool = Depends(require_admin)
 ):
     db_skill = models.TechnicalSkill(**skill.dict())
     db.add(db_skill)
-    db.commit()
-    db.refresh(db_skill)
+    await db.commit()
+    await db.refresh(db_skill)
     return db_skill
 
 @router.post("/admin/skills/upload", response_model=schemas.TechnicalSkillResponse, tags=["Technical Skills"])
@@ -194,7 +229,7 @@ async def upload_skill(
     name: str = Form(...),
     category: Optional[str] = Form(None),
     proficiency: Optional[str] = Form(None),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     authenticated: bool = Depends(require_admin)
 ):
     icon_url = None
@@ -212,22 +247,22 @@ async def upload_skill(
         icon=icon_url
     )
     db.add(db_skill)
-    db.commit()
-    db.refresh(db_skill)
+    await db.commit()
+    await db.refresh(db_skill)
     return db_skill
 
 @router.get("/admin/skills", response_model=List[schemas.TechnicalSkillResponse], tags=["Technical Skills"])
-def get_skills(db: Session = Depends(get_db)):
-    return db.query(models.TechnicalSkill).all()
+async def get_skills(request: Request, db: AsyncSession = Depends(get_async_db)):
+    return await _cached_list(request, "skills", db)
 
 @router.put("/admin/skills/{skill_id}", response_model=schemas.TechnicalSkillResponse, tags=["Technical Skills"])
 async def update_skill(
     skill_id: int,
     skill: schemas.TechnicalSkillUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     authenticated: bool = Depends(require_admin)
 ):
-    db_skill = get_object_or_404(db, models.TechnicalSkill, skill_id)
+    db_skill = await get_object_or_404_async(db, models.TechnicalSkill, skill_id)
     
     def should_update(value):
         if value is None:
@@ -243,45 +278,45 @@ async def update_skill(
         else:
             setattr(db_skill, key, value)
     
-    db.commit()
-    db.refresh(db_skill)
+    await db.commit()
+    await db.refresh(db_skill)
     return db_skill
 
 @router.delete("/admin/skills/{skill_id}", tags=["Technical Skills"])
 async def delete_skill(
     skill_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     authenticated: bool = Depends(require_admin)
 ):
-    db_skill = get_object_or_404(db, models.TechnicalSkill, skill_id)
-    db.delete(db_skill)
-    db.commit()
+    db_skill = await get_object_or_404_async(db, models.TechnicalSkill, skill_id)
+    await db.delete(db_skill)
+    await db.commit()
     return {"message": "Skill deleted successfully"}
 
 @router.post("/admin/education", response_model=schemas.EducationResponse, tags=["Education"])
 async def create_education(
     education: schemas.EducationCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     authenticated: bool = Depends(require_admin)
 ):
     db_education = models.Education(**education.dict())
     db.add(db_education)
-    db.commit()
-    db.refresh(db_education)
+    await db.commit()
+    await db.refresh(db_education)
     return db_education
 
 @router.get("/admin/education", response_model=List[schemas.EducationResponse], tags=["Education"])
-def get_education(db: Session = Depends(get_db)):
-    return db.query(models.Education).all()
+async def get_education(request: Request, db: AsyncSession = Depends(get_async_db)):
+    return await _cached_list(request, "education", db)
 
 @router.put("/admin/education/{education_id}", response_model=schemas.EducationResponse, tags=["Education"])
 async def update_education(
     education_id: int,
     education: schemas.EducationUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     authenticated: bool = Depends(require_admin)
 ):
-    db_education = get_object_or_404(db, models.Education, education_id)
+    db_education = await get_object_or_404_async(db, models.Education, education_id)
     
     def should_update(value):
         if value is None:
@@ -297,31 +332,31 @@ async def update_education(
         else:
             setattr(db_education, key, value)
     
-    db.commit()
-    db.refresh(db_education)
+    await db.commit()
+    await db.refresh(db_education)
     return db_education
 
 @router.delete("/admin/education/{education_id}", tags=["Education"])
 async def delete_education(
     education_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     authenticated: bool = Depends(require_admin)
 ):
-    db_education = get_object_or_404(db, models.Education, education_id)
-    db.delete(db_education)
-    db.commit()
+    db_education = await get_object_or_404_async(db, models.Education, education_id)
+    await db.delete(db_education)
+    await db.commit()
     return {"message": "Education entry deleted successfully"}
 
 @router.post("/admin/certificates", response_model=schemas.CertificateResponse, tags=["Certificates"])
 async def create_certificate(
     certificate: schemas.CertificateCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     authenticated: bool = Depends(require_admin)
 ):
     db_certificate = models.Certificate(**certificate.dict())
     db.add(db_certificate)
-    db.commit()
-    db.refresh(db_certificate)
+    await db.commit()
+    await db.refresh(db_certificate)
     return db_certificate
 
 @router.post("/admin/certificates/upload", response_model=schemas.CertificateResponse, tags=["Certificates"])
@@ -332,7 +367,7 @@ async def upload_certificate(
     date_issued_str: Optional[str] = Form(None, alias="date_issued"),
     description: Optional[str] = Form(None),
     is_professional: bool = Form(False),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     authenticated: bool = Depends(require_admin)
 ):
     cert_url = None
@@ -359,23 +394,23 @@ async def upload_certificate(
         url=cert_url
     )
     db.add(db_certificate)
-    db.commit()
-    db.refresh(db_certificate)
+    await db.commit()
+    await db.refresh(db_certificate)
     return db_certificate
 
 @router.get("/admin/certificates", response_model=List[schemas.CertificateResponse], tags=["Certificates"])
-def get_certificates(db: Session = Depends(get_db)):
-    return db.query(models.Certificate).all()
+async def get_certificates(request: Request, db: AsyncSession = Depends(get_async_db)):
+    return await _cached_list(request, "certificates", db)
 
 @router.put("/admin/certificates/{certificate_id}", response_model=schemas.CertificateResponse, tags=["Certificates"])
 async def update_certificate(
     certificate_id: int,
     request: Request,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     authenticated: bool = Depends(require_admin)
 ):
     """Update a certificate via JSON body or multipart form (with optional file)."""
-    db_certificate = get_object_or_404(db, models.Certificate, certificate_id)
+    db_certificate = await get_object_or_404_async(db, models.Certificate, certificate_id)
     content_type = (request.headers.get("content-type") or "").lower()
 
     def should_update(value):
@@ -430,8 +465,8 @@ async def update_certificate(
             except ValueError:
                 pass
 
-    db.commit()
-    db.refresh(db_certificate)
+    await db.commit()
+    await db.refresh(db_certificate)
     return db_certificate
 
 @router.put("/admin/certificates/{certificate_id}/upload", response_model=schemas.CertificateResponse, tags=["Certificates"])
@@ -443,11 +478,11 @@ async def update_certificate_with_file(
     date_issued_str: Optional[str] = Form(None, alias="date_issued"),
     description: Optional[str] = Form(None),
     is_professional: Optional[bool] = Form(None),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     authenticated: bool = Depends(require_admin)
 ):
     """Update certificate fields and optionally replace the certificate file."""
-    db_certificate = get_object_or_404(db, models.Certificate, certificate_id)
+    db_certificate = await get_object_or_404_async(db, models.Certificate, certificate_id)
 
     def should_update(value):
         if value is None:
@@ -480,31 +515,31 @@ async def update_certificate_with_file(
         except ValueError:
             pass
 
-    db.commit()
-    db.refresh(db_certificate)
+    await db.commit()
+    await db.refresh(db_certificate)
     return db_certificate
 
 @router.delete("/admin/certificates/{certificate_id}", tags=["Certificates"])
 async def delete_certificate(
     certificate_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     authenticated: bool = Depends(require_admin)
 ):
-    db_certificate = get_object_or_404(db, models.Certificate, certificate_id)
-    db.delete(db_certificate)
-    db.commit()
+    db_certificate = await get_object_or_404_async(db, models.Certificate, certificate_id)
+    await db.delete(db_certificate)
+    await db.commit()
     return {"message": "Certificate deleted successfully"}
 
 @router.post("/admin/moments", response_model=schemas.MemorableMomentResponse, tags=["Memorable Moments"])
 async def create_moment(
     moment: schemas.MemorableMomentCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     authenticated: bool = Depends(require_admin)
 ):
     db_moment = models.MemorableMoment(**moment.dict())
     db.add(db_moment)
-    db.commit()
-    db.refresh(db_moment)
+    await db.commit()
+    await db.refresh(db_moment)
     return db_moment
 
 @router.post("/admin/moments/upload", response_model=schemas.MemorableMomentResponse, tags=["Memorable Moments"])
@@ -513,7 +548,7 @@ async def upload_moment(
     title: str = Form(...),
     description: Optional[str] = Form(None),
     date_str: Optional[str] = Form(None, alias="date"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     authenticated: bool = Depends(require_admin)
 ):
     image_url = None
@@ -538,13 +573,13 @@ async def upload_moment(
         image_url=image_url
     )
     db.add(db_moment)
-    db.commit()
-    db.refresh(db_moment)
+    await db.commit()
+    await db.refresh(db_moment)
     return db_moment
 
 @router.get("/admin/moments", response_model=List[schemas.MemorableMomentResponse], tags=["Memorable Moments"])
-def get_moments(db: Session = Depends(get_db)):
-    return db.query(models.MemorableMoment).all()
+async def get_moments(request: Request, db: AsyncSession = Depends(get_async_db)):
+    return await _cached_list(request, "moments", db)
 
 @router.put("/admin/moments/{moment_id}", response_model=schemas.MemorableMomentResponse, tags=["Memorable Moments"])
 async def update_moment(
@@ -553,10 +588,10 @@ async def update_moment(
     title: Optional[str] = Form(None),
     description: Optional[str] = Form(None),
     date_str: Optional[str] = Form(None, alias="date"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     authenticated: bool = Depends(require_admin)
 ):
-    db_moment = get_object_or_404(db, models.MemorableMoment, moment_id)
+    db_moment = await get_object_or_404_async(db, models.MemorableMoment, moment_id)
 
     def should_update(value):
         if value is None:
@@ -582,25 +617,25 @@ async def update_moment(
         except ValueError:
             pass
 
-    db.commit()
-    db.refresh(db_moment)
+    await db.commit()
+    await db.refresh(db_moment)
     return db_moment
 
 @router.delete("/admin/moments/{moment_id}", tags=["Memorable Moments"])
 async def delete_moment(
     moment_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     authenticated: bool = Depends(require_admin)
 ):
-    db_moment = get_object_or_404(db, models.MemorableMoment, moment_id)
-    db.delete(db_moment)
-    db.commit()
+    db_moment = await get_object_or_404_async(db, models.MemorableMoment, moment_id)
+    await db.delete(db_moment)
+    await db.commit()
     return {"message": "Moment deleted successfully"}
 
 
 @router.post("/admin/moments/dedupe", tags=["Memorable Moments"])
 async def dedupe_moments(
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     authenticated: bool = Depends(require_admin)
 ):
     """
@@ -608,10 +643,10 @@ async def dedupe_moments(
     Keeps the best row per title: prefers one with an image, then lowest id.
     """
     moments = (
-        db.query(models.MemorableMoment)
-        .order_by(models.MemorableMoment.id.asc())
-        .all()
-    )
+        await db.execute(
+            select(models.MemorableMoment).order_by(models.MemorableMoment.id.asc())
+        )
+    ).scalars().all()
 
     keepers: dict[str, models.MemorableMoment] = {}
     removed_ids: list[int] = []
@@ -628,17 +663,17 @@ async def dedupe_moments(
 
         # Prefer the row that has an image URL
         if not existing.image_url and moment.image_url:
-            db.delete(existing)
+            await db.delete(existing)
             removed_ids.append(existing.id)
             keepers[key] = moment
         else:
-            db.delete(moment)
+            await db.delete(moment)
             removed_ids.append(moment.id)
 
     if removed_ids:
-        db.commit()
+        await db.commit()
     else:
-        db.rollback()
+        await db.rollback()
 
     return {
         "message": f"Removed {len(removed_ids)} duplicate moment(s)",
@@ -650,27 +685,27 @@ async def dedupe_moments(
 @router.post("/admin/experience", response_model=schemas.WorkExperienceResponse, tags=["Work Experience"])
 async def create_experience(
     experience: schemas.WorkExperienceCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     authenticated: bool = Depends(require_admin)
 ):
     db_experience = models.WorkExperience(**experience.dict())
     db.add(db_experience)
-    db.commit()
-    db.refresh(db_experience)
+    await db.commit()
+    await db.refresh(db_experience)
     return db_experience
 
 @router.get("/admin/experience", response_model=List[schemas.WorkExperienceResponse], tags=["Work Experience"])
-def get_experience(db: Session = Depends(get_db)):
-    return db.query(models.WorkExperience).all()
+async def get_experience(request: Request, db: AsyncSession = Depends(get_async_db)):
+    return await _cached_list(request, "experience", db)
 
 @router.put("/admin/experience/{experience_id}", response_model=schemas.WorkExperienceResponse, tags=["Work Experience"])
 async def update_experience(
     experience_id: int,
     experience: schemas.WorkExperienceUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     authenticated: bool = Depends(require_admin)
 ):
-    db_experience = get_object_or_404(db, models.WorkExperience, experience_id)
+    db_experience = await get_object_or_404_async(db, models.WorkExperience, experience_id)
     
     def should_update(value):
         if value is None:
@@ -686,31 +721,31 @@ async def update_experience(
         else:
             setattr(db_experience, key, value)
     
-    db.commit()
-    db.refresh(db_experience)
+    await db.commit()
+    await db.refresh(db_experience)
     return db_experience
 
 @router.delete("/admin/experience/{experience_id}", tags=["Work Experience"])
 async def delete_experience(
     experience_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     authenticated: bool = Depends(require_admin)
 ):
-    db_experience = get_object_or_404(db, models.WorkExperience, experience_id)
-    db.delete(db_experience)
-    db.commit()
+    db_experience = await get_object_or_404_async(db, models.WorkExperience, experience_id)
+    await db.delete(db_experience)
+    await db.commit()
     return {"message": "Experience entry deleted successfully"}
 
 @router.post("/admin/projects", response_model=schemas.ProjectResponse, tags=["Projects"])
 async def create_project(
     project: schemas.ProjectCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     authenticated: bool = Depends(require_admin)
 ):
     db_project = models.Project(**project.dict())
     db.add(db_project)
-    db.commit()
-    db.refresh(db_project)
+    await db.commit()
+    await db.refresh(db_project)
     return db_project
 
 @router.post("/admin/projects/upload", response_model=schemas.ProjectResponse, tags=["Projects"])
@@ -723,7 +758,7 @@ async def upload_project(
     project_url: Optional[str] = Form(None),
     github_url: Optional[str] = Form(None),
     is_featured: bool = Form(False),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     authenticated: bool = Depends(require_admin)
 ):
     image_url = None
@@ -745,29 +780,27 @@ async def upload_project(
         image_url=image_url
     )
     db.add(db_project)
-    db.commit()
-    db.refresh(db_project)
+    await db.commit()
+    await db.refresh(db_project)
     return db_project
 
 @router.get("/admin/projects", response_model=List[schemas.ProjectResponse], tags=["Projects"])
-def get_projects(db: Session = Depends(get_db)):
-    return db.query(models.Project).all()
+async def get_projects(request: Request, db: AsyncSession = Depends(get_async_db)):
+    return await _cached_list(request, "projects", db)
 
 @router.get("/admin/projects/stats", tags=["Projects"])
-def get_project_stats(db: Session = Depends(get_db)):
-    total = db.query(func.count(models.Project.id)).scalar()
-    category_counts = db.query(
-        models.Project.category,
-        func.count(models.Project.id).label('count')
-    ).group_by(models.Project.category).all()
-    
+async def get_project_stats(db: AsyncSession = Depends(get_async_db)):
+    counts = await stats_counters.counts_async(db, "projects", "category")
     stats = {
-        "total": total,
+        "total": counts["total"],
         "by_category": {}
     }
-    for category, count in category_counts:
+    by_category = list(counts["by"]["category"].items()) + [(None, counts["unset"]["category"])]
+    for category, count in by_category:
+        if not count:
+            continue
         category_name = category if category else "Uncategorized"
-        stats["by_category"][category_name] = count
+        stats["by_category"][category_name] = stats["by_category"].get(category_name, 0) + count
     return stats
 
 @router.get("/admin/projects/category/{category}", response_model=List[schemas.ProjectResponse], tags=["Projects"])
@@ -794,10 +827,10 @@ async def update_project(
     project_url: Optional[str] = Form(None),
     github_url: Optional[str] = Form(None),
     is_featured: Optional[bool] = Form(None),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     authenticated: bool = Depends(require_admin)
 ):
-    db_project = get_object_or_404(db, models.Project, project_id)
+    db_project = await get_object_or_404_async(db, models.Project, project_id)
     
     def should_update(value):
         if value is None:
@@ -827,17 +860,17 @@ async def update_project(
     if is_featured is not None:
         db_project.is_featured = is_featured
     
-    db.commit()
-    db.refresh(db_project)
+    await db.commit()
+    await db.refresh(db_project)
     return db_project
 
 @router.delete("/admin/projects/{project_id}", tags=["Projects"])
 async def delete_project(
     project_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     authenticated: bool = Depends(require_admin)
 ):
-    db_project = get_object_or_404(db, models.Project, project_id)
-    db.delete(db_project)
-    db.commit()
+    db_project = await get_object_or_404_async(db, models.Project, project_id)
+    await db.delete(db_project)
+    await db.commit()
     return {"message": "Project deleted successfully"}
\ No newline at end of file
@@ -1,10 +1,14 @@
+import asyncio
 import logging
 import time
 import bleach
 from typing import List, Optional
-from fastapi import APIRouter, HTTPException, Request
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Request
 from pydantic import BaseModel
-from backend.ai_core.agent.graph import create_chatbot_graph
+from backend.ai_core.agent.graph import get_chatbot_graph
+from backend.ai_core.memory import summarizer
+from backend.ai_core.memory.session_manager import session_manager
+from backend.ai_core.utils import chat_metrics
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -16,25 +20,40 @@ class ChatMessage(BaseModel):
 class ChatRequest(BaseModel):
     message: str
     user_name: Optional[str] = "there"
+    # Issued by the server in every response; the conversation itself is kept server-side
+    session_id: Optional[str] = None
+    # Only seeds a new session (clients that do not send session_id yet)
     history: Optional[List[ChatMessage]] = []
 
 @router.post("/chat")
-async def chat_endpoint(request: Request, chat_request: ChatRequest):
+async def chat_endpoint(request: Request, chat_request: ChatRequest, background_tasks: BackgroundTasks):
     start_time = time.time()
-    logger.info(f"Received chat request from user: {chat_request.user_name}")
+    summary = chat_metrics.start_request_summary()
+    status = "error"
     
     try:
-        graph = request.app.state.graph
+        graph = getattr(request.app.state, "graph", None)
+        if graph is None:
+            # Warm-up has not finished yet; build (or wait for) the graph off the event loop
+            graph = await asyncio.to_thread(get_chatbot_graph, request.app.state)
         if graph is None:
             logger.error("Chatbot graph not found in application state.")
             raise HTTPException(status_code=500, detail="Chatbot is not available.")
 
         sanitized_message = bleach.clean(chat_request.message)
+        session = await asyncio.to_thread(
+            session_manager.get_or_create,
+            chat_request.session_id,
+            [hist.dict() for hist in chat_request.history or []],
+        )
 
         initial_state = {
             "input": sanitized_message,
             "user_name": chat_request.user_name,
-            "history": [hist.dict() for hist in chat_request.history],
+            "history": list(session.history),
+            "summary": session.summary,
+            "role_confidence": session.role_confidence,
+            "is_recruiter": session.is_recruiter,
             "profile": request.app.state.profile,
         }
 
@@ -47,11 +66,17 @@ async def chat_endpoint(request: Request, chat_request: ChatRequest):
         final_response = response_state.get("response", "Sorry, I couldn't process your request.")
         file_url = response_state.get("file_url")
         
-        end_time = time.time()
-        response_time = end_time - start_time
-        logger.info(f"Response generated in {response_time:.2f} seconds.")
-        
-        response_payload = {"response": final_response}
+        summary["is_recruiter"] = bool(response_state.get("is_recruiter"))
+        session.set_history(response_state.get("history") or session.history)
+        session.role_confidence = response_state.get("role_confidence")
+        session.is_recruiter = summary["is_recruiter"]
+        await asyncio.to_thread(session_manager.save, session)
+        if summarizer.due(session):
+            # Runs after the response has been sent
+            background_tasks.add_task(summarizer.fold, session.session_id)
+        status = "ok"
+
+        response_payload = {"response": final_response, "session_id": session.session_id}
         if file_url:
             response_payload["file_url"] = file_url
 
@@ -60,3 +85,17 @@ async def chat_endpoint(request: Request, chat_request: ChatRequest):
     except Exception as e:
         logger.error(f"An unexpected error occurred in the chat endpoint: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail="An internal server error occurred.")
+    finally:
+        # One summary line per request instead of an info line per graph node
+        response_time = time.time() - start_time
+        chat_metrics.request_seconds.observe(response_time)
+        chat_metrics.requests_total.inc(status=status)
+        logger.info(
+            "Chat request handled",
+            extra={
+                "user_name": chat_request.user_name,
+                "status": status,
+                "duration_ms": round(response_time * 1000, 1),
+                **summary,
+            },
+        )
@@ -1,9 +1,11 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy import text
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime
 
-from backend.api.dependencies import get_db
+from backend.api.dependencies import get_async_db
+from backend.database import pool_overview
+from backend.utils.metrics import metrics
 
 router = APIRouter(tags=["Health"])
 
@@ -22,12 +24,12 @@ async def health_check():
 
 
 @router.get("/health/ready")
-async def readiness_check(db: Session = Depends(get_db)):
+async def readiness_check(db: AsyncSession = Depends(get_async_db)):
     """
     Readiness check: API + database connectivity.
     """
     try:
-        db.execute(text("SELECT 1"))
+        await db.execute(text("SELECT 1"))
         return {
             "status": "ready",
             "timestamp": datetime.utcnow().isoformat(),
@@ -48,12 +50,12 @@ async def readiness_check(db: Session = Depends(get_db)):
 
 
 @router.get("/health/db")
-async def database_health(db: Session = Depends(get_db)):
+async def database_health(db: AsyncSession = Depends(get_async_db)):
     """
     Detailed database health check.
     """
     try:
-        result = db.execute(text("SELECT version()"))
+        result = await db.execute(text("SELECT version()"))
         version = result.scalar()
 
         return {
@@ -70,3 +72,16 @@ async def database_health(db: Session = Depends(get_db)):
                 "timestamp": datetime.utcnow().isoformat(),
             },
         )
+
+
+@router.get("/health/db/pool")
+async def database_pool():
+    """
+    Connection-pool state and metrics: checkout wait histogram, in-use,
+    overflow, invalidations and timeouts, per pool (sync / async).
+    """
+    return {
+        **pool_overview(),
+        "metrics": {**metrics.snapshot("db_pool_"), **metrics.snapshot("db_disconnects")},
+        "timestamp": datetime.utcnow().isoformat(),
+    }
@@ -1,8 +1,9 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from backend.api.auth.jwt import require_admin
 from backend.services.knowledge_refresh import (
     get_knowledge_status,
     full_rebuild,
+    refresh_csv_sources,
 )
 
 router = APIRouter()
@@ -15,12 +16,21 @@ def knowledge_status():
 
 
 @router.post("/admin/knowledge/refresh", tags=["Knowledge"])
-def refresh_knowledge(authenticated: bool = Depends(require_admin)):
+def refresh_knowledge(
+    scope: str = Query("all", pattern="^(all|csv)$"),
+    authenticated: bool = Depends(require_admin),
+):
     """
-    Force a full rebuild from DB + static sources.
+    Force a full rebuild from DB + static sources, or (scope=csv) only re-sync changed CSV files.
     Normal updates happen automatically via change capture on admin writes.
     """
     try:
+        if scope == "csv":
+            return {
+                "message": "CSV sources re-synced",
+                "csv": refresh_csv_sources(),
+                **get_knowledge_status(),
+            }
         full_rebuild()
         return {
             "message": "Knowledge base fully rebuilt",
@@ -0,0 +1,18 @@
+from fastapi import APIRouter, Depends, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.api.dependencies import get_async_db
+from backend.services.public_content import portfolio_body_async
+from backend.services.response_cache import cached_response
+
+router = APIRouter(tags=["Portfolio"])
+
+
+@router.get("/portfolio")
+async def get_portfolio(request: Request, db: AsyncSession = Depends(get_async_db)):
+    """
+    Every public collection plus the stats counters in one response, for first paint.
+    Served from memory once built; strong ETag (304 on revalidation) and
+    precompressed gzip/br bodies. A commit to any collection produces a new version.
+    """
+    return cached_response(request, await portfolio_body_async(db))
@@ -1,34 +1,37 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from sqlalchemy import func
-from backend.database import SessionLocal
-from backend.models import sql_models as models
+from typing import Optional
 
-router = APIRouter(tags=["stats"])
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from backend.api.dependencies import get_async_db
+from backend.services.public_content import stats_body_async
+from backend.services.response_cache import cached_response
+from backend.services.stats_counters import ENTITIES, stats_counters
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+router = APIRouter(tags=["stats"])
 
 @router.get("/stats")
-def get_stats(db: Session = Depends(get_db)):
-    total_projects = db.query(func.count(models.Project.id)).scalar()
-    total_skills = db.query(func.count(models.TechnicalSkill.id)).scalar()
-    
-    ai_ml_projects = db.query(func.count(models.Project.id)).filter(
-        models.Project.category == "AI/ML"
-    ).scalar()
-    
-    data_solutions = db.query(func.count(models.Project.id)).filter(
-        models.Project.category == "Data Solutions"
-    ).scalar()
-    
-    return {
-        "totalProjects": total_projects or 0,
-        "totalSkills": total_skills or 0,
-        "aiMlProjects": ai_ml_projects or 0,
-        "dataSolutions": data_solutions or 0
-    }
+async def get_stats(request: Request, db: AsyncSession = Depends(get_async_db)):
+    return cached_response(request, await stats_body_async(db))
+
+@router.get("/stats/counts")
+async def get_counts(
+    entity: Optional[str] = Query(None, description="projects, skills, experience, education, certificates, moments or cvs"),
+    dimension: Optional[str] = Query(None, description="Category column to break the count down by, e.g. category"),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Counts from the in-memory counters. Without `entity`, every entity with all
+    of its dimensions; with `dimension`, only that breakdown. Rows with no value
+    are counted per dimension under "unset".
+    """
+    if entity is None:
+        if dimension is not None:
+            raise HTTPException(status_code=400, detail="dimension requires entity")
+        return {name: await stats_counters.counts_async(db, name) for name in ENTITIES}
+    if entity not in ENTITIES:
+        raise HTTPException(status_code=404, detail=f"Unknown entity '{entity}'")
+    try:
+        return await stats_counters.counts_async(db, entity, dimension)
+    except KeyError:
+        dimensions = ", ".join(ENTITIES[entity][1]) or "none"
+        raise HTTPException(status_code=404, detail=f"Unknown dimension '{dimension}' for {entity} (available: {dimensions})")
@@ -13,6 +13,18 @@ LLM_MODEL_NAME = os.getenv("LLM_MODEL_NAME", "gemini-2.5-flash")
 LLM_TEMPERATURE = float(os.getenv("LLM_TEMPERATURE", 0.4))
 MAX_OUTPUT_TOKENS = int(os.getenv("MAX_OUTPUT_TOKENS", "512"))
 MAX_HISTORY_TURNS = int(os.getenv("MAX_HISTORY_TURNS", "4"))
+# Server-side chat sessions: in-process LRU with an idle TTL, written through to a SQLite file
+# shared by all workers (empty CHAT_SESSION_DB keeps sessions per process)
+CHAT_SESSION_CACHE_SIZE = int(os.getenv("CHAT_SESSION_CACHE_SIZE", "1000"))
+CHAT_SESSION_TTL_SECONDS = float(os.getenv("CHAT_SESSION_TTL_SECONDS", str(24 * 3600)))
+CHAT_SESSION_DB = os.getenv("CHAT_SESSION_DB", "backend/data/chat_sessions.db")
+# Prompt history budget (estimated tokens) for the running summary plus the most recent turns,
+# and the cap on each side of a replayed turn
+CHAT_PROMPT_HISTORY_TOKENS = int(os.getenv("CHAT_PROMPT_HISTORY_TOKENS", "800"))
+CHAT_PROMPT_TURN_MAX_TOKENS = int(os.getenv("CHAT_PROMPT_TURN_MAX_TOKENS", "200"))
+# Turns that leave the history window are folded into a running summary after the response is sent
+CHAT_SUMMARY_MAX_TOKENS = int(os.getenv("CHAT_SUMMARY_MAX_TOKENS", "150"))
+CHAT_SUMMARY_BATCH_TURNS = int(os.getenv("CHAT_SUMMARY_BATCH_TURNS", "2"))
 
 EMBEDDINGS_MODEL_NAME = "all-MiniLM-L6-v2"
 
@@ -20,12 +32,83 @@ EMBEDDINGS_MODEL_NAME = "all-MiniLM-L6-v2"
 FAISS_DOCUMENT_COUNT = 10
 FAISS_SEARCH_K = int(os.getenv("FAISS_SEARCH_K", "2"))
 MAX_RETRIEVED_DOCS = int(os.getenv("MAX_RETRIEVED_DOCS", "4"))
+# Embedding intent router for RAG metadata filters (keyword filter when disabled or unavailable).
+# A filter is applied only if the best intent's cosine similarity reaches INTENT_MIN_SIMILARITY and the
+# top INTENT_MAX_TYPES intents cover INTENT_FILTER_COVERAGE of the softmax weight
+INTENT_ROUTER_ENABLED = os.getenv("INTENT_ROUTER_ENABLED", "true").lower() == "true"
+INTENT_MIN_SIMILARITY = float(os.getenv("INTENT_MIN_SIMILARITY", "0.4"))
+INTENT_FILTER_COVERAGE = float(os.getenv("INTENT_FILTER_COVERAGE", "0.8"))
+INTENT_MAX_TYPES = int(os.getenv("INTENT_MAX_TYPES", "3"))
+INTENT_TEMPERATURE = float(os.getenv("INTENT_TEMPERATURE", "0.05"))
+# Threads used to load CSV / static JSON / DB sources concurrently during a full rebuild
+INGEST_MAX_WORKERS = int(os.getenv("INGEST_MAX_WORKERS", "4"))
+# Rows per pandas chunk (and per embedding batch) when streaming CSV exports
+CSV_CHUNK_SIZE = int(os.getenv("CSV_CHUNK_SIZE", "2000"))
+# Per-file fingerprints + row ids used to skip unchanged CSVs on rebuild
+CSV_MANIFEST_PATH = os.getenv("CSV_MANIFEST_PATH", "backend/data/.ingest_manifest.json")
+# Live reload of the static knowledge JSON files: auto (inotify if available), inotify, poll or off
+STATIC_WATCH_MODE = os.getenv("STATIC_WATCH_MODE", "auto").lower()
+STATIC_WATCH_POLL_SECONDS = float(os.getenv("STATIC_WATCH_POLL_SECONDS", "5"))
+# Knowledge outbox: rows older than this are pruned; a seq gap older than the grace period is treated as a rolled-back transaction
+OUTBOX_RETENTION_HOURS = float(os.getenv("OUTBOX_RETENTION_HOURS", "72"))
+OUTBOX_GAP_GRACE_SECONDS = float(os.getenv("OUTBOX_GAP_GRACE_SECONDS", "30"))
+# LISTEN supervisor: reconnect backoff (exponential with jitter) and idle keepalive probe
+LISTEN_RECONNECT_BASE_SECONDS = float(os.getenv("LISTEN_RECONNECT_BASE_SECONDS", "1"))
+LISTEN_RECONNECT_MAX_SECONDS = float(os.getenv("LISTEN_RECONNECT_MAX_SECONDS", "60"))
+LISTEN_KEEPALIVE_SECONDS = float(os.getenv("LISTEN_KEEPALIVE_SECONDS", "60"))
+# Bounded queue between the LISTEN reader and the applier; a full queue triggers one catch-up instead
+LISTEN_QUEUE_SIZE = int(os.getenv("LISTEN_QUEUE_SIZE", "256"))
+# How long the applier waits for a burst of notifications to accumulate before applying them
+LISTEN_BATCH_WINDOW_SECONDS = float(os.getenv("LISTEN_BATCH_WINDOW_SECONDS", "0.05"))
+# Logging: every sink is written by one background listener fed through a bounded queue
+LOGS_DIR = os.getenv("LOGS_DIR", "logs")
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+# Size-based rotation by default; set LOG_ROTATE_WHEN (e.g. "midnight", "h") for time-based rotation instead
+LOG_MAX_BYTES = int(os.getenv("LOG_MAX_BYTES", str(10 * 1024 * 1024)))
+LOG_BACKUP_COUNT = int(os.getenv("LOG_BACKUP_COUNT", "5"))
+LOG_ROTATE_WHEN = os.getenv("LOG_ROTATE_WHEN", "")
+# Log viewer: byte offset of every Nth line kept in a <file>.lineidx sidecar; lines examined per filtered page
+LOG_INDEX_EVERY = int(os.getenv("LOG_INDEX_EVERY", "1000"))
+LOG_SCAN_MAX_LINES = int(os.getenv("LOG_SCAN_MAX_LINES", "20000"))
+# Live log streaming: one shared tailer per file woken by inotify (auto/inotify/poll), per-client line buffer
+LOG_STREAM_WATCH_MODE = os.getenv("LOG_STREAM_WATCH_MODE", "auto").lower()
+LOG_STREAM_POLL_SECONDS = float(os.getenv("LOG_STREAM_POLL_SECONDS", "1"))
+LOG_STREAM_CLIENT_BUFFER = int(os.getenv("LOG_STREAM_CLIENT_BUFFER", "2000"))
+# Chat transcripts: one writer thread appends batches (by count or interval) to chat_history.jsonl
+CHAT_HISTORY_PATH = os.getenv("CHAT_HISTORY_PATH", os.path.join(LOGS_DIR, "chat_history.jsonl"))
+CHAT_HISTORY_QUEUE_SIZE = int(os.getenv("CHAT_HISTORY_QUEUE_SIZE", "2000"))
+CHAT_HISTORY_BATCH_SIZE = int(os.getenv("CHAT_HISTORY_BATCH_SIZE", "100"))
+CHAT_HISTORY_FLUSH_SECONDS = float(os.getenv("CHAT_HISTORY_FLUSH_SECONDS", "1"))
+# fsync policy: batch (every flush), interval (at most every CHAT_HISTORY_FSYNC_SECONDS) or never
+CHAT_HISTORY_FSYNC = os.getenv("CHAT_HISTORY_FSYNC", "interval").lower()
+CHAT_HISTORY_FSYNC_SECONDS = float(os.getenv("CHAT_HISTORY_FSYNC_SECONDS", "5"))
+CHAT_HISTORY_MAX_BYTES = int(os.getenv("CHAT_HISTORY_MAX_BYTES", str(50 * 1024 * 1024)))
+CHAT_HISTORY_BACKUP_COUNT = int(os.getenv("CHAT_HISTORY_BACKUP_COUNT", "5"))
+# Indexed transcript store behind /admin/chats (SQLite, WAL), written by the same batches; empty disables it
+CHAT_TRANSCRIPT_DB = os.getenv("CHAT_TRANSCRIPT_DB", "backend/data/chat_transcripts.db")
+# Sentry tracing: base fraction of transactions kept, per-route overrides ("prefix=rate,...", longest prefix wins)
+TRACES_SAMPLE_RATE = float(os.getenv("TRACES_SAMPLE_RATE", "0.02"))
+TRACES_ROUTE_SAMPLE_RATES = os.getenv("TRACES_ROUTE_SAMPLE_RATES", "/api/chat=0.05,/api/health=0,/api/metrics=0")
+# Routes traced in full but only sent when errored, slower than the rolling percentile, or picked at their route rate
+TRACES_TAIL_ROUTES = os.getenv("TRACES_TAIL_ROUTES", "/api/chat")
+TRACES_TAIL_PERCENTILE = float(os.getenv("TRACES_TAIL_PERCENTILE", "95"))
+# Fraction of sampled transactions that are also profiled
+PROFILES_SAMPLE_RATE = float(os.getenv("PROFILES_SAMPLE_RATE", "0"))
 
 
-RECRUITER_KEYWORDS = ["hiring", "recruit", "job", "position", "candidate", "resume", "cv", "opportunity"]
+# Role inference carried across turns: confidence decays toward neutral each turn, and the
+# recruiter role is entered above ROLE_RECRUITER_ENTER but only left below ROLE_RECRUITER_EXIT
+ROLE_CONFIDENCE_DECAY = float(os.getenv("ROLE_CONFIDENCE_DECAY", "0.85"))
+ROLE_RECRUITER_ENTER = float(os.getenv("ROLE_RECRUITER_ENTER", "0.65"))
+ROLE_RECRUITER_EXIT = float(os.getenv("ROLE_RECRUITER_EXIT", "0.5"))
+
+# Keyword lists are compiled into one matcher (ai_core/utils/keyword_matcher.py) and match whole words;
+# a trailing "*" marks a stem that may be followed by more letters ("recruit*" matches "recruiter")
+RECRUITER_KEYWORDS = ["hiring", "recruit*", "job*", "position*", "candidate*", "resume", "cv", "opportunit*"]
 # Keywords that trigger a knowledge base search
 SEARCH_KEYWORDS = [
-    "project", "experience", "education", "skill", "internship", "contact", "email",
+    "project*", "experience*", "education", "skill*", "internship*", "contact", "email",
     "background", "kifiya", "unity university", "credit scoring", "fraud detection", "about you", "dagi"
 ]
 # Greetings that should not trigger a search
@@ -33,3 +116,18 @@ GREETING_KEYWORDS = [
     "hi", "hello", "hey", "how are you", "good morning", "good afternoon",
     "what's up", "yo", "hola", "greetings",
 ]
+# Keyword fallback for the RAG metadata filter, by document type; the first type with a hit wins
+METADATA_FILTER_KEYWORDS = {
+    "project": ["project*", "portfolio*"],
+    "skills": ["skill*", "technolog*"],
+    "experience": ["experience*", "job*", "work", "worked", "working", "role*"],
+    "certificate": ["certif*"],
+    "moment": ["moment*", "gallery", "memorable"],
+    "friend": ["friend*", "relationship*"],
+    "education": ["education", "degree*", "universit*"],
+    "hobbies": ["hobby", "hobbies", "interest", "interests"],
+    "spiritual_beliefs": ["spiritual*", "faith", "belief*", "principles", "religion*"],
+    "contact": ["contact", "email", "reach out"],
+}
+# With an experience keyword, restricts the filter to the current position
+CURRENT_ROLE_KEYWORDS = ["current", "currently"]
@@ -1,8 +1,15 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+from backend.utils.db_pool import InstrumentedAsyncQueuePool, InstrumentedQueuePool, instrument, pool_status
+import logging
 import urllib.parse
 import os
+import uuid
 from dotenv import load_dotenv
 dotenv_path = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.env')
 load_dotenv(dotenv_path=dotenv_path)
@@ -41,17 +48,79 @@ except Exception as e:
     print(f"Warning: Failed to parse/fix DATABASE_URL: {e}")
     DATABASE_URL = raw_db_url
 
+# "session" (direct / Supabase session mode) or "transaction" (PgBouncer-style
+# transaction pooling: no prepared statements, no session state such as LISTEN)
+POOLER_MODE = os.getenv("DB_POOLER_MODE", "session").strip().lower()
+if POOLER_MODE not in ("session", "transaction"):
+    raise ValueError(f"DB_POOLER_MODE must be 'session' or 'transaction', not {POOLER_MODE!r}")
+
+# LISTEN holds session state, which a transaction pooler cannot keep; point
+# DB_LISTEN_URL at a direct or session-mode address for the change listener
+DB_LISTEN_URL = os.getenv("DB_LISTEN_URL")
+
 # Configure connection pooling
-# Supabase Session Mode has a limit on clients, so we need to be conservative
-pool_size = int(os.getenv("DB_POOL_SIZE", "5"))
-max_overflow = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+# Supabase Session Mode has a limit on clients, so we need to be conservative.
+# DB_MAX_CONNECTIONS (the pooler's client limit for this app) sizes the pools
+# automatically: it is shared by every gunicorn worker (GUNICORN_PROCESSES, as
+# in gunicorn_config.py), by both engines (sync + async) in each, and by each
+# worker's LISTEN connection when that goes through the same pooler.
+# Explicit DB_POOL_SIZE / DB_MAX_OVERFLOW still win.
+def _pool_sizes():
+    budget = int(os.getenv("DB_MAX_CONNECTIONS", "0"))
+    if budget > 0:
+        workers = max(1, int(os.getenv("GUNICORN_PROCESSES", "1")))
+        listeners = workers if not DB_LISTEN_URL and POOLER_MODE == "session" else 0
+        per_engine = (budget - listeners) // (workers * 2)
+        if per_engine < 1:
+            # Every engine needs one connection; the budget cannot be met
+            logging.getLogger(__name__).warning(
+                f"DB_MAX_CONNECTIONS={budget} is below one connection per engine for {workers} worker(s); "
+                f"using {workers * 2 + listeners} connections"
+            )
+            per_engine = 1
+        default_size = max(1, per_engine // 2)
+        default_overflow = per_engine - default_size
+    else:
+        default_size, default_overflow = 5, 10
+    return (
+        int(os.getenv("DB_POOL_SIZE", str(default_size))),
+        int(os.getenv("DB_MAX_OVERFLOW", str(default_overflow))),
+    )
 
-engine = create_engine(
-    DATABASE_URL,
+
+pool_size, max_overflow = _pool_sizes()
+pool_timeout = float(os.getenv("DB_POOL_TIMEOUT_SECONDS", "30"))
+# Age/idle retirement replaces pool_pre_ping's round trip on every checkout
+pool_recycle = int(os.getenv("DB_POOL_RECYCLE_SECONDS", "1800"))
+pool_max_idle = float(os.getenv("DB_POOL_MAX_IDLE_SECONDS", "300"))
+
+_pool_kwargs = dict(
     pool_size=pool_size,
     max_overflow=max_overflow,
-    pool_pre_ping=True  # Verify connections before usage
+    pool_timeout=pool_timeout,
+    pool_recycle=pool_recycle,
 )
+
+engine = create_engine(DATABASE_URL, poolclass=InstrumentedQueuePool, **_pool_kwargs)
+instrument(engine, max_idle_seconds=pool_max_idle)
+
+_listen_engine = None
+
+
+def get_listen_engine():
+    """
+    Engine for the knowledge LISTEN connection, or None when LISTEN is unavailable.
+    The connection is held for the life of the worker, so it never comes out of
+    the sync pool: rebuilds and catch-ups would be left one connection short.
+    """
+    global _listen_engine
+    if not DB_LISTEN_URL and POOLER_MODE != "session":
+        return None
+    if _listen_engine is None:
+        _listen_engine = create_engine(DB_LISTEN_URL or DATABASE_URL, poolclass=NullPool)
+    return _listen_engine
+
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
@@ -62,3 +131,91 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+# Async engine for `async def` endpoints. Same database and pool settings, async
+# driver (asyncpg / aiosqlite). Sessions wrap a regular Session, so the ORM event
+# hooks in knowledge_refresh (outbox, cache invalidation, counters) fire unchanged.
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def async_url(url: str):
+    """Map the sync DATABASE_URL onto its async driver; returns (url, connect_args)."""
+    sa_url = make_url(url)
+    backend = sa_url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for {backend}")
+    connect_args = {}
+    # asyncpg takes `ssl` rather than libpq's `sslmode`
+    sslmode = sa_url.query.get("sslmode")
+    if backend == "postgresql" and sslmode:
+        sa_url = sa_url.difference_update_query(["sslmode"])
+        if sslmode != "disable":
+            connect_args["ssl"] = sslmode
+    if backend == "postgresql" and POOLER_MODE == "transaction":
+        # asyncpg prepares every statement; a transaction pooler may run the next
+        # one on a different server connection, so disable both statement caches
+        # and give any remaining prepared statements unique names
+        sa_url = sa_url.update_query_dict({"prepared_statement_cache_size": "0"})
+        connect_args["statement_cache_size"] = 0
+        connect_args["prepared_statement_name_func"] = lambda: f"__asyncpg_{uuid.uuid4()}__"
+    return sa_url.set(drivername=ASYNC_DRIVERS[backend]), connect_args
+
+
+_async_engine = None
+_async_sessionmaker = None
+
+
+def pool_overview():
+    """Pool state of both engines (the async one only once it exists) for the pool endpoint."""
+    overview = {
+        "pooler_mode": POOLER_MODE,
+        "recycle_seconds": pool_recycle,
+        "max_idle_seconds": pool_max_idle,
+        "sync": pool_status(engine),
+    }
+    if _async_engine is not None:
+        overview["async"] = pool_status(_async_engine.sync_engine)
+    return overview
+
+
+def get_async_engine():
+    """Created on first use so the sync-only paths (scripts, migrations) never import the async driver."""
+    global _async_engine
+    if _async_engine is None:
+        url, connect_args = async_url(DATABASE_URL)
+        _async_engine = create_async_engine(
+            url,
+            poolclass=InstrumentedAsyncQueuePool,
+            connect_args=connect_args,
+            **_pool_kwargs,
+        )
+        instrument(_async_engine.sync_engine, max_idle_seconds=pool_max_idle)
+    return _async_engine
+
+
+async def dispose_async_engine() -> None:
+    """Close the async pool on shutdown; aiosqlite runs each connection in a non-daemon thread."""
+    global _async_engine, _async_sessionmaker
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = None
+        _async_sessionmaker = None
+
+
+def AsyncSessionLocal() -> AsyncSession:
+    global _async_sessionmaker
+    if _async_sessionmaker is None:
+        # Handlers return ORM objects after commit; expiring them would force a lazy (sync) reload
+        _async_sessionmaker = async_sessionmaker(
+            bind=get_async_engine(), autoflush=False, expire_on_commit=False
+        )
+    return _async_sessionmaker()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
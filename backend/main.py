@@ -1,79 +1,54 @@
+import asyncio
 import os
-import logging
-import structlog
-import sentry_sdk
-from fastapi import FastAPI, Request
-from fastapi.middleware.cors import CORSMiddleware
-from slowapi import Limiter, _rate_limit_exceeded_handler
-from slowapi.util import get_remote_address
-from slowapi.errors import RateLimitExceeded
-
-from backend.config import API_PORT
-from backend.vector_db.faiss_manager import faiss_manager
-from backend.services import knowledge_refresh  # noqa: F401 — register CDC listeners
-from backend.services.knowledge_refresh import start_change_listener
-from backend.ai_core.agent.graph import create_chatbot_graph
-from backend.api.endpoints.chat import router as chat_router
-from backend.api.endpoints.admin import router as admin_router
-from backend.api.endpoints.knowledge import router as knowledge_router
-from backend.api.endpoints.health import router as health_router
-from backend.api.endpoints.stats import router as stats_router
-
-LOGS_DIR = "logs"
-os.makedirs(LOGS_DIR, exist_ok=True)
-
-shared_processors = [
-    structlog.stdlib.add_logger_name,
-    structlog.stdlib.add_log_level,
-    structlog.processors.TimeStamper(fmt="iso"),
-]
-
-structlog.configure(
-    processors=shared_processors + [
-        structlog.dev.ConsoleRenderer() if os.getenv("ENV") == "development" else structlog.processors.JSONRenderer()
-    ],
-    logger_factory=structlog.stdlib.LoggerFactory(),
-    wrapper_class=structlog.stdlib.BoundLogger,
-    cache_logger_on_first_use=True,
-)
-
-logging.basicConfig(level=logging.INFO, handlers=[])
 
-formatter = structlog.stdlib.ProcessorFormatter(
-    processor=structlog.dev.ConsoleRenderer() if os.getenv("ENV") == "development" else structlog.processors.JSONRenderer(),
-    foreign_pre_chain=shared_processors,
-)
-
-log_handlers = {
-    "app": logging.FileHandler(os.path.join(LOGS_DIR, 'app.log')),
-    "chat": logging.FileHandler(os.path.join(LOGS_DIR, 'chat.log')),
-    "faiss": logging.FileHandler(os.path.join(LOGS_DIR, 'faiss.log')),
-    "nodes": logging.FileHandler(os.path.join(LOGS_DIR, 'nodes.log')),
-    "embeddings": logging.FileHandler(os.path.join(LOGS_DIR, 'embeddings.log')),
-}
-
-for handler in log_handlers.values():
-    handler.setFormatter(formatter)
-
-logging.getLogger("backend.api.endpoints.chat").addHandler(log_handlers["chat"])
-logging.getLogger("backend.vector_db.faiss_manager").addHandler(log_handlers["faiss"])
-logging.getLogger("backend.ai_core.agent.nodes").addHandler(log_handlers["nodes"])
-logging.getLogger("backend.ai_core.knowledge.embeddings").addHandler(log_handlers["embeddings"])
-
-root_logger = logging.getLogger()
-root_logger.addHandler(logging.StreamHandler())
-root_logger.addHandler(log_handlers["app"])
-
-logging.getLogger("uvicorn.access").handlers = []
-logging.getLogger("uvicorn.access").propagate = True
-logging.getLogger("uvicorn.error").handlers = []
-logging.getLogger("uvicorn.error").propagate = True
-
-sentry_sdk.init(
-    dsn=os.getenv("SENTRY_DSN"),
-    traces_sample_rate=1.0,
-    profiles_sample_rate=1.0,
-)
+from backend.utils.startup_profiler import startup_profiler
+
+startup_profiler.start()
+
+with startup_profiler.phase("import_app_modules"):
+    import structlog
+    from fastapi import FastAPI, Request
+    from fastapi.middleware.cors import CORSMiddleware
+    from slowapi import Limiter, _rate_limit_exceeded_handler
+    from slowapi.util import get_remote_address
+    from slowapi.errors import RateLimitExceeded
+
+    from backend.config import API_PORT, LOGS_DIR  # LOGS_DIR re-exported for older imports
+    from backend.database import dispose_async_engine
+    from backend.utils.logging_setup import configure_logging, stop_logging
+    from backend.services.chat_history import chat_history_writer
+    from backend.vector_db.faiss_manager import faiss_manager
+    from backend.services import knowledge_refresh  # noqa: F401 — register CDC listeners
+    from backend.services.knowledge_refresh import (
+        full_rebuild,
+        start_change_listener,
+        start_static_watcher,
+        stop_change_listener,
+        stop_static_watcher,
+    )
+    from backend.ai_core.agent.graph import get_chatbot_graph
+    from backend.api.endpoints.chat import router as chat_router
+    from backend.api.endpoints.admin import router as admin_router
+    from backend.api.endpoints.knowledge import router as knowledge_router
+    from backend.api.endpoints.health import router as health_router
+    from backend.api.endpoints.portfolio import router as portfolio_router
+    from backend.api.endpoints.stats import router as stats_router
+    from backend.api.endpoints.metrics import router as metrics_router
+
+configure_logging(LOGS_DIR)
+
+def _init_sentry():
+    """Only import and initialise Sentry when a DSN is configured."""
+    dsn = os.getenv("SENTRY_DSN")
+    if not dsn:
+        return
+    from backend.utils.tracing import init_sentry
+
+    init_sentry(dsn)
+
+
+with startup_profiler.phase("init_sentry"):
+    _init_sentry()
 
 logger = structlog.get_logger(__name__)
 
@@ -91,44 +66,89 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-def _warm_rag_in_background():
-    """Build FAISS off the critical path so the HTTP server can bind quickly on HF Spaces."""
+def _warm_rag_in_background(loop):
+    """
+    Build the graph and FAISS off the critical path so the HTTP server can bind quickly on HF Spaces.
+    `loop` is the server's event loop, where the knowledge LISTEN consumer runs once the index exists.
+    """
     import threading
 
     def _run():
         try:
-            faiss_manager.update_vector_store()
+            # langgraph and the Gemini SDK are imported here, not at module import.
+            with startup_profiler.phase("build_graph"):
+                get_chatbot_graph(app.state)
+            logger.info("Chatbot graph created and cached in background.")
+        except Exception as e:
+            logger.error("Failed to build chatbot graph", error=str(e))
+
+        try:
+            with startup_profiler.phase("rag_warmup"):
+                # Rebuild, then catch up on outbox changes committed while it ran
+                full_rebuild()
             app.state.profile = getattr(faiss_manager, "profile_data", {}) or {}
             logger.info("FAISS vector store built in background from DB + static sources.")
-            try:
-                start_change_listener()
-                logger.info("Knowledge change listener started (LISTEN knowledge_changed).")
-            except Exception as listen_err:
-                logger.warning("Knowledge listener failed to start", error=str(listen_err))
         except Exception as e:
             logger.error("Background RAG warm-up failed", error=str(e))
 
+        # Intent centroids are built with the now-loaded embedding model, not on the first chat turn
+        try:
+            with startup_profiler.phase("intent_centroids"):
+                from backend.ai_core.components.intent_router import intent_router
+
+                intent_router.ensure_ready()
+        except Exception as e:
+            logger.error("Intent router warm-up failed", error=str(e))
+
+        # Started even if the warm-up failed: the supervised listener reconnects and catches up on its own
+        try:
+            if start_change_listener(loop):
+                logger.info("Knowledge change listener started (LISTEN knowledge_changed).")
+        except Exception as listen_err:
+            logger.warning("Knowledge listener failed to start", error=str(listen_err))
+        try:
+            if start_static_watcher():
+                logger.info("Static knowledge watcher started.")
+        except Exception as watch_err:
+            logger.warning("Static knowledge watcher failed to start", error=str(watch_err))
+        startup_profiler.write_report()
+
     threading.Thread(target=_run, daemon=True, name="rag-warmup").start()
 
 
 @app.on_event("startup")
-def startup_event():
+async def startup_event():
     try:
-        # Build the chatbot graph first so /api/chat can accept traffic ASAP.
-        app.state.graph = create_chatbot_graph()
-        app.state.profile = {}
-        logger.info("Chatbot graph created and cached at startup.")
-        _warm_rag_in_background()
-        logger.info("RAG warm-up started in background.")
+        with startup_profiler.phase("startup_event"):
+            # The graph is built by the warm-up thread; /api/chat builds it on demand if it gets there first.
+            app.state.graph = None
+            app.state.profile = {}
+            _warm_rag_in_background(asyncio.get_running_loop())
+            logger.info("Graph + RAG warm-up started in background.")
     except Exception as e:
         logger.error("Failed to complete startup tasks", error=str(e))
+    finally:
+        startup_profiler.stop_import_tracking()
+        startup_profiler.write_report()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    stop_change_listener()
+    stop_static_watcher()
+    chat_history_writer.stop()
+    await dispose_async_engine()
+    stop_logging()
 
 try:
-    app.include_router(health_router, prefix="/api")
-    app.include_router(chat_router, prefix="/api")
-    app.include_router(admin_router, prefix="/api")
-    app.include_router(knowledge_router, prefix="/api")
-    app.include_router(stats_router, prefix="/api")
+    with startup_profiler.phase("include_routers"):
+        app.include_router(health_router, prefix="/api")
+        app.include_router(chat_router, prefix="/api")
+        app.include_router(admin_router, prefix="/api")
+        app.include_router(knowledge_router, prefix="/api")
+        app.include_router(stats_router, prefix="/api")
+        app.include_router(portfolio_router, prefix="/api")
+        app.include_router(metrics_router, prefix="/api")
     logger.info("All routers included successfully")
 except Exception as e:
     logger.error("Failed to include routers", error=str(e))
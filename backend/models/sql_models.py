@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, Date, Boolean, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, BigInteger, String, Text, Date, Boolean, ForeignKey, DateTime
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from backend.database import Base
@@ -88,3 +88,16 @@ class KnowledgeRevision(Base):
     id = Column(Integer, primary_key=True)  # always row id=1
     version = Column(Integer, nullable=False, default=1)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+class KnowledgeOutbox(Base):
+    """
+    Transactional outbox of indexed-row changes, written in the same transaction as the change.
+    NOTIFY only carries the latest seq; workers catch up with one range query on seq.
+    """
+    __tablename__ = "knowledge_outbox"
+
+    seq = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
+    op = Column(String(16), nullable=False)  # insert / update / delete
+    doc_type = Column(String(32), nullable=False)
+    row_id = Column(Integer, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: one keyword_matcher pass vs. the chained `in` checks it replaced.
+
+The baseline repeats what a chat turn used to do with the config lists: the
+RECRUITER_KEYWORDS scan in analyze_user_role, the GREETING_KEYWORDS prefix
+checks in _is_greeting and the substring chain in get_metadata_filter, each
+lowering the input again. Run from the repo root:
+
+    python -m backend.scripts.bench_keyword_matcher [--repeat 20000]
+"""
+import argparse
+import time
+
+from backend.ai_core.utils.keyword_matcher import KeywordMatcher, config_categories, keyword_matcher
+
+RECRUITER = ["hiring", "recruit", "job", "position", "candidate", "resume", "cv", "opportunity"]
+GREETING = ["hi", "hello", "hey", "how are you", "good morning", "good afternoon", "what's up", "yo", "hola", "greetings"]
+
+SAMPLES = [
+    "hi",
+    "Hello, how are you today?",
+    "What projects have you built with machine learning?",
+    "We are hiring a senior backend engineer, is Dagmawi open to new opportunities?",
+    "Can you tell me about your current role and the responsibilities you have there?",
+    "How does the network control plane work in the systems you have designed?",
+    "I'd love to hear about your hobbies, your favourite books and what principles guide your life. "
+    "Also, what certifications do you hold and how can I reach out by email?",
+]
+
+
+def chained_checks(text: str):
+    """The pre-matcher checks, verbatim."""
+    user_input = text.lower()
+    recruiter = any(word in user_input for word in RECRUITER)
+
+    q = text.lower().strip()
+    greeting = not q or len(q) < 4 or any(
+        q == g or q.startswith(g + " ") or q.startswith(g + "!") or q.startswith(g + ",") for g in GREETING
+    )
+
+    query_lower = text.lower()
+    if "current" in query_lower and ("job" in query_lower or "role" in query_lower or "experience" in query_lower):
+        metadata_filter = {"is_current": True}
+    elif "project" in query_lower or "portfolio" in query_lower:
+        metadata_filter = {"type": "project"}
+    elif "skill" in query_lower or "technolog" in query_lower:
+        metadata_filter = {"type": "skills"}
+    elif "experience" in query_lower or "job" in query_lower or "work" in query_lower or "role" in query_lower:
+        metadata_filter = {"type": "experience"}
+    elif "certificate" in query_lower or "certification" in query_lower or "certified" in query_lower:
+        metadata_filter = {"type": "certificate"}
+    elif "moment" in query_lower or "gallery" in query_lower or "memorable" in query_lower:
+        metadata_filter = {"type": "moment"}
+    elif "friend" in query_lower or "best friend" in query_lower or "friends" in query_lower or "relationship" in query_lower:
+        metadata_filter = {"type": "friend"}
+    elif "education" in query_lower or "degree" in query_lower or "university" in query_lower:
+        metadata_filter = {"type": "education"}
+    elif "hobby" in query_lower or "hobbies" in query_lower or "interest" in query_lower or "interests" in query_lower:
+        metadata_filter = {"type": "hobbies"}
+    elif "spiritual" in query_lower or "faith" in query_lower or "belief" in query_lower or "principles" in query_lower or "religion" in query_lower:
+        metadata_filter = {"type": "spiritual_beliefs"}
+    elif "contact" in query_lower or "email" in query_lower or "reach out" in query_lower:
+        metadata_filter = {"type": "contact"}
+    else:
+        metadata_filter = None
+    return recruiter, greeting, metadata_filter
+
+
+def matcher_pass(text: str):
+    return keyword_matcher.find(text)
+
+
+def _time(fn, text: str, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(text)
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=20000)
+    args = parser.parse_args()
+
+    print(f"{'chars':>6} {'chained us':>11} {'matcher us':>11} {'ratio':>6}  categories hit")
+    for text in SAMPLES:
+        chained = _time(chained_checks, text, args.repeat)
+        matched = _time(matcher_pass, text, args.repeat)
+        hits = ",".join(sorted(matcher_pass(text))) or "-"
+        print(f"{len(text):>6} {chained:>11.2f} {matched:>11.2f} {matched / chained:>6.2f}  {hits}")
+
+    # The chained checks grow with the number of keywords; the matcher grows with the input length
+    scaled = {f"extra:{i}": [f"keyword{i}x{j}" for j in range(10)] for i in range(50)}
+    big = KeywordMatcher({**config_categories(), **scaled})
+    extra = [kw for keywords in scaled.values() for kw in keywords]
+    text = SAMPLES[-1]
+    lowered = text.lower()
+    chained = _time(lambda t: chained_checks(t) and any(kw in lowered for kw in extra), text, args.repeat)
+    matched = _time(big.find, text, args.repeat)
+    print(f"\nwith {len(extra)} extra keywords on {len(text)} chars: chained {chained:.2f} us, matcher {matched:.2f} us")
+
+
+if __name__ == "__main__":
+    main()
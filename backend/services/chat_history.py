@@ -0,0 +1,237 @@
+"""
+Batched chat-transcript writer.
+
+Chat turns are handed to one long-lived writer thread through a bounded
+queue; the request path only does a put_nowait. The writer collects a batch
+(CHAT_HISTORY_BATCH_SIZE entries or CHAT_HISTORY_FLUSH_SECONDS, whichever
+comes first) and hands it to each sink in one call. The JSONL sink keeps
+the file open, writes the batch with a single write(), fsyncs according to
+CHAT_HISTORY_FSYNC and rotates by size. Every gunicorn worker appends to the
+same file, so the write and the rotation hold an flock on <file>.lock, and a
+worker reopens the path when another one has rotated it. The SQLite
+transcript store (see transcript_store) takes the same batches and serves
+/admin/chats.
+
+A full queue drops the turn (counted in chat_history_dropped_total) rather
+than blocking the chat response. stop() drains whatever is queued.
+"""
+import atexit
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from typing import Dict, List, Optional, Protocol
+
+from backend.config import (
+    CHAT_HISTORY_BACKUP_COUNT,
+    CHAT_HISTORY_BATCH_SIZE,
+    CHAT_HISTORY_FLUSH_SECONDS,
+    CHAT_HISTORY_FSYNC,
+    CHAT_HISTORY_FSYNC_SECONDS,
+    CHAT_HISTORY_MAX_BYTES,
+    CHAT_HISTORY_PATH,
+    CHAT_HISTORY_QUEUE_SIZE,
+)
+from backend.services.transcript_store import transcript_store
+from backend.utils.metrics import metrics
+from backend.utils.shared_files import InterProcessLock, is_current
+
+logger = logging.getLogger(__name__)
+
+FSYNC_POLICIES = ("batch", "interval", "never")
+
+_written = metrics.counter("chat_history_written_total", "Chat turns a history sink wrote successfully")
+_dropped = metrics.counter("chat_history_dropped_total", "Chat turns dropped because the history queue was full")
+_batches = metrics.counter("chat_history_batches_total", "Batches flushed by the history writer")
+_write_errors = metrics.counter("chat_history_write_errors_total", "Batches a sink failed to write")
+_queue_depth = metrics.gauge("chat_history_queue_depth", "Chat turns waiting for the history writer")
+
+
+class HistorySink(Protocol):
+    def write_batch(self, entries: List[Dict]) -> None: ...
+
+    def close(self) -> None: ...
+
+
+class JsonlFileSink:
+    """Append-only JSONL file with size-based rotation (path, path.1 ... path.N)."""
+
+    def __init__(
+        self,
+        path: str = CHAT_HISTORY_PATH,
+        fsync: str = CHAT_HISTORY_FSYNC,
+        fsync_seconds: float = CHAT_HISTORY_FSYNC_SECONDS,
+        max_bytes: int = CHAT_HISTORY_MAX_BYTES,
+        backup_count: int = CHAT_HISTORY_BACKUP_COUNT,
+    ):
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"CHAT_HISTORY_FSYNC must be one of {FSYNC_POLICIES}, not {fsync!r}")
+        self.path = path
+        self.fsync = fsync
+        self.fsync_seconds = fsync_seconds
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self._file = None
+        self._last_fsync = 0.0
+        self._process_lock = InterProcessLock(path)
+
+    def _open(self):
+        if self._file is not None and not is_current(self._file, self.path):
+            # Another worker rotated it; keep appending to the live file, not the backup
+            self._close_file()
+        if self._file is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._file = open(self.path, "a", encoding="utf-8")
+        return self._file
+
+    def _rotate(self) -> None:
+        self._close_file()
+        if self.backup_count <= 0:
+            os.remove(self.path)
+            return
+        for i in range(self.backup_count - 1, 0, -1):
+            src = f"{self.path}.{i}"
+            if os.path.exists(src):
+                os.replace(src, f"{self.path}.{i + 1}")
+        os.replace(self.path, f"{self.path}.1")
+
+    def write_batch(self, entries: List[Dict]) -> None:
+        with self._process_lock:
+            f = self._open()
+            f.write("".join(json.dumps(entry, ensure_ascii=False) + "\n" for entry in entries))
+            f.flush()
+            now = time.monotonic()
+            if self.fsync == "batch" or (self.fsync == "interval" and now - self._last_fsync >= self.fsync_seconds):
+                os.fsync(f.fileno())
+                self._last_fsync = now
+            # The size includes what the other workers appended
+            if self.max_bytes and os.fstat(f.fileno()).st_size >= self.max_bytes:
+                if self.fsync != "never":
+                    os.fsync(f.fileno())
+                self._rotate()
+
+    def close(self) -> None:
+        self._close_file()
+        self._process_lock.close()
+
+    def _close_file(self) -> None:
+        if self._file is not None:
+            try:
+                self._file.flush()
+                if self.fsync != "never":
+                    os.fsync(self._file.fileno())
+            finally:
+                self._file.close()
+                self._file = None
+
+
+def default_sinks() -> List[HistorySink]:
+    # The store goes first: its one-time JSONL import must not also see the batch being written
+    sinks: List[HistorySink] = [transcript_store] if transcript_store is not None else []
+    sinks.append(JsonlFileSink())
+    return sinks
+
+
+_STOP = object()
+
+
+class ChatHistoryWriter:
+    def __init__(
+        self,
+        sinks: Optional[List[HistorySink]] = None,
+        queue_size: int = CHAT_HISTORY_QUEUE_SIZE,
+        batch_size: int = CHAT_HISTORY_BATCH_SIZE,
+        flush_seconds: float = CHAT_HISTORY_FLUSH_SECONDS,
+    ):
+        self.sinks: List[HistorySink] = sinks if sinks is not None else default_sinks()
+        self.batch_size = max(1, batch_size)
+        self.flush_seconds = flush_seconds
+        self._queue: "queue.Queue" = queue.Queue(maxsize=queue_size)
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        metrics.add_collector(lambda: _queue_depth.set(self._queue.qsize()))
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                thread = threading.Thread(target=self._run, daemon=True, name="chat-history-writer")
+                thread.start()
+                self._thread = thread
+
+    def submit(self, entry: Dict) -> bool:
+        """Queue one chat turn; never blocks. Returns False when it had to be dropped."""
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(entry)
+            return True
+        except queue.Full:
+            _dropped.inc()
+            return False
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+            batch = [item]
+            deadline = time.monotonic() + self.flush_seconds
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            self._flush(batch)
+        # Drain anything queued behind the stop marker
+        leftover = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not _STOP:
+                leftover.append(item)
+        if leftover:
+            self._flush(leftover)
+        for sink in self.sinks:
+            try:
+                sink.close()
+            except Exception as e:
+                logger.error(f"Failed closing chat history sink {type(sink).__name__}: {e}")
+
+    def _flush(self, batch: List[Dict]) -> None:
+        for sink in self.sinks:
+            try:
+                sink.write_batch(batch)
+            except Exception as e:
+                _write_errors.inc(sink=type(sink).__name__)
+                logger.error(f"Failed to write {len(batch)} chat turn(s) to {type(sink).__name__}: {e}")
+                continue
+            _written.inc(len(batch), sink=type(sink).__name__)
+        _batches.inc()
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Flush everything queued and stop the writer thread."""
+        thread = self._thread
+        if thread is None:
+            return
+        self._queue.put(_STOP)
+        thread.join(timeout)
+        if thread.is_alive():
+            logger.warning("Chat history writer did not drain before the shutdown timeout")
+        self._thread = None
+
+
+chat_history_writer = ChatHistoryWriter()
+atexit.register(chat_history_writer.stop)
@@ -0,0 +1,258 @@
+"""
+Asyncio-native LISTEN/NOTIFY consumer for knowledge changes.
+
+The psycopg2 connection's socket is registered on the running event loop with
+loop.add_reader(), so notifications are picked up as soon as they arrive (no
+select() thread, no polling interval). Payloads go into a bounded asyncio.Queue
+drained by a single applier coroutine, which coalesces a burst into one batch:
+any number of outbox seqs become one catch-up query, and blocking index work
+runs in a worker thread. When the queue is full the reader stops queueing and
+flags an overflow; the applier then runs one catch-up that covers everything
+dropped, so backpressure never loses a change.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import random
+import time
+from concurrent.futures import Future
+from typing import Dict, List, Optional
+
+from backend.config import (
+    LISTEN_BATCH_WINDOW_SECONDS,
+    LISTEN_KEEPALIVE_SECONDS,
+    LISTEN_QUEUE_SIZE,
+    LISTEN_RECONNECT_BASE_SECONDS,
+    LISTEN_RECONNECT_MAX_SECONDS,
+)
+from backend.database import get_listen_engine
+from backend.services import knowledge_refresh
+from backend.services.response_cache import response_cache
+from backend.services.stats_counters import stats_counters
+from backend.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+listener_state: Dict[str, object] = {
+    "connected": False,
+    "last_connected_at": None,
+    "last_error": None,
+    "consecutive_failures": 0,
+}
+
+_connected = metrics.gauge("knowledge_listener_connected", "1 while the LISTEN connection is up")
+_reconnects = metrics.counter("knowledge_listener_reconnects_total", "LISTEN connections re-established after a failure")
+_failures = metrics.counter("knowledge_listener_failures_total", "LISTEN connection failures")
+_notifications = metrics.counter("knowledge_listener_notifications_total", "NOTIFY messages received")
+_queue_depth = metrics.gauge("knowledge_listener_queue_depth", "NOTIFY payloads waiting for the applier")
+_queue_overflows = metrics.counter("knowledge_listener_queue_overflows_total", "NOTIFY payloads dropped because the queue was full")
+_batches = metrics.counter("knowledge_listener_batches_total", "Batches handled by the applier")
+
+
+def reconnect_delay(failures: int) -> float:
+    """Exponential backoff with full jitter, capped at LISTEN_RECONNECT_MAX_SECONDS."""
+    ceiling = min(LISTEN_RECONNECT_MAX_SECONDS, LISTEN_RECONNECT_BASE_SECONDS * (2 ** max(0, failures - 1)))
+    return random.uniform(LISTEN_RECONNECT_BASE_SECONDS, max(LISTEN_RECONNECT_BASE_SECONDS, ceiling))
+
+
+def handle_payloads(payloads: List[str], overflowed: bool = False) -> None:
+    """
+    Apply one batch (blocking; runs in a worker thread). All seq notifications
+    and any overflow collapse into a single outbox catch-up; legacy payloads
+    that carry events are merged and applied together.
+    """
+    needs_catch_up = overflowed
+    needs_rebuild = False
+    events = []
+    if overflowed:
+        # Dropped payloads may have been cache-only invalidations
+        response_cache.invalidate_all()
+        stats_counters.mark_dirty()
+    for payload in payloads:
+        try:
+            data = json.loads(payload or "{}")
+        except ValueError:
+            logger.warning(f"Ignoring malformed NOTIFY payload: {payload[:200]!r}")
+            continue
+        if "seq" in data:
+            needs_catch_up = True
+            continue
+        if "invalidate" in data:
+            response_cache.invalidate_doc_types(data["invalidate"])
+            stats_counters.mark_dirty(data["invalidate"])
+            continue
+        events.extend(data.get("events") or [])
+        # The sender dropped events to fit the payload limit; only a rebuild recovers them
+        needs_rebuild = needs_rebuild or bool(data.get("truncated"))
+
+    if needs_rebuild:
+        logger.warning("Truncated NOTIFY payload received; running a full rebuild")
+        knowledge_refresh.full_rebuild()
+        return
+    if events:
+        knowledge_refresh.apply_change_events(knowledge_refresh._dedupe_events(events), source="pg_notify")
+    if needs_catch_up:
+        if knowledge_refresh._outbox_available():
+            knowledge_refresh.catch_up_from_outbox(source="pg_notify")
+        elif overflowed:
+            knowledge_refresh.reconcile_database_sources(source="listen-overflow")
+
+
+class ChangeListener:
+    """Supervised LISTEN session plus its applier, both running on one event loop."""
+
+    def __init__(self, engine, channel: str = knowledge_refresh.NOTIFY_CHANNEL, queue_size: int = LISTEN_QUEUE_SIZE):
+        self.engine = engine
+        self.channel = channel
+        self.queue_size = queue_size
+        self._queue: Optional[asyncio.Queue] = None
+        self._overflowed = False
+        self._stopping = False
+
+    # -- supervisor ----------------------------------------------------------
+
+    async def run(self) -> None:
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        applier = asyncio.create_task(self._apply_batches(), name="knowledge-listen-applier")
+        try:
+            while not self._stopping:
+                try:
+                    await self._session()
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    failures = int(listener_state["consecutive_failures"]) + 1
+                    listener_state.update(consecutive_failures=failures, last_error=str(e))
+                    _failures.inc()
+                    delay = reconnect_delay(failures)
+                    logger.warning(f"Knowledge LISTEN connection lost ({e}); reconnecting in {delay:.1f}s")
+                    await asyncio.sleep(delay)
+        finally:
+            applier.cancel()
+
+    async def _session(self) -> None:
+        """One LISTEN connection, held until it fails; raises so run() can reconnect."""
+        loop = asyncio.get_running_loop()
+        raw_conn = await asyncio.to_thread(self.engine.raw_connection)
+        lost: asyncio.Future = loop.create_future()
+        fd = None
+        try:
+            await asyncio.to_thread(raw_conn.set_isolation_level, 0)  # AUTOCOMMIT required for LISTEN
+            cursor = raw_conn.cursor()
+            await asyncio.to_thread(cursor.execute, f"LISTEN {self.channel};")
+
+            fd = raw_conn.fileno()
+            loop.add_reader(fd, self._on_readable, raw_conn, lost)
+
+            reconnect = listener_state["last_connected_at"] is not None
+            listener_state.update(connected=True, last_connected_at=time.time(), consecutive_failures=0)
+            _connected.set(1)
+            if reconnect:
+                _reconnects.inc()
+            logger.info(f"Listening for DB knowledge changes on channel '{self.channel}' (asyncio)")
+            # Anything committed before LISTEN took effect (or while disconnected) is not notified
+            await asyncio.to_thread(
+                knowledge_refresh._catch_up_after_gap,
+                "listen-reconnect" if reconnect else "outbox-listen",
+            )
+
+            while True:
+                try:
+                    await asyncio.wait_for(asyncio.shield(lost), timeout=LISTEN_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    # A half-open TCP connection never becomes readable; probe it. The probe runs
+                    # in a worker thread, so the loop must not poll() the same connection meanwhile.
+                    loop.remove_reader(fd)
+                    await asyncio.wait_for(asyncio.to_thread(cursor.execute, "SELECT 1"), timeout=30)
+                    loop.add_reader(fd, self._on_readable, raw_conn, lost)
+                    # Notifications that arrived with the probe's reply are already in raw_conn.notifies
+                    self._on_readable(raw_conn, lost)
+                    continue
+                lost.result()  # raises the poll() error
+        finally:
+            if fd is not None:
+                loop.remove_reader(fd)
+            listener_state["connected"] = False
+            _connected.set(0)
+            # Never close on the loop: a probe that timed out may still hold the connection's
+            # lock in its thread, and returning it to the pool would roll back over a dead
+            # socket. Invalidating discards the DBAPI connection without that reset.
+            try:
+                await asyncio.to_thread(raw_conn.invalidate)
+            except Exception:
+                pass
+
+    # -- reader callback (runs on the loop, must not block) -------------------
+
+    def _on_readable(self, raw_conn, lost: asyncio.Future) -> None:
+        try:
+            raw_conn.poll()
+        except Exception as e:
+            if not lost.done():
+                lost.set_exception(e)
+            return
+        while raw_conn.notifies:
+            payload = raw_conn.notifies.pop(0).payload
+            _notifications.inc()
+            try:
+                self._queue.put_nowait(payload)
+            except asyncio.QueueFull:
+                # Dropped payloads are recovered by the catch-up the overflow triggers
+                self._overflowed = True
+                _queue_overflows.inc()
+        _queue_depth.set(self._queue.qsize())
+
+    # -- applier -------------------------------------------------------------
+
+    async def _apply_batches(self) -> None:
+        while True:
+            payloads = [await self._queue.get()]
+            # Let a burst of admin edits accumulate so it is applied as one batch
+            if LISTEN_BATCH_WINDOW_SECONDS > 0:
+                await asyncio.sleep(LISTEN_BATCH_WINDOW_SECONDS)
+            while not self._queue.empty():
+                payloads.append(self._queue.get_nowait())
+            overflowed, self._overflowed = self._overflowed, False
+            _queue_depth.set(self._queue.qsize())
+            _batches.inc()
+            try:
+                await asyncio.to_thread(handle_payloads, payloads, overflowed)
+            except Exception as e:
+                logger.error(f"Failed applying {len(payloads)} NOTIFY payload(s): {e}", exc_info=True)
+
+    def stop(self) -> None:
+        self._stopping = True
+
+
+_listener: Optional[ChangeListener] = None
+_listener_future: Optional[Future] = None
+
+
+def start(loop: asyncio.AbstractEventLoop) -> bool:
+    """Schedule the listener on `loop`; callable from any thread. Returns False when not started."""
+    global _listener, _listener_future
+    if _listener_future is not None and not _listener_future.done():
+        return True
+    engine = get_listen_engine()
+    if engine is None:
+        logger.warning("DB_POOLER_MODE=transaction cannot hold LISTEN; set DB_LISTEN_URL to a direct connection")
+        return False
+    if engine.dialect.name != "postgresql":
+        logger.info(f"LISTEN/NOTIFY needs PostgreSQL; not listening on {engine.dialect.name}")
+        return False
+    _listener = ChangeListener(engine)
+    _listener_future = asyncio.run_coroutine_threadsafe(_listener.run(), loop)
+    return True
+
+
+def stop() -> None:
+    if _listener is not None:
+        _listener.stop()
+    if _listener_future is not None:
+        _listener_future.cancel()
+
+
+def is_running() -> bool:
+    return _listener_future is not None and not _listener_future.done()
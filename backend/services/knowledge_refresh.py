@@ -5,20 +5,39 @@ Does NOT poll the database on chat requests.
 Instead:
   1. SQLAlchemy flush/commit events capture which rows changed
   2. Only those rows are upserted/deleted in FAISS
-  3. PostgreSQL NOTIFY fans the change out to other Gunicorn workers
+  3. The change is written to the knowledge_outbox table in the same transaction,
+     and PostgreSQL NOTIFY carries only the newest outbox seq to other Gunicorn workers
+  4. Each worker tracks the highest seq it has applied and catches up with one
+     range query, so a dropped NOTIFY or an oversized change set loses nothing
+  5. The LISTEN connection (knowledge_listener, on the asyncio loop) is supervised:
+     it reconnects with exponential backoff and catches up (outbox, or a checksum
+     reconcile against the DB) after each gap
 """
 from __future__ import annotations
 
+import hashlib
 import json
 import logging
-import select
 import threading
-from typing import Dict, List, Optional, Tuple
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 
-from sqlalchemy import event, text
+from sqlalchemy import delete, event, func, insert, inspect, select as sql_select, text
 from sqlalchemy.orm import Session
 
+from backend.config import (
+    OUTBOX_GAP_GRACE_SECONDS,
+    OUTBOX_RETENTION_HOURS,
+    STATIC_WATCH_MODE,
+    STATIC_WATCH_POLL_SECONDS,
+)
 from backend.database import engine
+from backend.models import sql_models as models
+from backend.models.sql_models import KnowledgeOutbox
+from backend.services.response_cache import response_cache
+from backend.services.stats_counters import stats_counters
+from backend.utils.metrics import metrics
 from backend.ai_core.knowledge.database_loader import (
     MODEL_TO_DOC_TYPE,
     doc_type_for_model,
@@ -32,17 +51,50 @@ NOTIFY_CHANNEL = "knowledge_changed"
 
 # Models that map into the RAG index (CV is stored but not embedded)
 INDEXED_MODELS = tuple(MODEL_TO_DOC_TYPE.keys())
+# Not indexed, but their commits still invalidate cached public responses
+CACHE_ONLY_MODELS = {models.CV: "cv"}
+OUTBOX = KnowledgeOutbox.__table__
 
 _apply_lock = threading.Lock()
-_listener_thread: Optional[threading.Thread] = None
-_listener_stop = threading.Event()
+_static_watch_thread: Optional[threading.Thread] = None
+_static_watch_stop = threading.Event()
 _change_count = 0
 _listeners_registered = False
 
+# Outbox consumer state: every seq <= _applied_offset has been applied here;
+# _applied_above holds applied seqs past a gap (commits can land out of seq order)
+_outbox_lock = threading.Lock()
+_outbox_ready: Optional[bool] = None
+_applied_offset = 0
+_applied_above: Set[int] = set()
+# First seq of each run of missing seqs -> when that run was first seen
+_gap_first_seen: Dict[int, float] = {}
+
+_outbox_lag_seq = metrics.gauge("knowledge_outbox_lag_seq", "Outbox rows seen but not yet contiguous with the applied offset")
+_outbox_lag_seconds = metrics.gauge("knowledge_outbox_lag_seconds", "Age of the newest outbox row when this worker applied it")
+_catch_up_rows = metrics.counter("knowledge_catch_up_rows_total", "Outbox rows applied by catch-up")
+_reconcile_runs = metrics.counter("knowledge_reconcile_total", "Checksum reconciles of DB documents against the index")
+_events_applied = metrics.counter("knowledge_events_applied_total", "CDC events applied to the index, by source")
+
 ChangeEvent = Dict[str, object]  # {op, type, id}
 
 
+def _dedupe_events(events: Iterable[ChangeEvent]) -> List[ChangeEvent]:
+    """
+    De-dupe by (type, id), keeping the last event in commit order. A delete
+    followed by an insert (a reused id) must end as an insert; insert/update
+    re-read the row anyway, so a stale insert for a deleted row still removes it.
+    """
+    latest: Dict[Tuple[str, int], ChangeEvent] = {}
+    for ev in events:
+        key = (str(ev["type"]), int(ev["id"]))  # type: ignore[arg-type]
+        latest.pop(key, None)
+        latest[key] = ev
+    return list(latest.values())
+
+
 def _pg_notify(events: List[ChangeEvent]) -> None:
+    """Legacy fan-out with the events in the payload; only used when the outbox table is missing."""
     if not events:
         return
     payload = json.dumps({"events": events})
@@ -71,6 +123,13 @@ def apply_change_events(events: List[ChangeEvent], source: str = "local") -> int
     if not events:
         return 0
 
+    # Cached public responses for these collections are stale from here on
+    doc_types = {str(ev.get("type")) for ev in events}
+    response_cache.invalidate_doc_types(doc_types)
+    if source != "local":
+        # Only this worker's own commits carry exact counter deltas
+        stats_counters.mark_dirty(doc_types)
+
     global _change_count
     applied = 0
 
@@ -107,9 +166,248 @@ def apply_change_events(events: List[ChangeEvent], source: str = "local") -> int
         _change_count += applied
         faiss_manager.knowledge_version = _change_count
 
+    _events_applied.inc(applied, source=source)
     return applied
 
 
+# ---------------------------------------------------------------------------
+# Transactional outbox
+# ---------------------------------------------------------------------------
+
+def _outbox_available(conn=None) -> bool:
+    global _outbox_ready
+    if _outbox_ready is None:
+        try:
+            if conn is not None:
+                _outbox_ready = inspect(conn).has_table(OUTBOX.name)
+            else:
+                with engine.connect() as own_conn:
+                    _outbox_ready = inspect(own_conn).has_table(OUTBOX.name)
+        except Exception as e:
+            logger.warning(f"Could not inspect {OUTBOX.name}: {e}")
+            return False
+        if not _outbox_ready:
+            logger.warning(
+                f"{OUTBOX.name} table missing (run `alembic upgrade head`); "
+                "falling back to event payloads in NOTIFY"
+            )
+    return bool(_outbox_ready)
+
+
+def _notify_cache_only(session: Session, doc_types: Set[str]) -> None:
+    """Tables outside the index skip the outbox; a transactional NOTIFY tells other workers to drop their cache."""
+    session.info.setdefault("cache_invalidate", set()).update(doc_types)
+    conn = session.connection()
+    if conn.dialect.name == "postgresql":
+        conn.execute(
+            text("SELECT pg_notify(:channel, :payload)"),
+            {"channel": NOTIFY_CHANNEL, "payload": json.dumps({"invalidate": sorted(doc_types)})},
+        )
+
+
+def _write_outbox(session: Session, events: List[ChangeEvent]) -> None:
+    """Insert the flushed changes into the outbox inside the session's own transaction."""
+    if not events:
+        return
+    conn = session.connection()
+    if not _outbox_available(conn):
+        return
+    rows = [{"op": ev["op"], "doc_type": ev["type"], "row_id": ev["id"]} for ev in events]
+    seqs = conn.execute(insert(OUTBOX).returning(OUTBOX.c.seq), rows).scalars().all()
+    session.info.setdefault("knowledge_outbox_seqs", []).extend(int(seq) for seq in seqs)
+    if conn.dialect.name == "postgresql":
+        # Transactional NOTIFY: delivered only if (and when) this transaction commits
+        conn.execute(
+            text("SELECT pg_notify(:channel, :payload)"),
+            {"channel": NOTIFY_CHANNEL, "payload": json.dumps({"seq": max(seqs)})},
+        )
+
+
+def outbox_head() -> Optional[int]:
+    """Highest committed outbox seq, 0 when empty, None when the outbox is unavailable."""
+    if not _outbox_available():
+        return None
+    with engine.connect() as conn:
+        return int(conn.execute(sql_select(func.max(OUTBOX.c.seq))).scalar() or 0)
+
+
+def _mark_applied(seqs: Iterable[int]) -> None:
+    with _outbox_lock:
+        _applied_above.update(seq for seq in seqs if seq > _applied_offset)
+        _advance_offset()
+
+
+def _advance_offset() -> None:
+    """
+    Move _applied_offset over contiguous applied seqs. Call with _outbox_lock held.
+    A missing seq is usually an in-flight transaction, so it blocks the offset;
+    once it has been missing for OUTBOX_GAP_GRACE_SECONDS it is taken to be a rollback.
+    Missing seqs are tracked as runs between applied ones, so the cost follows
+    len(_applied_above) rather than the distance the offset has to cover.
+    """
+    global _applied_offset
+    if not _applied_above:
+        _gap_first_seen.clear()
+        return
+    now = time.monotonic()
+    applied = sorted(_applied_above)
+    previous = _applied_offset
+    for seq in applied:
+        if seq > previous + 1:
+            _gap_first_seen.setdefault(previous + 1, now)
+        previous = seq
+
+    for seq in applied:
+        gap = _applied_offset + 1
+        if seq > gap:
+            if now - _gap_first_seen.get(gap, now) < OUTBOX_GAP_GRACE_SECONDS:
+                break
+            logger.warning(f"Outbox seq {gap}..{seq - 1} never appeared; assuming the transaction rolled back")
+        _applied_above.discard(seq)
+        _applied_offset = seq
+    for start in [start for start in _gap_first_seen if start <= _applied_offset]:
+        del _gap_first_seen[start]
+
+
+def _reset_offset(seq: int) -> None:
+    global _applied_offset
+    with _outbox_lock:
+        _applied_offset = max(_applied_offset, seq)
+        _applied_above.difference_update({s for s in _applied_above if s <= _applied_offset})
+        _advance_offset()
+
+
+def catch_up_from_outbox(source: str = "outbox") -> int:
+    """
+    Apply every outbox change this worker has not seen yet, with one range
+    query on seq. Safe to call any time (on NOTIFY, after reconnects, on a timer).
+    """
+    if not _outbox_available():
+        return 0
+    # The query runs without the lock: _mark_applied takes it from after_commit,
+    # which for an AsyncSession runs on the event loop
+    with _outbox_lock:
+        offset = _applied_offset
+    with engine.connect() as conn:
+        rows = conn.execute(
+            sql_select(OUTBOX.c.seq, OUTBOX.c.op, OUTBOX.c.doc_type, OUTBOX.c.row_id, OUTBOX.c.created_at)
+            .where(OUTBOX.c.seq > offset)
+            .order_by(OUTBOX.c.seq)
+        ).all()
+    with _outbox_lock:
+        pending = [row for row in rows if row.seq > _applied_offset and row.seq not in _applied_above]
+        # Claim them before applying so a concurrent catch-up does not apply them twice
+        _applied_above.update(row.seq for row in pending)
+
+    events = _dedupe_events({"op": row.op, "type": row.doc_type, "id": row.row_id} for row in pending)
+    applied = apply_change_events(events, source=source) if events else 0
+
+    with _outbox_lock:
+        _advance_offset()
+        _outbox_lag_seq.set(len(_applied_above))
+    if pending:
+        _catch_up_rows.inc(len(pending))
+        _outbox_lag_seconds.set(_age_seconds(pending[-1].created_at))
+        logger.info(f"[{source}] Caught up {len(pending)} outbox row(s) past seq {offset}")
+    return applied
+
+
+def _age_seconds(created_at: Optional[datetime]) -> float:
+    if created_at is None:
+        return 0.0
+    if created_at.tzinfo is None:  # SQLite returns naive UTC timestamps
+        created_at = created_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (datetime.now(timezone.utc) - created_at).total_seconds())
+
+
+def _outbox_horizon_passed() -> bool:
+    """True when rows this worker never applied have already been pruned from the outbox."""
+    if _applied_offset == 0:
+        return False
+    with engine.connect() as conn:
+        oldest = conn.execute(sql_select(func.min(OUTBOX.c.seq))).scalar()
+    return oldest is not None and oldest > _applied_offset + 1
+
+
+def _content_checksum(text_value: str) -> str:
+    return hashlib.sha1(text_value.encode("utf-8")).hexdigest()
+
+
+def reconcile_database_sources(source: str = "reconcile") -> Dict[str, int]:
+    """
+    Bounded repair for when change events may have been missed and the outbox
+    cannot fill the gap: compare a checksum of every DB row's document with the
+    indexed copy and upsert/delete only the rows that differ. Cost is one SELECT
+    per indexed table plus embeddings for the changed rows; nothing is rebuilt.
+    """
+    from backend.ai_core.knowledge.database_loader import load_model_documents
+    from backend.vector_db.faiss_manager import faiss_manager
+
+    report = {"checked": 0, "upserted": 0, "deleted": 0}
+    with _apply_lock:
+        indexed = faiss_manager.indexed_documents(prefix="db:")
+        seen = set()
+        for model_cls, doc_type in MODEL_TO_DOC_TYPE.items():
+            documents = load_model_documents(model_cls)
+            stale_docs, stale_ids = [], []
+            for doc in documents:
+                doc_id = make_doc_id(doc_type, int(doc.metadata["id"]))
+                seen.add(doc_id)
+                current = indexed.get(doc_id)
+                if current is None or _content_checksum(current) != _content_checksum(doc.page_content):
+                    stale_docs.append(doc)
+                    stale_ids.append(doc_id)
+            report["checked"] += len(documents)
+            if stale_docs:
+                faiss_manager.upsert_documents(stale_docs, stale_ids)
+                report["upserted"] += len(stale_docs)
+
+        orphaned = [doc_id for doc_id in indexed if doc_id not in seen]
+        if orphaned:
+            faiss_manager.delete_documents(orphaned)
+            report["deleted"] = len(orphaned)
+
+        if report["upserted"] or report["deleted"]:
+            global _change_count
+            _change_count += 1
+            faiss_manager.knowledge_version = _change_count
+            response_cache.invalidate_all()
+            stats_counters.mark_dirty()
+
+    _reconcile_runs.inc()
+    logger.info(f"[{source}] DB reconcile: {report}")
+    return report
+
+
+def _catch_up_after_gap(source: str) -> None:
+    """Run after (re)connecting LISTEN: notifications sent while disconnected were lost."""
+    # Cache-only invalidations are not in the outbox, so start the cache over
+    response_cache.invalidate_all()
+    stats_counters.mark_dirty()
+    try:
+        if _outbox_available() and not _outbox_horizon_passed():
+            catch_up_from_outbox(source=source)
+        else:
+            reconcile_database_sources(source=source)
+            head = outbox_head()
+            if head is not None:
+                _reset_offset(head)
+    except Exception as e:
+        logger.error(f"[{source}] Catch-up after LISTEN gap failed: {e}", exc_info=True)
+
+
+def prune_outbox(retention_hours: float = OUTBOX_RETENTION_HOURS) -> int:
+    """Delete outbox rows older than the retention window. Returns the number removed."""
+    if not _outbox_available():
+        return 0
+    cutoff = datetime.now(timezone.utc) - timedelta(hours=retention_hours)
+    with engine.begin() as conn:
+        result = conn.execute(delete(OUTBOX).where(OUTBOX.c.created_at < cutoff))
+    if result.rowcount:
+        logger.info(f"Pruned {result.rowcount} knowledge outbox row(s) older than {retention_hours}h")
+    return result.rowcount or 0
+
+
 def _apply_events_async(events: List[ChangeEvent], source: str = "local") -> None:
     threading.Thread(
         target=apply_change_events,
@@ -120,26 +418,116 @@ def _apply_events_async(events: List[ChangeEvent], source: str = "local") -> Non
 
 
 def full_rebuild() -> bool:
-    """Full rebuild from CSV + static JSON + DB. Manual / startup only."""
+    """
+    Full rebuild from CSV + static JSON + DB. Manual / startup only.
+    The outbox head is read first, so changes committed while the rebuild
+    runs are applied by the catch-up that follows it.
+    """
     from backend.vector_db.faiss_manager import faiss_manager
 
+    try:
+        head = outbox_head()
+    except Exception as e:
+        logger.warning(f"Could not read knowledge outbox head: {e}")
+        head = None
+
     with _apply_lock:
         faiss_manager.update_vector_store()
+        response_cache.invalidate_all()
+        stats_counters.mark_dirty()
         global _change_count
         _change_count += 1
         faiss_manager.knowledge_version = _change_count
+
+    if head is not None:
+        _reset_offset(head)
+        try:
+            catch_up_from_outbox(source="outbox-rebuild")
+            prune_outbox()
+        except Exception as e:
+            logger.error(f"Outbox catch-up after rebuild failed: {e}", exc_info=True)
+    return True
+
+
+def refresh_csv_sources() -> dict:
+    """Incremental CSV refresh: only changed files/rows touch the index."""
+    from backend.vector_db.faiss_manager import faiss_manager
+
+    with _apply_lock:
+        report = faiss_manager.sync_csv_sources()
+        if report["changed"] or report["removed_files"]:
+            global _change_count
+            _change_count += 1
+            faiss_manager.knowledge_version = _change_count
+        return report
+
+
+def refresh_static_sources() -> dict:
+    """Apply edits to the static knowledge JSON files as upserts/deletes (no rebuild)."""
+    from backend.vector_db.faiss_manager import faiss_manager
+
+    with _apply_lock:
+        report = faiss_manager.sync_static_sources()
+        if report["upserted"] or report["deleted"]:
+            global _change_count
+            _change_count += 1
+            faiss_manager.knowledge_version = _change_count
+        return report
+
+
+def start_static_watcher() -> bool:
+    """Watch the static knowledge JSON files and hot-apply changes. Returns False when disabled."""
+    from backend.ai_core.knowledge.static_loader import static_knowledge_paths
+    from backend.utils.file_watch import watch_files
+
+    global _static_watch_thread
+    if STATIC_WATCH_MODE == "off":
+        return False
+    if _static_watch_thread and _static_watch_thread.is_alive():
         return True
 
+    def _on_change(changed):
+        logger.info(f"Static knowledge changed: {sorted(changed)}")
+        refresh_static_sources()
+
+    _static_watch_stop.clear()
+    _static_watch_thread = threading.Thread(
+        target=watch_files,
+        args=(static_knowledge_paths(), _on_change, _static_watch_stop),
+        kwargs={"mode": STATIC_WATCH_MODE, "poll_interval": STATIC_WATCH_POLL_SECONDS},
+        daemon=True,
+        name="knowledge-static-watch",
+    )
+    _static_watch_thread.start()
+    return True
+
+
+def stop_static_watcher() -> None:
+    _static_watch_stop.set()
+
 
 def get_knowledge_status() -> dict:
+    from backend.services import knowledge_listener
     from backend.vector_db.faiss_manager import faiss_manager
 
     return {
         "change_count": _change_count,
         "local_version": getattr(faiss_manager, "knowledge_version", -1),
         "vector_store_ready": faiss_manager.vector_store is not None,
-        "capture_mode": "sqlalchemy_cdc+pg_notify",
+        "capture_mode": "sqlalchemy_cdc+outbox+pg_notify" if _outbox_ready else "sqlalchemy_cdc+pg_notify",
         "polls_db_on_search": False,
+        "last_rebuild": getattr(faiss_manager, "last_rebuild", {}),
+        "listener": {
+            "running": knowledge_listener.is_running(),
+            **knowledge_listener.listener_state,
+        },
+        "metrics": metrics.snapshot(prefix="knowledge_"),
+        "outbox": {
+            "enabled": bool(_outbox_ready),
+            "applied_offset": _applied_offset,
+            "applied_out_of_order": len(_applied_above),
+            "gaps_pending": len(_gap_first_seen),
+        },
     }
 
 
@@ -168,17 +556,37 @@ def _capture_changes_before_flush(session, flush_context, instances):
         if isinstance(obj, INDEXED_MODELS) and session.is_modified(obj, include_collections=False):
             tracked.append({"op": "update", "obj": obj})
 
+    cache_types = {
+        CACHE_ONLY_MODELS[type(obj)]
+        for obj in (*session.new, *session.dirty, *session.deleted)
+        if type(obj) in CACHE_ONLY_MODELS
+    }
+    if cache_types:
+        session.info.setdefault("cache_tracked", set()).update(cache_types)
+
+    # Exact counter deltas (old -> new dimension values) for the stats counters
+    deltas = session.info.setdefault("counter_deltas", [])
+    for op, objs in (("insert", session.new), ("update", session.dirty), ("delete", session.deleted)):
+        for obj in list(objs):
+            delta = stats_counters.capture(obj, op)
+            if delta is not None:
+                deltas.append(delta)
+
 
 @event.listens_for(Session, "after_flush")
 def _resolve_ids_after_flush(session, flush_context):
+    cache_types = session.info.pop("cache_tracked", None)
+    if cache_types:
+        _notify_cache_only(session, cache_types)
+
     tracked = session.info.pop("knowledge_tracked", [])
     if not tracked:
         return
 
-    events: List[ChangeEvent] = session.info.setdefault("knowledge_events", [])
+    flushed: List[ChangeEvent] = []
     for item in tracked:
         if item.get("op") == "delete" and "id" in item:
-            events.append({"op": "delete", "type": item["type"], "id": item["id"]})
+            flushed.append({"op": "delete", "type": item["type"], "id": item["id"]})
             continue
 
         obj = item.get("obj")
@@ -188,30 +596,33 @@ def _resolve_ids_after_flush(session, flush_context):
         row_id = getattr(obj, "id", None)
         if not doc_type or row_id is None:
             continue
-        events.append({"op": item["op"], "type": doc_type, "id": int(row_id)})
+        flushed.append({"op": item["op"], "type": doc_type, "id": int(row_id)})
+
+    session.info.setdefault("knowledge_events", []).extend(flushed)
+    _write_outbox(session, flushed)
 
 
 @event.listens_for(Session, "after_commit")
 def _apply_captured_changes_after_commit(session):
     events: List[ChangeEvent] = session.info.pop("knowledge_events", [])
+    seqs: List[int] = session.info.pop("knowledge_outbox_seqs", [])
     session.info.pop("knowledge_tracked", None)
+    cache_types = session.info.pop("cache_invalidate", None)
+    if cache_types:
+        response_cache.invalidate_doc_types(cache_types)
+    stats_counters.apply_deltas(session.info.pop("counter_deltas", []))
     if not events:
         return
 
-    # De-dupe by (type, id): delete wins; otherwise last write wins
-    latest: Dict[Tuple[str, int], ChangeEvent] = {}
-    for ev in events:
-        key = (str(ev["type"]), int(ev["id"]))  # type: ignore[arg-type]
-        if latest.get(key, {}).get("op") == "delete":
-            continue
-        if ev.get("op") == "delete":
-            latest[key] = ev
-        else:
-            latest[key] = ev
-    deduped = list(latest.values())
-
+    deduped = _dedupe_events(events)
+    # Synchronous, so the admin's next read after this commit is never served a stale body
+    response_cache.invalidate_doc_types({str(ev["type"]) for ev in deduped})
     try:
-        _pg_notify(deduped)
+        if seqs:
+            # Applied locally right below; the NOTIFY echo must not apply them twice
+            _mark_applied(seqs)
+        else:
+            _pg_notify(deduped)
         _apply_events_async(deduped, source="local")
     except Exception as e:
         logger.error(f"Failed to apply captured DB changes: {e}", exc_info=True)
@@ -220,61 +631,28 @@ def _apply_captured_changes_after_commit(session):
 @event.listens_for(Session, "after_rollback")
 def _clear_captured_changes_on_rollback(session):
     session.info.pop("knowledge_events", None)
+    session.info.pop("knowledge_outbox_seqs", None)
     session.info.pop("knowledge_tracked", None)
+    session.info.pop("cache_tracked", None)
+    session.info.pop("cache_invalidate", None)
+    session.info.pop("counter_deltas", None)
 
 
 # ---------------------------------------------------------------------------
 # Cross-worker fan-out via PostgreSQL LISTEN/NOTIFY
 # ---------------------------------------------------------------------------
 
-def _listen_loop() -> None:
-    """Background listener so other Gunicorn workers update without polling."""
-    raw_conn = None
-    try:
-        raw_conn = engine.raw_connection()
-        raw_conn.set_isolation_level(0)  # AUTOCOMMIT required for LISTEN
-        cursor = raw_conn.cursor()
-        cursor.execute(f"LISTEN {NOTIFY_CHANNEL};")
-        logger.info(f"Listening for DB knowledge changes on channel '{NOTIFY_CHANNEL}'")
-
-        while not _listener_stop.is_set():
-            if select.select([raw_conn], [], [], 2.0) == ([], [], []):
-                continue
-            raw_conn.poll()
-            while raw_conn.notifies:
-                notify = raw_conn.notifies.pop(0)
-                try:
-                    data = json.loads(notify.payload or "{}")
-                    events = data.get("events") or []
-                    if events:
-                        apply_change_events(events, source="pg_notify")
-                except Exception as e:
-                    logger.error(f"Failed handling NOTIFY payload: {e}", exc_info=True)
-    except Exception as e:
-        logger.error(f"Knowledge LISTEN loop stopped: {e}", exc_info=True)
-    finally:
-        if raw_conn is not None:
-            try:
-                raw_conn.close()
-            except Exception:
-                pass
-
+def start_change_listener(loop) -> bool:
+    """Start the asyncio LISTEN consumer on `loop` (see knowledge_listener); callable from any thread."""
+    from backend.services import knowledge_listener
 
-def start_change_listener() -> None:
-    global _listener_thread
-    if _listener_thread and _listener_thread.is_alive():
-        return
-    _listener_stop.clear()
-    _listener_thread = threading.Thread(
-        target=_listen_loop,
-        daemon=True,
-        name="knowledge-pg-listen",
-    )
-    _listener_thread.start()
+    return knowledge_listener.start(loop)
 
 
 def stop_change_listener() -> None:
-    _listener_stop.set()
+    from backend.services import knowledge_listener
+
+    knowledge_listener.stop()
 
 
 def register_knowledge_listeners() -> None:
@@ -0,0 +1,102 @@
+"""
+Serialised bodies for the public portfolio content, built through the response cache.
+
+Each collection is one query + one Pydantic dump, cached as JSON bytes until a
+commit touches its table. The /api/portfolio snapshot is stitched together from
+those cached bodies (no re-serialisation) and compressed once per version.
+
+The *_async variants serve the async endpoints from an AsyncSession; both share
+the same cache entries.
+"""
+import hashlib
+import json
+from typing import Dict, List, Tuple
+
+from pydantic import TypeAdapter
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from backend.models import sql_models as models
+from backend.models import schemas
+from backend.services.response_cache import CachedBody, response_cache
+from backend.services.stats_counters import stats_counters
+
+# Cache key -> (ORM model, response schema), in snapshot order
+PUBLIC_COLLECTIONS: Dict[str, Tuple[type, type]] = {
+    "projects": (models.Project, schemas.ProjectResponse),
+    "skills": (models.TechnicalSkill, schemas.TechnicalSkillResponse),
+    "experience": (models.WorkExperience, schemas.WorkExperienceResponse),
+    "education": (models.Education, schemas.EducationResponse),
+    "certificates": (models.Certificate, schemas.CertificateResponse),
+    "moments": (models.MemorableMoment, schemas.MemorableMomentResponse),
+    "cvs": (models.CV, schemas.CVResponse),
+}
+
+_adapters: Dict[str, TypeAdapter] = {}
+
+
+def _adapter(key: str) -> TypeAdapter:
+    adapter = _adapters.get(key)
+    if adapter is None:
+        adapter = _adapters[key] = TypeAdapter(List[PUBLIC_COLLECTIONS[key][1]])
+    return adapter
+
+
+def collection_body(db: Session, key: str) -> CachedBody:
+    model, _ = PUBLIC_COLLECTIONS[key]
+    return response_cache.get_or_build(key, lambda: _adapter(key).dump_json(db.query(model).all()))
+
+
+async def collection_body_async(db: AsyncSession, key: str) -> CachedBody:
+    model, _ = PUBLIC_COLLECTIONS[key]
+
+    async def build() -> bytes:
+        rows = (await db.execute(select(model))).scalars().all()
+        return _adapter(key).dump_json(rows)
+
+    return await response_cache.get_or_build_async(key, build)
+
+
+def stats_body(db: Session) -> CachedBody:
+    return response_cache.get_or_build("stats", lambda: json.dumps(stats_counters.summary(db)).encode("utf-8"))
+
+
+async def stats_body_async(db: AsyncSession) -> CachedBody:
+    async def build() -> bytes:
+        return json.dumps(await stats_counters.summary_async(db)).encode("utf-8")
+
+    return await response_cache.get_or_build_async("stats", build)
+
+
+def _stitch(parts: List[Tuple[str, CachedBody]]) -> bytes:
+    version = hashlib.sha1("".join(entry.etag for _, entry in parts).encode("utf-8")).hexdigest()[:16]
+    chunks = [b'{"version":', json.dumps(version).encode("utf-8")]
+    for key, entry in parts:
+        chunks.extend([b',', json.dumps(key).encode("utf-8"), b':', entry.body])
+    chunks.append(b'}')
+    return b"".join(chunks)
+
+
+def portfolio_body(db: Session) -> CachedBody:
+    """
+    Every public collection plus the stats counters in one document:
+    {"version": ..., "projects": [...], ..., "cvs": [...], "stats": {...}}.
+    `version` changes whenever any part does, so clients can key caches on it.
+    """
+    def build() -> bytes:
+        parts = [(key, collection_body(db, key)) for key in PUBLIC_COLLECTIONS]
+        parts.append(("stats", stats_body(db)))
+        return _stitch(parts)
+
+    return response_cache.get_or_build("portfolio", build, compress=True)
+
+
+async def portfolio_body_async(db: AsyncSession) -> CachedBody:
+    async def build() -> bytes:
+        # One session, so the parts are built one after another
+        parts = [(key, await collection_body_async(db, key)) for key in PUBLIC_COLLECTIONS]
+        parts.append(("stats", await stats_body_async(db)))
+        return _stitch(parts)
+
+    return await response_cache.get_or_build_async("portfolio", build, compress=True)
@@ -0,0 +1,253 @@
+"""
+Read-through cache of serialised JSON for the public portfolio endpoints.
+
+Each collection's response body is built once (one query + one Pydantic dump),
+kept as bytes with a strong ETag, and served from memory until a committed
+change to that collection invalidates it. Invalidation comes from the same CDC
+hooks that keep the knowledge index fresh: locally from after_commit, and from
+other workers through the knowledge outbox / NOTIFY catch-up.
+
+Bodies built with compress=True also keep gzip (and, when the optional
+`brotli` package is installed, br) encodings, compressed once per version.
+"""
+import asyncio
+import gzip
+import hashlib
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+from fastapi import Request, Response
+
+from backend.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Collections whose cached bodies depend on rows of each indexed doc type
+# ("cv" is not indexed for RAG but is part of the public snapshot)
+DOC_TYPE_TO_KEYS: Dict[str, tuple] = {
+    "project": ("projects", "stats", "portfolio"),
+    "skills": ("skills", "stats", "portfolio"),
+    "education": ("education", "portfolio"),
+    "certificate": ("certificates", "portfolio"),
+    "moment": ("moments", "portfolio"),
+    "experience": ("experience", "portfolio"),
+    "cv": ("cvs", "portfolio"),
+}
+
+# Bodies smaller than this are not worth compressing
+MIN_COMPRESS_BYTES = 512
+
+_hits = metrics.counter("response_cache_hits_total", "Cached response bodies served from memory")
+_misses = metrics.counter("response_cache_misses_total", "Cached response bodies rebuilt from the database")
+_not_modified = metrics.counter("response_cache_not_modified_total", "304 responses for a matching If-None-Match")
+_invalidations = metrics.counter("response_cache_invalidations_total", "Cache keys invalidated by committed changes")
+
+
+@dataclass(frozen=True)
+class CachedBody:
+    body: bytes
+    etag: str
+    media_type: str = "application/json"
+    # content-coding -> compressed body, e.g. {"gzip": ..., "br": ...}
+    encoded: Dict[str, bytes] = field(default_factory=dict)
+
+    def etag_for(self, coding: Optional[str]) -> str:
+        """Strong ETags must differ per representation, so encodings get a suffix."""
+        return self.etag if not coding else f'{self.etag[:-1]}-{coding}"'
+
+
+def make_etag(body: bytes) -> str:
+    return '"' + hashlib.sha1(body).hexdigest() + '"'
+
+
+def _brotli():
+    try:
+        import brotli  # optional dependency
+    except ImportError:
+        return None
+    return brotli
+
+
+def compress_variants(body: bytes) -> Dict[str, bytes]:
+    if len(body) < MIN_COMPRESS_BYTES:
+        return {}
+    variants = {"gzip": gzip.compress(body, compresslevel=9, mtime=0)}
+    brotli = _brotli()
+    if brotli is not None:
+        variants["br"] = brotli.compress(body, quality=11)
+    return variants
+
+
+class ResponseCache:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: Dict[str, CachedBody] = {}
+        self._generations: Dict[str, int] = {}
+        # Bumped by invalidate_all(), so it also covers keys whose first build is in flight
+        self._epoch = 0
+        self._build_locks: Dict[str, threading.Lock] = {}
+        self._async_build_locks: Dict[str, asyncio.Lock] = {}
+
+    def _build_lock(self, key: str) -> threading.Lock:
+        with self._lock:
+            return self._build_locks.setdefault(key, threading.Lock())
+
+    def _async_build_lock(self, key: str) -> asyncio.Lock:
+        with self._lock:
+            return self._async_build_locks.setdefault(key, asyncio.Lock())
+
+    def _hit(self, key: str) -> Optional[CachedBody]:
+        entry = self.peek(key)
+        if entry is not None:
+            _hits.inc(key=key)
+        return entry
+
+    def _generation(self, key: str) -> Tuple[int, int]:
+        with self._lock:
+            return self._epoch, self._generations.get(key, 0)
+
+    def _store(self, key: str, generation: Tuple[int, int], body: bytes, media_type: str, compress: bool) -> CachedBody:
+        entry = CachedBody(
+            body=body,
+            etag=make_etag(body),
+            media_type=media_type,
+            encoded=compress_variants(body) if compress else {},
+        )
+        with self._lock:
+            if (self._epoch, self._generations.get(key, 0)) == generation:
+                self._entries[key] = entry
+        _misses.inc(key=key)
+        return entry
+
+    def peek(self, key: str) -> Optional[CachedBody]:
+        with self._lock:
+            return self._entries.get(key)
+
+    def get_or_build(
+        self,
+        key: str,
+        build: Callable[[], bytes],
+        media_type: str = "application/json",
+        compress: bool = False,
+    ) -> CachedBody:
+        """
+        Return the cached body, building it on a miss. Concurrent misses for the
+        same key build once; a body whose build raced with an invalidation is
+        served but not stored, so a stale read never outlives the change.
+        """
+        entry = self._hit(key)
+        if entry is not None:
+            return entry
+
+        with self._build_lock(key):
+            entry = self._hit(key)
+            if entry is not None:
+                return entry
+            generation = self._generation(key)
+            return self._store(key, generation, build(), media_type, compress)
+
+    async def get_or_build_async(
+        self,
+        key: str,
+        build: Callable[[], Awaitable[bytes]],
+        media_type: str = "application/json",
+        compress: bool = False,
+    ) -> CachedBody:
+        """get_or_build() for async endpoints: the build is awaited, concurrent misses wait on an asyncio lock."""
+        entry = self._hit(key)
+        if entry is not None:
+            return entry
+
+        async with self._async_build_lock(key):
+            entry = self._hit(key)
+            if entry is not None:
+                return entry
+            generation = self._generation(key)
+            return self._store(key, generation, await build(), media_type, compress)
+
+    def invalidate(self, *keys: str) -> None:
+        with self._lock:
+            for key in keys:
+                self._generations[key] = self._generations.get(key, 0) + 1
+                self._entries.pop(key, None)
+        if keys:
+            _invalidations.inc(len(keys))
+            logger.debug(f"Invalidated cached responses: {sorted(keys)}")
+
+    def invalidate_all(self) -> None:
+        with self._lock:
+            self._epoch += 1
+            keys = set(self._entries) | set(self._generations)
+        self.invalidate(*keys)
+
+    def invalidate_doc_types(self, doc_types: Iterable[str]) -> None:
+        keys = set()
+        for doc_type in doc_types:
+            keys.update(DOC_TYPE_TO_KEYS.get(str(doc_type), ()))
+        if keys:
+            self.invalidate(*keys)
+
+
+response_cache = ResponseCache()
+
+
+def _etag_matches(if_none_match: Optional[str], etags: List[str]) -> bool:
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == "*" or candidate in etags:
+            return True
+    return False
+
+
+def _accepted_codings(accept_encoding: Optional[str]) -> Dict[str, float]:
+    codings: Dict[str, float] = {}
+    for part in (accept_encoding or "").split(","):
+        name, _, params = part.strip().partition(";")
+        if not name:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        codings[name.strip().lower()] = quality
+    return codings
+
+
+def choose_encoding(entry: CachedBody, accept_encoding: Optional[str]) -> Optional[str]:
+    """Best precomputed encoding the client accepts (br over gzip), or None for identity."""
+    if not entry.encoded:
+        return None
+    accepted = _accepted_codings(accept_encoding)
+    for coding in ("br", "gzip"):
+        if coding in entry.encoded and accepted.get(coding, accepted.get("*", 0.0)) > 0:
+            return coding
+    return None
+
+
+def cached_response(request: Request, entry: CachedBody, max_age: int = 0) -> Response:
+    """Serve a cached body with ETag revalidation (304 when If-None-Match matches)."""
+    coding = choose_encoding(entry, request.headers.get("accept-encoding"))
+    headers = {
+        "ETag": entry.etag_for(coding),
+        # Browsers revalidate on every view; unchanged content costs a 304 with no body
+        "Cache-Control": f"public, max-age={max_age}, must-revalidate",
+    }
+    if entry.encoded:
+        headers["Vary"] = "Accept-Encoding"
+    all_etags = [entry.etag] + [entry.etag_for(c) for c in entry.encoded]
+    if _etag_matches(request.headers.get("if-none-match"), all_etags):
+        _not_modified.inc()
+        return Response(status_code=304, headers=headers)
+    if coding:
+        headers["Content-Encoding"] = coding
+        return Response(content=entry.encoded[coding], media_type=entry.media_type, headers=headers)
+    return Response(content=entry.body, media_type=entry.media_type, headers=headers)
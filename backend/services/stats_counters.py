@@ -0,0 +1,320 @@
+"""
+In-memory portfolio counters (totals and counts per category dimension).
+
+Cold start is one round trip: a UNION ALL of one GROUP BY per entity over its
+dimension columns; per-dimension counts are the marginals of that cross-tab.
+After that the counters are maintained from CDC:
+  - commits in this worker apply exact deltas (old and new dimension values are
+    taken from the ORM attribute history at flush time, so a category change is
+    -1 on the old value and +1 on the new one)
+  - changes seen from other workers only name the row, so the entity is marked
+    dirty and re-aggregated by the next read (again a single query)
+"""
+import logging
+import threading
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import Boolean, String, cast, func, inspect as sa_inspect, literal, null, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from backend.database import SessionLocal
+from backend.models import sql_models as models
+from backend.services.response_cache import response_cache
+
+logger = logging.getLogger(__name__)
+
+# entity -> (model, dimension columns); at most two dimensions per entity
+ENTITIES: Dict[str, Tuple[type, Tuple[str, ...]]] = {
+    "projects": (models.Project, ("category", "is_featured")),
+    "skills": (models.TechnicalSkill, ("category", "proficiency")),
+    "experience": (models.WorkExperience, ("type", "is_current")),
+    "education": (models.Education, ()),
+    "certificates": (models.Certificate, ("is_professional",)),
+    "moments": (models.MemorableMoment, ()),
+    "cvs": (models.CV, ()),
+}
+MAX_DIMENSIONS = 2
+
+MODEL_TO_ENTITY = {model: entity for entity, (model, _) in ENTITIES.items()}
+# Knowledge doc types (see database_loader) -> entity, for changes seen from other workers
+DOC_TYPE_TO_ENTITY = {
+    "project": "projects",
+    "skills": "skills",
+    "experience": "experience",
+    "education": "education",
+    "certificate": "certificates",
+    "moment": "moments",
+    "cv": "cvs",
+}
+
+# Cached response bodies that embed these counters
+_DEPENDENT_CACHE_KEYS = ("stats", "portfolio")
+
+def _is_boolean(model, dimension: str) -> bool:
+    return isinstance(model.__table__.c[dimension].type, Boolean)
+
+
+def _column_default(model, dimension: str):
+    """Scalar column default, which the ORM only fills in during the INSERT itself."""
+    default = model.__table__.c[dimension].default
+    return default.arg if default is not None and default.is_scalar else None
+
+
+def _normalize(value, boolean: bool) -> Optional[str]:
+    """One spelling per value whether it came from the ORM or a text cast in SQL."""
+    if value is None:
+        return None
+    if boolean:
+        return "true" if str(value).lower() in ("1", "true", "t") else "false"
+    return str(value)
+
+
+class _EntityCounts:
+    def __init__(self, dimensions: Tuple[str, ...]):
+        self.total = 0
+        self.by_dimension: Dict[str, Counter] = {dim: Counter() for dim in dimensions}
+
+
+class StatsCounters:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts: Dict[str, _EntityCounts] = {}
+        self._dirty = set(ENTITIES)
+        # Bumped by every delta/mark; a re-aggregate that raced one is discarded
+        self._versions: Dict[str, int] = {entity: 0 for entity in ENTITIES}
+
+    # -- loading -------------------------------------------------------------
+
+    def _aggregate_query(self, entities: Iterable[str]):
+        selects = []
+        for entity in entities:
+            model, dimensions = ENTITIES[entity]
+            columns = [literal(entity).label("entity")]
+            group_by = []
+            for i in range(MAX_DIMENSIONS):
+                if i < len(dimensions):
+                    column = cast(model.__table__.c[dimensions[i]], String)
+                    columns.append(column.label(f"d{i}"))
+                    group_by.append(column)
+                else:
+                    columns.append(cast(null(), String).label(f"d{i}"))
+            columns.append(func.count().label("n"))
+            stmt = select(*columns).select_from(model.__table__)
+            if group_by:
+                stmt = stmt.group_by(*group_by)
+            selects.append(stmt)
+        return selects[0] if len(selects) == 1 else union_all(*selects)
+
+    def _stale(self) -> set:
+        """Entities a read must re-aggregate. Call with _lock held."""
+        # Not-yet-loaded entities count too: a concurrent cold-start read may have claimed
+        # them off _dirty while its query is still running
+        return self._dirty | {entity for entity in ENTITIES if entity not in self._counts}
+
+    def _claim(self, entities: Optional[Iterable[str]]) -> Tuple[List[str], Dict[str, int]]:
+        with self._lock:
+            targets = sorted(set(entities) if entities is not None else self._stale())
+            self._dirty.difference_update(targets)
+            return targets, {entity: self._versions[entity] for entity in targets}
+
+    def _release(self, targets: List[str]) -> None:
+        with self._lock:
+            self._dirty.update(targets)
+
+    def _install(self, rows, targets: List[str], versions: Dict[str, int]) -> None:
+        fresh = {entity: _EntityCounts(ENTITIES[entity][1]) for entity in targets}
+        for row in rows:
+            model, dimensions = ENTITIES[row.entity]
+            counts = fresh[row.entity]
+            counts.total += row.n
+            for i, dim in enumerate(dimensions):
+                value = _normalize(getattr(row, f"d{i}"), _is_boolean(model, dim))
+                counts.by_dimension[dim][value] += row.n
+        with self._lock:
+            for entity, counts in fresh.items():
+                if self._versions[entity] == versions[entity]:
+                    self._counts[entity] = counts
+                else:
+                    self._dirty.add(entity)
+
+    def refresh(self, db: Optional[Session] = None, entities: Optional[Iterable[str]] = None) -> None:
+        """Re-aggregate the given (default: dirty) entities with one query."""
+        targets, versions = self._claim(entities)
+        if not targets:
+            return
+
+        own_session = db is None
+        db = db or SessionLocal()
+        try:
+            rows = db.execute(self._aggregate_query(targets)).all()
+        except Exception:
+            self._release(targets)
+            raise
+        finally:
+            if own_session:
+                db.close()
+        self._install(rows, targets, versions)
+
+    async def refresh_async(self, db: AsyncSession, entities: Optional[Iterable[str]] = None) -> None:
+        """refresh() on an async session."""
+        targets, versions = self._claim(entities)
+        if not targets:
+            return
+        try:
+            rows = (await db.execute(self._aggregate_query(targets))).all()
+        except Exception:
+            self._release(targets)
+            raise
+        self._install(rows, targets, versions)
+
+    def _ensure_fresh(self, db: Optional[Session]) -> None:
+        # A refresh that raced a change leaves the entity dirty; one retry is enough in practice
+        for _ in range(2):
+            if not self._needs_refresh():
+                return
+            self.refresh(db)
+        self._check_loaded()
+
+    async def _ensure_fresh_async(self, db: AsyncSession) -> None:
+        for _ in range(2):
+            if not self._needs_refresh():
+                return
+            await self.refresh_async(db)
+        self._check_loaded()
+
+    def _needs_refresh(self) -> bool:
+        with self._lock:
+            return bool(self._stale())
+
+    def _check_loaded(self) -> None:
+        if any(entity not in self._counts for entity in ENTITIES):
+            raise RuntimeError("Stats counters could not be loaded")
+
+    # -- CDC -----------------------------------------------------------------
+
+    @staticmethod
+    def capture(obj, op: str) -> Optional[Tuple[str, str, Dict[str, Optional[str]], Dict[str, Optional[str]]]]:
+        """
+        Called at flush time: (entity, op, old values, new values) for a tracked
+        object, or None. Old values come from the attribute history.
+        """
+        entity = MODEL_TO_ENTITY.get(type(obj))
+        if entity is None:
+            return None
+        model, dimensions = ENTITIES[entity]
+        state = sa_inspect(obj)
+        old: Dict[str, Optional[str]] = {}
+        new: Dict[str, Optional[str]] = {}
+        for dim in dimensions:
+            boolean = _is_boolean(model, dim)
+            history = state.attrs[dim].history
+            current = getattr(obj, dim)
+            if current is None and op == "insert":
+                current = _column_default(model, dim)
+            previous = history.deleted[0] if history.deleted else (None if op == "insert" else current)
+            if op == "update" and not history.has_changes():
+                previous = current
+            old[dim] = _normalize(previous, boolean)
+            new[dim] = _normalize(current, boolean)
+        return entity, op, old, new
+
+    def apply_deltas(self, deltas: List[Tuple[str, str, Dict, Dict]]) -> None:
+        """Apply deltas captured from this worker's committed flushes."""
+        if not deltas:
+            return
+        changed = False
+        with self._lock:
+            for entity, op, old, new in deltas:
+                self._versions[entity] += 1
+                counts = self._counts.get(entity)
+                if counts is None or entity in self._dirty:
+                    continue  # re-aggregated on next read anyway
+                if op == "insert":
+                    counts.total += 1
+                elif op == "delete":
+                    counts.total -= 1
+                for dim, counter in counts.by_dimension.items():
+                    if op in ("update", "delete"):
+                        counter[old.get(dim)] -= 1
+                        if counter[old.get(dim)] <= 0:
+                            del counter[old.get(dim)]
+                    if op in ("insert", "update"):
+                        counter[new.get(dim)] += 1
+                changed = True
+        if changed:
+            response_cache.invalidate(*_DEPENDENT_CACHE_KEYS)
+
+    def mark_dirty(self, doc_types: Optional[Iterable[str]] = None) -> None:
+        """Remote changes (or unknown ones when doc_types is None) force a re-aggregate."""
+        if doc_types is None:
+            entities = set(ENTITIES)
+        else:
+            entities = {DOC_TYPE_TO_ENTITY[t] for t in doc_types if t in DOC_TYPE_TO_ENTITY}
+        if entities:
+            with self._lock:
+                self._dirty.update(entities)
+                for entity in entities:
+                    self._versions[entity] += 1
+            response_cache.invalidate(*_DEPENDENT_CACHE_KEYS)
+
+    # -- reads ---------------------------------------------------------------
+
+    def counts(self, entity: str, dimension: Optional[str] = None, db: Optional[Session] = None) -> dict:
+        """
+        {"entity", "total", "by": {dimension: {value: count}}}; restricted to one
+        dimension when given. Raises KeyError for unknown entities/dimensions.
+        """
+        self._check_dimension(entity, dimension)
+        self._ensure_fresh(db)
+        return self._counts_view(entity, dimension)
+
+    async def counts_async(self, db: AsyncSession, entity: str, dimension: Optional[str] = None) -> dict:
+        self._check_dimension(entity, dimension)
+        await self._ensure_fresh_async(db)
+        return self._counts_view(entity, dimension)
+
+    def summary(self, db: Optional[Session] = None) -> dict:
+        """The legacy /api/stats shape."""
+        self._ensure_fresh(db)
+        return self._summary_view()
+
+    async def summary_async(self, db: AsyncSession) -> dict:
+        await self._ensure_fresh_async(db)
+        return self._summary_view()
+
+    @staticmethod
+    def _check_dimension(entity: str, dimension: Optional[str]) -> None:
+        _, dimensions = ENTITIES[entity]
+        if dimension is not None and dimension not in dimensions:
+            raise KeyError(dimension)
+
+    def _counts_view(self, entity: str, dimension: Optional[str]) -> dict:
+        with self._lock:
+            counts = self._counts[entity]
+            wanted = [dimension] if dimension else list(ENTITIES[entity][1])
+            # Rows without a value go under "unset", since any string key could be a real value
+            return {
+                "entity": entity,
+                "total": counts.total,
+                "by": {
+                    dim: {value: n for value, n in counts.by_dimension[dim].items() if value is not None}
+                    for dim in wanted
+                },
+                "unset": {dim: counts.by_dimension[dim].get(None, 0) for dim in wanted},
+            }
+
+    def _summary_view(self) -> dict:
+        with self._lock:
+            projects = self._counts["projects"]
+            categories = projects.by_dimension["category"]
+            return {
+                "totalProjects": projects.total,
+                "totalSkills": self._counts["skills"].total,
+                "aiMlProjects": categories.get("AI/ML", 0),
+                "dataSolutions": categories.get("Data Solutions", 0),
+            }
+
+
+stats_counters = StatsCounters()
@@ -0,0 +1,282 @@
+"""
+Indexed chat-transcript store (SQLite in WAL mode) behind /admin/chats.
+
+It is one more sink of the batched history writer: each batch is a single
+executemany in one transaction, on a connection owned by the writer thread.
+Readers open their own connection and, in WAL mode, never wait on the writer.
+
+  - transcripts(id, timestamp, user_name, user_input, ai_response), indexed on
+    timestamp and (user_name, timestamp)
+  - transcripts_fts: external-content FTS5 index over the question and answer,
+    kept in sync by triggers (a LIKE scan is used when SQLite lacks FTS5)
+
+Pages are keyset-paginated on (timestamp, id), newest first: the cursor names
+the last row of the previous page, so any page is one index range read however
+deep it is. When the store is first created, the existing chat_history.jsonl
+(and its rotated backups) is imported once.
+"""
+import base64
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+from backend.config import CHAT_HISTORY_BACKUP_COUNT, CHAT_HISTORY_PATH, CHAT_TRANSCRIPT_DB
+
+logger = logging.getLogger(__name__)
+
+BUSY_TIMEOUT_SECONDS = 5.0
+
+SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS transcripts (
+        id INTEGER PRIMARY KEY,
+        timestamp TEXT NOT NULL,
+        user_name TEXT,
+        user_input TEXT NOT NULL DEFAULT '',
+        ai_response TEXT NOT NULL DEFAULT ''
+    )
+    """,
+    # The rowid is implicitly the last column of both, so (timestamp, id) keysets are range reads
+    "CREATE INDEX IF NOT EXISTS ix_transcripts_timestamp ON transcripts (timestamp)",
+    "CREATE INDEX IF NOT EXISTS ix_transcripts_user_timestamp ON transcripts (user_name, timestamp)",
+    "CREATE TABLE IF NOT EXISTS transcript_meta (key TEXT PRIMARY KEY, value TEXT)",
+)
+
+FTS_SCHEMA = (
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS transcripts_fts USING fts5(
+        user_input, ai_response, content='transcripts', content_rowid='id'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS transcripts_fts_insert AFTER INSERT ON transcripts BEGIN
+        INSERT INTO transcripts_fts (rowid, user_input, ai_response)
+        VALUES (new.id, new.user_input, new.ai_response);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS transcripts_fts_delete AFTER DELETE ON transcripts BEGIN
+        INSERT INTO transcripts_fts (transcripts_fts, rowid, user_input, ai_response)
+        VALUES ('delete', old.id, old.user_input, old.ai_response);
+    END
+    """,
+)
+
+_COLUMNS = "t.id, t.timestamp, t.user_name, t.user_input, t.ai_response"
+_INSERT = "INSERT INTO transcripts (timestamp, user_name, user_input, ai_response) VALUES (?, ?, ?, ?)"
+
+
+def encode_cursor(timestamp: str, row_id: int) -> str:
+    raw = json.dumps([timestamp, row_id], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[str, int]:
+    try:
+        timestamp, row_id = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        return str(timestamp), int(row_id)
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def fts_query(text: str) -> str:
+    """Free text -> FTS5 query: every word must match, the last one as a prefix."""
+    terms = re.findall(r"\w+", text)
+    if not terms:
+        return ""
+    quoted = [f'"{term}"' for term in terms]
+    quoted[-1] += "*"
+    return " ".join(quoted)
+
+
+def _timestamp(value: datetime) -> str:
+    """Transcripts carry naive UTC ISO timestamps; compare in the same spelling."""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value.isoformat()
+
+
+def _row(entry: Dict) -> Tuple[str, Optional[str], str, str]:
+    return (
+        str(entry.get("timestamp") or datetime.utcnow().isoformat()),
+        entry.get("user_name"),
+        entry.get("user_input") or "",
+        entry.get("ai_response") or "",
+    )
+
+
+class TranscriptStore:
+    def __init__(
+        self,
+        path: str = CHAT_TRANSCRIPT_DB,
+        import_from: Optional[str] = CHAT_HISTORY_PATH,
+        import_backups: int = CHAT_HISTORY_BACKUP_COUNT,
+    ):
+        self.path = path
+        self.import_from = import_from
+        self.import_backups = import_backups
+        self.fts = False
+        self._ready = False
+        self._schema_lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None  # writer thread only
+
+    def _connect(self) -> sqlite3.Connection:
+        # Autocommit mode; transactions are opened explicitly
+        conn = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT_SECONDS, isolation_level=None, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    # -- schema --------------------------------------------------------------
+
+    def ensure_schema(self) -> None:
+        if self._ready:
+            return
+        with self._schema_lock:
+            if self._ready:
+                return
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = self._connect()
+            try:
+                conn.execute("PRAGMA journal_mode=WAL")  # persistent: recorded in the database file
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    for statement in SCHEMA:
+                        conn.execute(statement)
+                    self.fts = self._create_fts(conn)
+                    if conn.execute("SELECT 1 FROM transcript_meta WHERE key = 'jsonl_imported'").fetchone() is None:
+                        imported = self._import_jsonl(conn)
+                        conn.execute("INSERT INTO transcript_meta (key, value) VALUES ('jsonl_imported', ?)", (str(imported),))
+                    conn.execute("COMMIT")
+                except BaseException:
+                    conn.execute("ROLLBACK")
+                    raise
+            finally:
+                conn.close()
+            self._ready = True
+
+    @staticmethod
+    def _create_fts(conn: sqlite3.Connection) -> bool:
+        try:
+            for statement in FTS_SCHEMA:
+                conn.execute(statement)
+            return True
+        except sqlite3.OperationalError as e:
+            logger.warning(f"SQLite FTS5 unavailable ({e}); transcript search falls back to LIKE scans")
+            return False
+
+    def _import_jsonl(self, conn: sqlite3.Connection) -> int:
+        if not self.import_from:
+            return 0
+        # Oldest rotated file first so ids follow the original order
+        paths = [f"{self.import_from}.{i}" for i in range(self.import_backups, 0, -1)] + [self.import_from]
+        imported = 0
+        for path in paths:
+            if not os.path.isfile(path):
+                continue
+            rows = []
+            with open(path, "r", encoding="utf-8", errors="replace") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue
+                    if isinstance(entry, dict):
+                        rows.append(_row(entry))
+            conn.executemany(_INSERT, rows)
+            imported += len(rows)
+        if imported:
+            logger.info(f"Imported {imported} chat turn(s) from {self.import_from} into {self.path}")
+        return imported
+
+    # -- HistorySink ---------------------------------------------------------
+
+    def write_batch(self, entries: List[Dict]) -> None:
+        self.ensure_schema()
+        if self._conn is None:
+            self._conn = self._connect()
+            # WAL + NORMAL: a commit is durable once the WAL is checkpointed; no fsync per batch
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+        conn = self._conn
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.executemany(_INSERT, [_row(entry) for entry in entries])
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def close(self) -> None:
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            finally:
+                self._conn = None
+
+    # -- reads ---------------------------------------------------------------
+
+    def page(
+        self,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        user_name: Optional[str] = None,
+        q: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+    ) -> Dict[str, object]:
+        """
+        One page, newest first: {"items": [...], "next_cursor": str | None}.
+        Pass next_cursor back to continue; raises ValueError for a bad cursor.
+        """
+        self.ensure_schema()
+        sql = f"SELECT {_COLUMNS} FROM transcripts t"
+        where: List[str] = []
+        params: List[object] = []
+
+        query = fts_query(q) if q else ""
+        if query and self.fts:
+            sql += " JOIN transcripts_fts ON transcripts_fts.rowid = t.id"
+            where.append("transcripts_fts MATCH ?")
+            params.append(query)
+        elif q and q.strip():
+            pattern = "%" + q.strip().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+            where.append("(t.user_input LIKE ? ESCAPE '\\' OR t.ai_response LIKE ? ESCAPE '\\')")
+            params.extend([pattern, pattern])
+        if user_name is not None:
+            where.append("t.user_name = ?")
+            params.append(user_name)
+        if since is not None:
+            where.append("t.timestamp >= ?")
+            params.append(_timestamp(since))
+        if until is not None:
+            where.append("t.timestamp < ?")
+            params.append(_timestamp(until))
+        if cursor:
+            where.append("(t.timestamp, t.id) < (?, ?)")
+            params.extend(decode_cursor(cursor))
+
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY t.timestamp DESC, t.id DESC LIMIT ?"
+        params.append(limit + 1)  # one extra row says whether there is a next page
+
+        conn = self._connect()
+        try:
+            conn.execute("PRAGMA query_only=ON")
+            rows = conn.execute(sql, params).fetchall()
+        finally:
+            conn.close()
+
+        items = [dict(row) for row in rows[:limit]]
+        next_cursor = None
+        if len(rows) > limit:
+            last = items[-1]
+            next_cursor = encode_cursor(last["timestamp"], last["id"])
+        return {"items": items, "next_cursor": next_cursor}
+
+
+transcript_store: Optional[TranscriptStore] = TranscriptStore() if CHAT_TRANSCRIPT_DB else None
@@ -0,0 +1,68 @@
+import glob
+import json
+import multiprocessing
+import sys
+
+import pytest
+
+from backend.services import chat_history
+from backend.services.chat_history import ChatHistoryWriter, JsonlFileSink
+
+WRITERS = 4
+BATCHES = 100
+
+
+def _write(path: str, writer: int) -> None:
+    sink = JsonlFileSink(path, fsync="never", max_bytes=4000, backup_count=1000)
+    for i in range(BATCHES):
+        sink.write_batch([{"writer": writer, "turn": i}])
+    sink.close()
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="needs fork and flock")
+def test_workers_rotate_one_file_without_losing_turns(tmp_path):
+    path = str(tmp_path / "chat_history.jsonl")
+    context = multiprocessing.get_context("fork")
+    processes = [context.Process(target=_write, args=(path, w)) for w in range(WRITERS)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(30)
+        assert process.exitcode == 0
+
+    turns = []
+    for name in [path] + glob.glob(path + ".*[0-9]"):
+        with open(name, encoding="utf-8") as f:
+            turns.extend(json.loads(line) for line in f)
+    assert sorted((t["writer"], t["turn"]) for t in turns) == [(w, i) for w in range(WRITERS) for i in range(BATCHES)]
+
+
+def test_sink_follows_a_rotation_done_elsewhere(tmp_path):
+    path = str(tmp_path / "chat_history.jsonl")
+    ours = JsonlFileSink(path, fsync="never", max_bytes=0)
+    ours.write_batch([{"turn": 1}])
+    (tmp_path / "chat_history.jsonl").rename(tmp_path / "chat_history.jsonl.1")
+
+    ours.write_batch([{"turn": 2}])
+    ours.close()
+    assert (tmp_path / "chat_history.jsonl").read_text(encoding="utf-8") == '{"turn": 2}\n'
+
+
+def test_written_counts_only_successful_sink_writes():
+    class Good:
+        def write_batch(self, entries):
+            pass
+
+        def close(self):
+            pass
+
+    class Broken(Good):
+        def write_batch(self, entries):
+            raise OSError("disk full")
+
+    good_before = chat_history._written.value(sink="Good")
+    broken_before = chat_history._written.value(sink="Broken")
+    writer = ChatHistoryWriter(sinks=[Good(), Broken()])
+    writer._flush([{"turn": 1}, {"turn": 2}])
+    assert chat_history._written.value(sink="Good") == good_before + 2
+    assert chat_history._written.value(sink="Broken") == broken_before
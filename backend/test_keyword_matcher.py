@@ -0,0 +1,52 @@
+from backend.ai_core.utils.keyword_matcher import KeywordMatcher
+
+
+def _keywords(matcher, text):
+    return {category: [hit.keyword for hit in hits] for category, hits in matcher.find(text).items()}
+
+
+def test_matches_whole_words_only():
+    matcher = KeywordMatcher({"experience": ["role", "work"]})
+    assert matcher.find("how does the network control plane behave") == {}
+    assert _keywords(matcher, "What is your role at work?") == {"experience": ["role", "work"]}
+    assert _keywords(matcher, "work_item") == {}
+
+
+def test_stems_match_longer_words_but_start_on_a_boundary():
+    matcher = KeywordMatcher({"recruiter": ["recruit*"]})
+    assert _keywords(matcher, "Recruiters and recruiting") == {"recruiter": ["recruit", "recruit"]}
+    assert matcher.find("unrecruited") == {}
+
+
+def test_every_category_from_one_pass():
+    matcher = KeywordMatcher({"a": ["he", "she", "hers"], "b": ["hers"], "c": ["reach out"]})
+    hits = matcher.scan("she said hers, reach out")
+    assert [(h.category, h.keyword, h.start, h.end) for h in hits] == [
+        ("a", "she", 0, 3),
+        ("a", "hers", 9, 13),
+        ("b", "hers", 9, 13),
+        ("c", "reach out", 15, 24),
+    ]
+
+
+def test_overlapping_keywords_respect_boundaries():
+    matcher = KeywordMatcher({"x": ["ab*", "abc", "bcd", "c"]})
+    assert [(h.keyword, h.start) for h in matcher.scan("abcd abc c")] == [("ab", 0), ("ab", 5), ("abc", 5), ("c", 9)]
+
+
+def test_matching_ignores_case():
+    matcher = KeywordMatcher({"greeting": ["Good Morning"]})
+    assert _keywords(matcher, "GOOD MORNING!") == {"greeting": ["good morning"]}
+
+
+def test_reload_swaps_in_new_lists():
+    matcher = KeywordMatcher({"recruiter": ["hiring"]})
+    matcher.reload({"recruiter": ["headhunt*"], "greeting": ["hi"]})
+    assert _keywords(matcher, "hi, I'm a headhunter, we're hiring") == {"greeting": ["hi"], "recruiter": ["headhunt"]}
+    assert matcher.categories == ["recruiter", "greeting"]
+
+
+def test_default_lists_come_from_config():
+    matcher = KeywordMatcher()
+    assert "recruiter" in matcher.find("We are hiring")
+    assert "type:project" in matcher.find("show me your projects")
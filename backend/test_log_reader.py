@@ -0,0 +1,91 @@
+import json
+import os
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from backend.utils import log_reader
+from backend.utils.log_reader import LineFilter, LineIndexes, index_path, read_page
+
+START = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def _line(i: int) -> str:
+    level = "error" if i % 10 == 0 else "info"
+    return json.dumps({"i": i, "level": level, "timestamp": (START + timedelta(seconds=i)).isoformat()}) + "\n"
+
+
+@pytest.fixture
+def log_file(tmp_path, monkeypatch):
+    # Small checkpoint interval so pages start between checkpoints
+    monkeypatch.setattr(log_reader, "line_indexes", LineIndexes(every=10))
+    path = tmp_path / "app.log"
+    path.write_text("".join(_line(i) for i in range(250)))
+    return str(path)
+
+
+def _ids(page):
+    return [entry["i"] for entry in page["entries"]]
+
+
+def test_head_pages_continue_from_next_offset(log_file):
+    first = read_page(log_file, limit=25, offset=0)
+    assert _ids(first) == list(range(25))
+    assert first["total_lines"] == 250
+
+    second = read_page(log_file, limit=25, offset=first["next_offset"])
+    assert _ids(second) == list(range(25, 50))
+
+    last = read_page(log_file, limit=25, offset=237)
+    assert _ids(last) == list(range(237, 250))
+    assert last["next_offset"] is None
+    assert os.path.exists(index_path(log_file))
+
+
+def test_index_follows_appends_and_truncation(log_file):
+    read_page(log_file, limit=1)
+    with open(log_file, "a") as f:
+        f.write("".join(_line(i) for i in range(250, 260)))
+    page = read_page(log_file, limit=5, offset=255)
+    assert _ids(page) == list(range(255, 260))
+    assert page["total_lines"] == 260
+
+    with open(log_file, "w") as f:
+        f.write("".join(_line(i) for i in range(1000, 1005)))
+    page = read_page(log_file, limit=10, offset=2)
+    assert _ids(page) == [1002, 1003, 1004]
+    assert page["total_lines"] == 5
+
+
+def test_tail_pages_walk_backwards(log_file):
+    newest = read_page(log_file, limit=20, tail=True)
+    assert _ids(newest) == list(range(230, 250))
+    assert newest["next_offset"] == 20
+
+    older = read_page(log_file, limit=20, offset=newest["next_offset"], tail=True)
+    assert _ids(older) == list(range(210, 230))
+
+
+def test_level_filter_is_bounded_by_max_scan(log_file):
+    page = read_page(log_file, limit=100, line_filter=LineFilter(levels={"ERROR"}), max_scan=60)
+    assert _ids(page) == [0, 10, 20, 30, 40, 50]
+    assert page["scanned"] == 60
+    assert page["next_offset"] == 60
+
+
+def test_time_range_starts_near_since(log_file):
+    since = START + timedelta(seconds=123)
+    until = START + timedelta(seconds=128)
+    page = read_page(log_file, limit=100, line_filter=LineFilter(since=since, until=until))
+    assert _ids(page) == list(range(123, 128))
+    # Bisected to the checkpoint at line 120, and stopped at the first line past `until`
+    assert page["scanned"] == 9
+
+
+def test_unparseable_lines_are_returned_as_text(tmp_path, monkeypatch):
+    monkeypatch.setattr(log_reader, "line_indexes", LineIndexes(every=10))
+    path = tmp_path / "mixed.log"
+    path.write_text("plain text\n" + _line(1))
+    page = read_page(str(path), limit=10)
+    assert page["entries"][0] == "plain text"
+    assert read_page(str(path), limit=10, line_filter=LineFilter(levels={"info"}))["entries"] == [json.loads(_line(1))]
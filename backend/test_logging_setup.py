@@ -0,0 +1,44 @@
+import glob
+import logging
+import multiprocessing
+import os
+import sys
+
+import pytest
+
+from backend.utils.logging_setup import SharedRotatingFileHandler
+
+WRITERS = 4
+RECORDS = 300
+
+
+def _write(path: str, writer: int) -> None:
+    handler = SharedRotatingFileHandler(path, maxBytes=2000, backupCount=1000, encoding="utf-8")
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger = logging.getLogger(f"shared-rotation-{writer}")
+    logger.propagate = False
+    logger.addHandler(handler)
+    for i in range(RECORDS):
+        logger.warning(f"writer={writer} record={i:04d}")
+    handler.close()
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="needs fork and flock")
+def test_workers_share_rotation_without_losing_lines(tmp_path):
+    path = str(tmp_path / "app.log")
+    context = multiprocessing.get_context("fork")
+    processes = [context.Process(target=_write, args=(path, w)) for w in range(WRITERS)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(30)
+        assert process.exitcode == 0
+
+    files = [path] + glob.glob(path + ".*[0-9]")
+    lines = []
+    for name in files:
+        with open(name, encoding="utf-8") as f:
+            lines.extend(f.read().splitlines())
+        # No file grows past the limit by more than the record that triggered its rollover
+        assert os.path.getsize(name) <= 2000
+    assert sorted(lines) == sorted(f"writer={w} record={i:04d}" for w in range(WRITERS) for i in range(RECORDS))
@@ -0,0 +1,60 @@
+from backend.services.response_cache import ResponseCache
+
+
+def test_build_once_then_serve_from_memory():
+    cache = ResponseCache()
+    builds = []
+    build = lambda: builds.append(1) or b'{"n": 1}'
+
+    first = cache.get_or_build("projects", build)
+    second = cache.get_or_build("projects", build)
+    assert first is second
+    assert len(builds) == 1
+
+
+def test_invalidate_drops_the_entry():
+    cache = ResponseCache()
+    cache.get_or_build("projects", lambda: b"old")
+    cache.invalidate("projects")
+    assert cache.peek("projects") is None
+    assert cache.get_or_build("projects", lambda: b"new").body == b"new"
+
+
+def test_build_racing_an_invalidation_is_served_but_not_stored():
+    cache = ResponseCache()
+
+    def build():
+        # A commit lands while the body is being built from pre-commit rows
+        cache.invalidate("projects")
+        return b"stale"
+
+    entry = cache.get_or_build("projects", build)
+    assert entry.body == b"stale"
+    assert cache.peek("projects") is None
+    assert cache.get_or_build("projects", lambda: b"fresh").body == b"fresh"
+    assert cache.peek("projects").body == b"fresh"
+
+
+def test_invalidate_doc_types_reaches_dependent_keys_only():
+    cache = ResponseCache()
+    for key in ("projects", "stats", "portfolio", "education"):
+        cache.get_or_build(key, lambda: b"{}")
+
+    cache.invalidate_doc_types(["project"])
+    assert cache.peek("projects") is None
+    assert cache.peek("stats") is None
+    assert cache.peek("portfolio") is None
+    assert cache.peek("education") is not None
+
+
+def test_invalidate_all_covers_keys_being_built():
+    cache = ResponseCache()
+    cache.get_or_build("skills", lambda: b"{}")
+
+    def build():
+        cache.invalidate_all()
+        return b"{}"
+
+    cache.get_or_build("projects", build)
+    assert cache.peek("skills") is None
+    assert cache.peek("projects") is None
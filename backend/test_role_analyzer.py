@@ -0,0 +1,54 @@
+import pytest
+
+from backend.ai_core.components import role_analyzer
+from backend.ai_core.components.role_analyzer import analyze_user_role
+from backend.ai_core.utils import chat_metrics
+
+
+@pytest.fixture(autouse=True)
+def thresholds(monkeypatch):
+    monkeypatch.setattr(role_analyzer, "ROLE_CONFIDENCE_DECAY", 0.85)
+    monkeypatch.setattr(role_analyzer, "ROLE_RECRUITER_ENTER", 0.65)
+    monkeypatch.setattr(role_analyzer, "ROLE_RECRUITER_EXIT", 0.5)
+
+
+def _conversation(messages):
+    """Run turns through the analyzer the way the session carries them; (recruiter confidence, role) per turn."""
+    state = {"role_confidence": None, "is_recruiter": None}
+    results = []
+    for message in messages:
+        state = analyze_user_role({**state, "input": message, "keywords": None})
+        results.append((round(state["role_confidence"]["recruiter"], 3), state["is_recruiter"]))
+    return results
+
+
+def test_one_recruiter_message_is_not_enough():
+    assert _conversation(["We are hiring"]) == [(0.643, False)]
+
+
+def test_role_sticks_until_confidence_falls_below_exit():
+    results = _conversation(
+        ["We are hiring", "Recruiter here, about the job opening", "Tell me about your projects", "What is your stack?", "More projects"]
+    )
+    assert [role for _, role in results] == [False, True, True, True, False]
+    # Still a recruiter at 0.632 and 0.557, under the entry threshold but above the exit one
+    assert results[2][0] < 0.65 and results[3][0] > 0.5
+    assert results[4][0] < 0.5
+
+
+def test_old_evidence_decays_toward_neutral():
+    state = analyze_user_role(
+        {"input": "Tell me about yourself", "role_confidence": {"visitor": 0.1, "recruiter": 0.9}, "is_recruiter": True}
+    )
+    # 0.9 decays to 0.84 before this turn's visitor evidence is added
+    assert state["role_confidence"]["recruiter"] == pytest.approx(0.84 / 1.1)
+    assert state["is_recruiter"] is True
+
+
+def test_switches_are_counted_only_against_a_known_previous_role():
+    before = chat_metrics.role_switches.value(to="recruiter")
+    analyze_user_role({"input": "hiring", "role_confidence": {"visitor": 0.2, "recruiter": 0.8}, "is_recruiter": None})
+    assert chat_metrics.role_switches.value(to="recruiter") == before
+
+    analyze_user_role({"input": "hiring", "role_confidence": {"visitor": 0.2, "recruiter": 0.8}, "is_recruiter": False})
+    assert chat_metrics.role_switches.value(to="recruiter") == before + 1
@@ -0,0 +1,71 @@
+import pytest
+
+from backend.ai_core.memory import session_manager as sm
+from backend.ai_core.memory.history_store import SqliteSessionStore
+from backend.ai_core.memory.session_manager import ConversationSession, SessionManager
+
+
+def _turns(start: int, end: int):
+    return [{"user": f"q{i}", "assistant": f"a{i}"} for i in range(start, end)]
+
+
+@pytest.fixture(autouse=True)
+def window(monkeypatch):
+    monkeypatch.setattr(sm, "MAX_HISTORY_TURNS", 3)
+    monkeypatch.setattr(sm, "MAX_PENDING_TURNS", 4)
+
+
+def test_set_history_moves_evicted_turns_to_pending():
+    session = ConversationSession(session_id="s")
+    session.set_history(_turns(0, 2))
+    assert session.turns == 2 and session.pending == []
+
+    session.set_history(_turns(0, 5))
+    assert session.history == _turns(2, 5)
+    assert session.pending == _turns(0, 2)
+    assert session.turns == 5
+
+    # The next turn arrives as the kept window plus one
+    session.set_history(_turns(2, 6))
+    assert session.history == _turns(3, 6)
+    assert session.pending == _turns(0, 3)
+    assert session.turns == 6
+
+
+def test_pending_is_bounded_and_skipped_turns_count_as_covered():
+    session = ConversationSession(session_id="s")
+    session.set_history(_turns(0, 9))
+    assert session.pending == _turns(2, 6)
+    assert session.summary_turns == 2
+
+
+def test_take_summary_drops_the_turns_it_covers():
+    session = ConversationSession(session_id="s")
+    session.set_history(_turns(0, 6))
+    assert len(session.pending) == 3
+
+    session.take_summary("first two", 2)
+    assert session.summary == "first two"
+    assert session.pending == _turns(2, 3)
+
+    # An older summary never replaces a newer one
+    session.take_summary("first one", 1)
+    assert session.summary == "first two"
+    assert session.summary_turns == 2
+
+
+def test_save_keeps_a_summary_stored_meanwhile(tmp_path):
+    store = SqliteSessionStore(str(tmp_path / "sessions.db"), ttl_seconds=60)
+    first, second = SessionManager(store=store), SessionManager(store=store)
+
+    session = first.get_or_create(None, _turns(0, 5))
+    first.save(session)
+    # Another worker's summariser folds the pending turns while this turn runs
+    second.apply_summary(session.session_id, "summary", 2)
+
+    session.set_history(session.history + _turns(5, 6))
+    first.save(session)
+    stored = second.get(session.session_id)
+    assert stored.summary == "summary"
+    assert stored.pending == _turns(2, 3)
+    assert stored.history == _turns(3, 6)
@@ -0,0 +1,52 @@
+from backend.ai_core.utils.token_utils import build_history_messages, clip_to_tokens, estimate_tokens
+
+
+def _turn(i: int, size: int = 40):
+    # `size` characters per side, so each side costs size / 4 tokens
+    return {"user": f"u{i}".ljust(size, "."), "assistant": f"a{i}".ljust(size, ".")}
+
+
+def _texts(messages):
+    return [m["parts"][0][:3].rstrip(".") for m in messages]
+
+
+def test_empty_history_and_summary():
+    assert build_history_messages("", []) == []
+
+
+def test_newest_turns_that_fit_the_budget_are_kept_in_order():
+    history = [_turn(i) for i in range(6)]
+    # 20 tokens per turn: a 50-token budget keeps the last two
+    messages = build_history_messages("", history, budget=50, turn_max_tokens=100)
+    assert _texts(messages) == ["u4", "a4", "u5", "a5"]
+    assert [m["role"] for m in messages] == ["user", "model", "user", "model"]
+
+
+def test_summary_comes_first_and_uses_part_of_the_budget():
+    history = [_turn(i) for i in range(6)]
+    messages = build_history_messages("the visitor is a recruiter", history, budget=50, turn_max_tokens=100)
+    assert messages[0]["role"] == "user"
+    assert messages[0]["parts"][0].startswith("Summary of our earlier conversation: the visitor is a recruiter")
+    assert messages[1] == {"role": "model", "parts": ["Noted."]}
+    # ~15 tokens for the summary leaves room for one turn
+    assert _texts(messages[2:]) == ["u5", "a5"]
+
+
+def test_long_turns_are_clipped_not_dropped():
+    history = [{"user": "question " * 200, "assistant": "answer " * 400}]
+    messages = build_history_messages("", history, budget=400, turn_max_tokens=50)
+    assert len(messages) == 2
+    assert all(estimate_tokens(m["parts"][0]) <= 51 for m in messages)
+    assert messages[1]["parts"][0].endswith("…")
+
+
+def test_total_stays_within_budget_for_a_long_conversation():
+    history = [_turn(i, size=300) for i in range(50)]
+    summary = "s " * 1000
+    messages = build_history_messages(summary, history, budget=400, turn_max_tokens=60)
+    assert sum(estimate_tokens(m["parts"][0]) for m in messages) <= 400 + 1
+
+
+def test_clip_to_tokens_cuts_at_a_word_boundary():
+    assert clip_to_tokens("short", 10) == "short"
+    assert clip_to_tokens("alpha beta gamma delta", 3) == "alpha beta…"
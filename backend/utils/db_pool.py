@@ -0,0 +1,126 @@
+"""
+Connection-pool instrumentation and checkout policy.
+
+Instead of pre-pinging every checkout (one extra round trip to a remote
+database each time), connections are retired by age and idle time:
+  - pool_recycle closes connections older than DB_POOL_RECYCLE_SECONDS
+  - a connection idle longer than DB_POOL_MAX_IDLE_SECONDS is discarded at
+    checkout, before the pooler's idle timeout can cut it
+  - a disconnect error on a live connection invalidates it and every older
+    connection in the pool (SQLAlchemy's default), and is counted here
+
+Metrics (label `pool` = "sync" or "async"): checkout wait histogram, in-use and
+overflow gauges, invalidations by reason, checkout timeouts.
+"""
+import logging
+import time
+from typing import Dict
+
+from sqlalchemy import event, exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from backend.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+_checkout_wait = metrics.histogram(
+    "db_pool_checkout_wait_seconds", "Time to obtain a usable connection from the pool (includes connects)"
+)
+_in_use = metrics.gauge("db_pool_in_use", "Connections checked out of the pool")
+_overflow = metrics.gauge("db_pool_overflow", "Checked-out connections beyond pool_size")
+_opened = metrics.counter("db_pool_connections_opened_total", "New DBAPI connections opened by the pool")
+_invalidations = metrics.counter("db_pool_invalidations_total", "Connections invalidated, by reason")
+_timeouts = metrics.counter("db_pool_checkout_timeouts_total", "Checkouts that gave up waiting for a connection")
+_disconnects = metrics.counter("db_disconnects_total", "Statements that failed because the connection was gone")
+
+
+class _TimedCheckout:
+    """Times Pool.connect(): queue wait, any new connection, and checkout-event retries."""
+
+    metrics_label = "sync"
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            _timeouts.inc(pool=self.metrics_label)
+            raise
+        finally:
+            _checkout_wait.observe(time.perf_counter() - start, pool=self.metrics_label)
+
+
+class InstrumentedQueuePool(_TimedCheckout, QueuePool):
+    metrics_label = "sync"
+
+
+class InstrumentedAsyncQueuePool(_TimedCheckout, AsyncAdaptedQueuePool):
+    metrics_label = "async"
+
+
+class _IdleConnection(exc.DisconnectionError):
+    """Raised from the checkout event to retire a connection that sat idle too long."""
+
+
+def _track_checkout(pool, label: str, delta: int) -> None:
+    # Counted from the events: during "checkin" the pool still reports the connection as out
+    _in_use.inc(delta, pool=label)
+    if isinstance(pool, QueuePool):
+        _overflow.set(max(0.0, _in_use.value(pool=label) - pool.size()), pool=label)
+
+
+def instrument(engine, max_idle_seconds: float = 0) -> None:
+    """Attach the checkout policy and metrics to a (sync) Engine built with an Instrumented* pool."""
+    pool = engine.pool
+    label = getattr(pool, "metrics_label", "sync")
+
+    @event.listens_for(pool, "connect")
+    def _on_connect(dbapi_connection, record):
+        _opened.inc(pool=label)
+
+    @event.listens_for(pool, "checkout")
+    def _on_checkout(dbapi_connection, record, proxy):
+        checked_in_at = record.info.pop("checked_in_at", None)
+        if max_idle_seconds and checked_in_at is not None and time.monotonic() - checked_in_at > max_idle_seconds:
+            # The pool invalidates this one and retries with a fresh connection
+            raise _IdleConnection("connection idle past DB_POOL_MAX_IDLE_SECONDS")
+        _track_checkout(pool, label, 1)
+
+    @event.listens_for(pool, "checkin")
+    def _on_checkin(dbapi_connection, record):
+        record.info["checked_in_at"] = time.monotonic()
+        _track_checkout(pool, label, -1)
+
+    @event.listens_for(pool, "invalidate")
+    def _on_invalidate(dbapi_connection, record, exception):
+        if isinstance(exception, _IdleConnection):
+            reason = "idle"
+        else:
+            reason = "error" if exception is not None else "explicit"
+        _invalidations.inc(pool=label, reason=reason)
+
+    @event.listens_for(pool, "soft_invalidate")
+    def _on_soft_invalidate(dbapi_connection, record, exception):
+        _invalidations.inc(pool=label, reason="soft")
+
+    @event.listens_for(engine, "handle_error")
+    def _on_error(context):
+        if context.is_disconnect:
+            _disconnects.inc(pool=label)
+            logger.warning(f"Database connection lost ({label} pool); invalidating pooled connections")
+
+
+def pool_status(engine) -> Dict[str, object]:
+    pool = engine.pool
+    status: Dict[str, object] = {"class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        status.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=max(0, pool.overflow()),
+            max_overflow=pool._max_overflow,
+            timeout=pool.timeout(),
+            recycle=pool._recycle,
+        )
+    return status
@@ -0,0 +1,186 @@
+"""
+Minimal file watching: Linux inotify through ctypes, with an mtime-polling fallback.
+
+Directories are watched rather than files, because editors and deploy tools
+usually replace a file via rename, which would orphan a per-file watch.
+"""
+import ctypes
+import ctypes.util
+import errno
+import logging
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+DEFAULT_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+
+_EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, len
+
+_libc = None
+
+
+def _load_libc():
+    global _libc
+    if _libc is None and sys.platform.startswith("linux"):
+        try:
+            lib = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+            lib.inotify_init1.argtypes = [ctypes.c_int]
+            lib.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+            _libc = lib
+        except (OSError, AttributeError):
+            _libc = False
+    return _libc or None
+
+
+def inotify_available() -> bool:
+    return _load_libc() is not None
+
+
+class InotifyWatcher:
+    """Non-blocking inotify fd over a set of directories; usable with select() or loop.add_reader()."""
+
+    def __init__(self, directories: Iterable[str], mask: int = DEFAULT_MASK):
+        libc = _load_libc()
+        if libc is None:
+            raise OSError("inotify is not available on this platform")
+        self._fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._dirs: Dict[int, str] = {}
+        for directory in directories:
+            wd = libc.inotify_add_watch(self._fd, os.fsencode(directory), mask)
+            if wd < 0:
+                err = ctypes.get_errno()
+                os.close(self._fd)
+                raise OSError(err, f"inotify_add_watch failed for {directory}")
+            self._dirs[wd] = directory
+
+    def fileno(self) -> int:
+        return self._fd
+
+    def read_events(self) -> List[Tuple[str, int]]:
+        """Drain pending events as (path, mask) pairs; empty if nothing is pending."""
+        events: List[Tuple[str, int]] = []
+        while True:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            except OSError as e:
+                if e.errno == errno.EAGAIN:
+                    break
+                raise
+            if not data:
+                break
+            offset = 0
+            while offset + _EVENT_HEADER.size <= len(data):
+                wd, mask, _cookie, name_len = _EVENT_HEADER.unpack_from(data, offset)
+                offset += _EVENT_HEADER.size
+                name = data[offset:offset + name_len].rstrip(b"\0").decode("utf-8", "replace")
+                offset += name_len
+                directory = self._dirs.get(wd)
+                if directory is not None:
+                    events.append((os.path.join(directory, name) if name else directory, mask))
+        return events
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+class PollingWatcher:
+    """Reports files whose (size, mtime) changed, appeared or disappeared since the last check."""
+
+    def __init__(self, paths: Iterable[str]):
+        self._paths = list(paths)
+        self._snapshot = self._stat_all()
+
+    def _stat_all(self) -> Dict[str, Optional[Tuple[int, int]]]:
+        result: Dict[str, Optional[Tuple[int, int]]] = {}
+        for path in self._paths:
+            try:
+                stat = os.stat(path)
+                result[path] = (stat.st_size, stat.st_mtime_ns)
+            except FileNotFoundError:
+                result[path] = None
+        return result
+
+    def changed(self) -> Set[str]:
+        current = self._stat_all()
+        changed = {path for path, sig in current.items() if self._snapshot.get(path) != sig}
+        self._snapshot = current
+        return changed
+
+
+def watch_files(
+    paths: Iterable[str],
+    on_change: Callable[[Set[str]], None],
+    stop_event: threading.Event,
+    mode: str = "auto",
+    poll_interval: float = 2.0,
+    debounce: float = 0.5,
+) -> None:
+    """
+    Blocking watch loop (run it on a thread). Calls on_change with the set of
+    changed paths, debounced so a burst of writes to one file triggers one call.
+    mode: "inotify", "poll" or "auto" (inotify when available, else polling).
+    """
+    paths = [os.path.abspath(p) for p in paths]
+    wanted = set(paths)
+    use_inotify = mode == "inotify" or (mode == "auto" and inotify_available())
+
+    watcher: Optional[InotifyWatcher] = None
+    if use_inotify:
+        try:
+            watcher = InotifyWatcher(sorted({os.path.dirname(p) for p in paths}))
+        except OSError as e:
+            logger.warning(f"inotify unavailable ({e}); falling back to polling")
+
+    if watcher is None:
+        poller = PollingWatcher(paths)
+        while not stop_event.wait(poll_interval):
+            changed = poller.changed()
+            if changed:
+                _safe_call(on_change, changed)
+        return
+
+    try:
+        while not stop_event.is_set():
+            ready, _, _ = select.select([watcher], [], [], 1.0)
+            if not ready:
+                continue
+            changed = {path for path, _ in watcher.read_events() if path in wanted}
+            # Debounce: keep collecting until the directory is quiet
+            deadline = time.monotonic() + debounce
+            while time.monotonic() < deadline and not stop_event.is_set():
+                ready, _, _ = select.select([watcher], [], [], max(0.0, deadline - time.monotonic()))
+                if ready:
+                    changed |= {path for path, _ in watcher.read_events() if path in wanted}
+                    deadline = time.monotonic() + debounce
+            if changed:
+                _safe_call(on_change, changed)
+    finally:
+        watcher.close()
+
+
+def _safe_call(callback: Callable[[Set[str]], None], changed: Set[str]) -> None:
+    try:
+        callback(changed)
+    except Exception as e:
+        logger.error(f"File watch callback failed for {sorted(changed)}: {e}", exc_info=True)
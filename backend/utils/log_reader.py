@@ -0,0 +1,353 @@
+"""
+Seekable reads of the JSON log files behind /admin/logs/{filename}.
+
+A sparse line index records the byte offset of every LOG_INDEX_EVERY-th line.
+It is persisted next to the log as <file>.lineidx and extended from where it
+stopped as the file grows, so a page at line `offset` costs one seek plus at
+most LOG_INDEX_EVERY skipped lines instead of a scan from line 0. An index
+whose inode, size or leading bytes no longer match the file (rotation,
+truncation) is rebuilt.
+
+Tail paging (the last `limit` lines, skipping `offset` from the end) reads
+fixed-size blocks backwards from EOF and never touches the rest of the file.
+
+Level and time filters run on the server over at most LOG_SCAN_MAX_LINES lines
+per page; `next_offset` continues the scan. In head mode a `since` bound starts
+at the checkpoint found by bisecting the index on checkpoint timestamps (the
+files are written by one thread, so they are in time order).
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from typing import BinaryIO, Dict, Iterator, List, Optional, Set, Tuple
+
+from backend.config import LOG_INDEX_EVERY, LOG_SCAN_MAX_LINES
+
+logger = logging.getLogger(__name__)
+
+INDEX_SUFFIX = ".lineidx"
+BLOCK_SIZE = 64 * 1024
+# Leading bytes hashed to recognise the same file after a restart
+HEAD_BYTES = 256
+INDEX_VERSION = 1
+
+
+@dataclass
+class LineIndex:
+    every: int
+    inode: int = 0
+    head_len: int = 0
+    head: str = ""
+    # Bytes covered: just past the last complete line seen, and the lines before it
+    end: int = 0
+    lines: int = 0
+    # offsets[k] is where line k * every starts
+    offsets: List[int] = field(default_factory=lambda: [0])
+
+
+def index_path(path: str) -> str:
+    return path + INDEX_SUFFIX
+
+
+def is_index_file(filename: str) -> bool:
+    return filename.endswith(INDEX_SUFFIX)
+
+
+def _head_digest(f: BinaryIO, length: int) -> str:
+    f.seek(0)
+    return hashlib.sha1(f.read(length)).hexdigest()
+
+
+def _load(path: str, every: int) -> Optional[LineIndex]:
+    try:
+        with open(index_path(path), "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.pop("version", None) != INDEX_VERSION or data.get("every") != every:
+            return None
+        return LineIndex(**data)
+    except (OSError, ValueError, TypeError):
+        return None
+
+
+def _save(path: str, index: LineIndex) -> None:
+    target = index_path(path)
+    tmp = f"{target}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": INDEX_VERSION, **asdict(index)}, f, separators=(",", ":"))
+        os.replace(tmp, target)
+    except OSError as e:
+        # Read-only log directory: the in-memory index still works
+        logger.debug(f"Could not persist line index for {path}: {e}")
+
+
+def _extend(f: BinaryIO, index: LineIndex) -> None:
+    """Count newlines from index.end to EOF, recording a checkpoint every `every` lines."""
+    every = index.every
+    base = index.end
+    f.seek(base)
+    while True:
+        block = f.read(BLOCK_SIZE)
+        if not block:
+            break
+        pos = 0
+        while True:
+            need = every - index.lines % every
+            found = block.count(b"\n", pos)
+            if found < need:
+                index.lines += found
+                break
+            for _ in range(need):
+                pos = block.index(b"\n", pos) + 1
+            index.lines += need
+            index.offsets.append(base + pos)
+        last = block.rfind(b"\n")
+        if last != -1:
+            index.end = base + last + 1
+        base += len(block)
+
+
+class LineIndexes:
+    """Per-file indexes, cached in memory and refreshed against the file on every use."""
+
+    def __init__(self, every: int = LOG_INDEX_EVERY):
+        self.every = max(1, every)
+        self._lock = threading.Lock()
+        self._indexes: Dict[str, LineIndex] = {}
+        self._file_locks: Dict[str, threading.Lock] = {}
+
+    def _file_lock(self, path: str) -> threading.Lock:
+        with self._lock:
+            return self._file_locks.setdefault(path, threading.Lock())
+
+    def _valid(self, f: BinaryIO, index: LineIndex, st: os.stat_result) -> bool:
+        return (
+            index.inode == st.st_ino
+            and st.st_size >= index.end
+            and _head_digest(f, index.head_len) == index.head
+        )
+
+    def get(self, path: str, f: BinaryIO) -> LineIndex:
+        """The index for `path` (open as `f`), extended to the current end of the file."""
+        with self._file_lock(path):
+            st = os.fstat(f.fileno())
+            index = self._indexes.get(path) or _load(path, self.every)
+            if index is None or not self._valid(f, index, st):
+                index = LineIndex(every=self.every, inode=st.st_ino)
+            checkpoints = len(index.offsets)
+            rebuilt = index.end == 0
+            if st.st_size > index.end:
+                _extend(f, index)
+                if index.head_len < HEAD_BYTES:
+                    index.head_len = min(HEAD_BYTES, index.end)
+                    index.head = _head_digest(f, index.head_len)
+            # Persist when a checkpoint was added; the tail since then is cheap to recount
+            if len(index.offsets) != checkpoints or (rebuilt and index.end):
+                _save(path, index)
+            self._indexes[path] = index
+            return index
+
+
+line_indexes = LineIndexes()
+
+
+# -- entries and filters -----------------------------------------------------
+
+
+def _utc(value: datetime) -> datetime:
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+
+def _entry_time(entry: Dict) -> Optional[datetime]:
+    value = entry.get("timestamp")
+    if not isinstance(value, str):
+        return None
+    try:
+        return _utc(datetime.fromisoformat(value))
+    except ValueError:
+        return None
+
+
+def _parse(raw: bytes):
+    text = raw.decode("utf-8", errors="replace").rstrip("\r\n")
+    try:
+        entry = json.loads(text)
+    except ValueError:
+        return text
+    return entry if isinstance(entry, dict) else text
+
+
+def entry_level(entry) -> str:
+    if not isinstance(entry, dict):
+        return "parsing_errors"
+    return str(entry.get("level") or entry.get("log_level") or "unknown").lower()
+
+
+class LineFilter:
+    """Server-side level / time-range filter; unparseable lines only pass when no filter is set."""
+
+    def __init__(self, levels: Optional[Set[str]] = None, since: Optional[datetime] = None, until: Optional[datetime] = None):
+        self.levels = {level.lower() for level in levels} if levels else None
+        self.since = _utc(since) if since else None
+        self.until = _utc(until) if until else None
+
+    @property
+    def active(self) -> bool:
+        return bool(self.levels or self.since or self.until)
+
+    def time_of(self, entry) -> Optional[datetime]:
+        return _entry_time(entry) if isinstance(entry, dict) else None
+
+    def matches(self, entry) -> bool:
+        if not self.active:
+            return True
+        if not isinstance(entry, dict):
+            return False
+        if self.levels and entry_level(entry) not in self.levels:
+            return False
+        if self.since or self.until:
+            ts = _entry_time(entry)
+            if ts is None or (self.since and ts < self.since) or (self.until and ts >= self.until):
+                return False
+        return True
+
+
+# -- readers -----------------------------------------------------------------
+
+
+def _checkpoint_time(f: BinaryIO, offset: int) -> Optional[datetime]:
+    f.seek(offset)
+    for _ in range(8):
+        raw = f.readline()
+        if not raw.endswith(b"\n"):
+            return None
+        entry = _parse(raw)
+        ts = _entry_time(entry) if isinstance(entry, dict) else None
+        if ts is not None:
+            return ts
+    return None
+
+
+def _first_line_since(f: BinaryIO, index: LineIndex, since: datetime) -> int:
+    """Line to start from so nothing at or after `since` is skipped: the checkpoint before the first one >= since."""
+    lo, hi = 0, len(index.offsets)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        ts = _checkpoint_time(f, index.offsets[mid])
+        # Unknown times count as "late enough", which only makes the scan start earlier
+        if ts is None or ts >= since:
+            hi = mid
+        else:
+            lo = mid + 1
+    return max(0, lo - 1) * index.every
+
+
+def _forward(f: BinaryIO, index: LineIndex, start: int) -> Iterator[Tuple[int, bytes]]:
+    """(line number, raw line) from line `start` onwards, complete lines only."""
+    k = min(start // index.every, len(index.offsets) - 1)
+    f.seek(index.offsets[k])
+    line_no = k * index.every
+    for raw in f:
+        if not raw.endswith(b"\n"):
+            return  # still being written
+        if line_no >= start:
+            yield line_no, raw
+        line_no += 1
+
+
+def _last_newline(f: BinaryIO) -> int:
+    """Offset of the file's final newline, or -1; anything after it is a partial line."""
+    pos = f.seek(0, os.SEEK_END)
+    while pos > 0:
+        size = min(BLOCK_SIZE, pos)
+        pos -= size
+        f.seek(pos)
+        found = f.read(size).rfind(b"\n")
+        if found != -1:
+            return pos + found
+    return -1
+
+
+def _reverse(f: BinaryIO) -> Iterator[bytes]:
+    """Complete lines from last to first, reading BLOCK_SIZE blocks backwards."""
+    pos = _last_newline(f)
+    if pos < 0:
+        return
+    buffer = b""
+    while pos > 0:
+        size = min(BLOCK_SIZE, pos)
+        pos -= size
+        f.seek(pos)
+        parts = (f.read(size) + buffer).split(b"\n")
+        buffer = parts[0]
+        for part in reversed(parts[1:]):
+            yield part + b"\n"
+    yield buffer + b"\n"
+
+
+def read_page(
+    path: str,
+    limit: int,
+    offset: int = 0,
+    tail: bool = False,
+    line_filter: Optional[LineFilter] = None,
+    max_scan: int = LOG_SCAN_MAX_LINES,
+) -> Dict[str, object]:
+    """
+    Up to `limit` matching entries in file order.
+
+    Head mode: `offset` is a line number from the start. Tail mode: `offset`
+    lines are skipped from the end. `next_offset` (None at the end) continues
+    in the same mode; with filters a page may stop early after `max_scan` lines.
+    """
+    line_filter = line_filter or LineFilter()
+    entries: List[object] = []
+    scanned = 0
+    next_offset: Optional[int] = None
+
+    with open(path, "rb") as f:
+        if tail:
+            skipped = 0
+            exhausted = True
+            for raw in _reverse(f):
+                if skipped < offset:
+                    skipped += 1
+                    continue
+                if len(entries) >= limit or scanned >= max_scan:
+                    exhausted = False
+                    break
+                scanned += 1
+                entry = _parse(raw)
+                if line_filter.matches(entry):
+                    entries.append(entry)
+                elif line_filter.since:
+                    ts = line_filter.time_of(entry)
+                    if ts is not None and ts < line_filter.since:
+                        break  # everything earlier is older still
+            entries.reverse()
+            if not exhausted:
+                next_offset = offset + scanned
+            return {"entries": entries, "next_offset": next_offset, "total_lines": None, "scanned": scanned}
+
+        index = line_indexes.get(path, f)
+        start = offset
+        if line_filter.since and offset < index.lines:
+            start = max(offset, _first_line_since(f, index, line_filter.since))
+        line_no = start
+        for line_no, raw in _forward(f, index, start):
+            if len(entries) >= limit or scanned >= max_scan:
+                next_offset = line_no
+                break
+            scanned += 1
+            entry = _parse(raw)
+            if line_filter.matches(entry):
+                entries.append(entry)
+            elif line_filter.until:
+                ts = line_filter.time_of(entry)
+                if ts is not None and ts >= line_filter.until:
+                    break
+        return {"entries": entries, "next_offset": next_offset, "total_lines": index.lines, "scanned": scanned}
@@ -0,0 +1,246 @@
+"""
+Shared tailers behind the admin log-stream WebSocket.
+
+One tailer per file, however many admins are watching it. It is woken by
+inotify on the log directory (registered on the event loop with add_reader),
+or every LOG_STREAM_POLL_SECONDS when inotify is unavailable, waits a short
+batch window, then reads all new bytes in blocks in a worker thread, so no
+file I/O runs on the loop. Complete lines are broadcast as one batch.
+
+Each subscriber has its own bounded line buffer and filters (levels, keyword).
+The tailer never waits for a client: when a slow client's buffer is full the
+oldest lines are dropped, and the client gets one notice line with the count
+before its next batch.
+
+Rotation (the path now names a new inode) is followed after the old file is
+read to its end; truncation restarts from offset 0.
+"""
+import asyncio
+import json
+import logging
+import os
+from collections import deque
+from typing import Deque, Dict, List, Optional, Set
+
+from backend.config import LOG_STREAM_CLIENT_BUFFER, LOG_STREAM_POLL_SECONDS, LOG_STREAM_WATCH_MODE
+from backend.utils.file_watch import IN_CREATE, IN_MODIFY, IN_MOVED_TO, InotifyWatcher, inotify_available
+from backend.utils.log_reader import entry_level
+from backend.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+READ_BLOCK = 256 * 1024
+# Lets a burst of writes arrive before reading, so clients get fewer, larger frames
+BATCH_WINDOW_SECONDS = 0.1
+# With inotify, a periodic re-check still catches anything an event missed
+INOTIFY_RECHECK_SECONDS = 30.0
+
+_tailers = metrics.gauge("log_stream_tailers", "Log files with a running shared tailer")
+_subscribers = metrics.gauge("log_stream_subscribers", "Connected log-stream clients")
+_lines_read = metrics.counter("log_stream_lines_read_total", "Lines read by the shared log tailers")
+_lines_dropped = metrics.counter("log_stream_lines_dropped_total", "Lines dropped for log-stream clients that fell behind")
+
+
+def _level(line: str) -> str:
+    try:
+        return entry_level(json.loads(line))
+    except ValueError:
+        return "parsing_errors"
+
+
+class Subscriber:
+    def __init__(self, levels: Optional[Set[str]] = None, keyword: Optional[str] = None, buffer_lines: int = LOG_STREAM_CLIENT_BUFFER):
+        self.levels = {level.lower() for level in levels} if levels else None
+        self.keyword = keyword.lower() if keyword else None
+        self._lines: Deque[str] = deque(maxlen=max(1, buffer_lines))
+        self._ready = asyncio.Event()
+        self._dropped = 0
+
+    def wants(self, line: str, level: Optional[str]) -> bool:
+        if self.keyword and self.keyword not in line.lower():
+            return False
+        return not self.levels or level in self.levels
+
+    def offer(self, lines: List[str]) -> None:
+        overflow = len(self._lines) + len(lines) - self._lines.maxlen
+        if overflow > 0:
+            self._dropped += overflow
+            _lines_dropped.inc(overflow)
+        self._lines.extend(lines)  # a full deque discards from the left
+        self._ready.set()
+
+    async def next_batch(self) -> str:
+        """Wait for lines and return them as one text frame, led by a notice if any were dropped."""
+        await self._ready.wait()
+        self._ready.clear()
+        lines = list(self._lines)
+        self._lines.clear()
+        if self._dropped:
+            notice = {"event": "Log stream fell behind; older lines dropped", "dropped": self._dropped, "level": "warning"}
+            lines.insert(0, json.dumps(notice) + "\n")
+            self._dropped = 0
+        return "".join(lines)
+
+
+class LogTailer:
+    def __init__(self, path: str, mode: str = LOG_STREAM_WATCH_MODE, poll_seconds: float = LOG_STREAM_POLL_SECONDS):
+        self.path = os.path.abspath(path)
+        self.mode = mode
+        self.poll_seconds = poll_seconds
+        self.subscribers: Set[Subscriber] = set()
+        self._task: Optional[asyncio.Task] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._file = None
+        self._inode = None
+        self._partial = b""
+
+    # -- file side (worker thread) --------------------------------------------
+
+    def _open(self, at_end: bool) -> None:
+        self._close()
+        try:
+            self._file = open(self.path, "rb")
+        except FileNotFoundError:
+            return  # rotated away and not recreated yet
+        self._inode = os.fstat(self._file.fileno()).st_ino
+        self._partial = b""
+        if at_end:
+            self._file.seek(0, os.SEEK_END)
+
+    def _close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _drain(self) -> List[bytes]:
+        chunks = []
+        while True:
+            block = self._file.read(READ_BLOCK)
+            if not block:
+                break
+            chunks.append(block)
+        if not chunks:
+            return []
+        parts = (self._partial + b"".join(chunks)).split(b"\n")
+        self._partial = parts.pop()
+        return [part + b"\n" for part in parts]
+
+    def _read_new(self) -> List[str]:
+        raw: List[bytes] = []
+        if self._file is None:
+            self._open(at_end=False)
+        if self._file is not None:
+            raw.extend(self._drain())
+            try:
+                st = os.stat(self.path)
+            except FileNotFoundError:
+                st = None
+            if st is not None and st.st_ino != self._inode:
+                # Rotated: the old file has been read to its end, follow the new one from the start
+                self._open(at_end=False)
+                if self._file is not None:
+                    raw.extend(self._drain())
+            elif st is not None and st.st_size < self._file.tell():
+                self._file.seek(0)
+                self._partial = b""
+                raw.extend(self._drain())
+        return [line.decode("utf-8", errors="replace") for line in raw]
+
+    # -- loop side -------------------------------------------------------------
+
+    def _watch(self, loop: asyncio.AbstractEventLoop) -> Optional[InotifyWatcher]:
+        if self.mode == "poll" or (self.mode == "auto" and not inotify_available()):
+            return None
+        try:
+            watcher = InotifyWatcher([os.path.dirname(self.path)], IN_MODIFY | IN_CREATE | IN_MOVED_TO)
+        except OSError as e:
+            logger.warning(f"inotify unavailable for log streaming ({e}); polling every {self.poll_seconds}s")
+            return None
+        loop.add_reader(watcher.fileno(), self._on_events, watcher)
+        return watcher
+
+    def _on_events(self, watcher: InotifyWatcher) -> None:
+        if any(path == self.path for path, _ in watcher.read_events()):
+            self._wake.set()
+
+    def start(self) -> None:
+        self._wake = asyncio.Event()
+        self._task = asyncio.get_running_loop().create_task(self._run(), name=f"log-tailer:{os.path.basename(self.path)}")
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        watcher = self._watch(loop)
+        interval = INOTIFY_RECHECK_SECONDS if watcher is not None else self.poll_seconds
+        try:
+            await asyncio.to_thread(self._open, True)
+            while True:
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=interval)
+                    await asyncio.sleep(BATCH_WINDOW_SECONDS)
+                except asyncio.TimeoutError:
+                    pass
+                self._wake.clear()
+                try:
+                    lines = await asyncio.to_thread(self._read_new)
+                except OSError as e:
+                    logger.warning(f"Log tailer for {self.path} failed to read: {e}")
+                    continue
+                if lines:
+                    _lines_read.inc(len(lines))
+                    self._broadcast(lines)
+        finally:
+            if watcher is not None:
+                loop.remove_reader(watcher.fileno())
+                watcher.close()
+            self._close()
+
+    def _broadcast(self, lines: List[str]) -> None:
+        levels: Optional[List[str]] = None
+        for subscriber in list(self.subscribers):
+            if subscriber.levels and levels is None:
+                levels = [_level(line) for line in lines]  # parsed once per batch, shared by subscribers
+            selected = [
+                line for i, line in enumerate(lines)
+                if subscriber.wants(line, levels[i] if levels is not None else None)
+            ]
+            if selected:
+                subscriber.offer(selected)
+
+
+class LogTailers:
+    """Tailers by path, started with their first subscriber and stopped with their last (event-loop only)."""
+
+    def __init__(self):
+        self._tailers: Dict[str, LogTailer] = {}
+
+    def subscribe(self, path: str, levels: Optional[Set[str]] = None, keyword: Optional[str] = None) -> Subscriber:
+        path = os.path.abspath(path)
+        tailer = self._tailers.get(path)
+        if tailer is None:
+            tailer = self._tailers[path] = LogTailer(path)
+            tailer.start()
+            _tailers.set(len(self._tailers))
+        subscriber = Subscriber(levels, keyword)
+        tailer.subscribers.add(subscriber)
+        _subscribers.inc()
+        return subscriber
+
+    def unsubscribe(self, path: str, subscriber: Subscriber) -> None:
+        path = os.path.abspath(path)
+        tailer = self._tailers.get(path)
+        if tailer is None or subscriber not in tailer.subscribers:
+            return
+        tailer.subscribers.discard(subscriber)
+        _subscribers.dec()
+        if not tailer.subscribers:
+            tailer.stop()
+            del self._tailers[path]
+            _tailers.set(len(self._tailers))
+
+
+log_tailers = LogTailers()
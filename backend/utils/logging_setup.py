@@ -0,0 +1,186 @@
+"""
+Non-blocking logging pipeline.
+
+Request threads only build a record and put it on a bounded queue; a single
+QueueListener thread renders it (structlog JSON / console) and writes every
+sink: the console, logs/app.log and the per-component files. Rendering and
+disk I/O therefore never run on the request path.
+
+When the queue is full, records below WARNING are dropped at once and
+WARNING+ records wait up to BLOCK_SECONDS for space before being dropped.
+Drops are counted in log_records_dropped_total.
+
+Files rotate by size (LOG_MAX_BYTES x LOG_BACKUP_COUNT), or by time when
+LOG_ROTATE_WHEN is set. Every gunicorn worker appends to the same files, so
+each write and rotation holds an flock on <file>.lock; a worker whose file was
+rotated by another one reopens the path instead of writing to the backup.
+"""
+import atexit
+import logging
+import os
+import queue
+import time
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler, TimedRotatingFileHandler
+from typing import Dict, Optional
+
+import structlog
+
+from backend.config import LOG_BACKUP_COUNT, LOG_LEVEL, LOG_MAX_BYTES, LOG_QUEUE_SIZE, LOG_ROTATE_WHEN, LOGS_DIR
+from backend.utils.metrics import metrics
+from backend.utils.shared_files import InterProcessLock, is_current
+
+BLOCK_SECONDS = 0.05
+
+# Component log files -> logger name (the file also gets that logger's children)
+COMPONENT_LOGS: Dict[str, str] = {
+    "chat": "backend.api.endpoints.chat",
+    "faiss": "backend.vector_db.faiss_manager",
+    "nodes": "backend.ai_core.agent.nodes",
+    "embeddings": "backend.ai_core.knowledge.embeddings",
+}
+
+_dropped = metrics.counter("log_records_dropped_total", "Log records dropped because the log queue was full")
+_queue_depth = metrics.gauge("log_queue_depth", "Log records waiting for the writer thread")
+
+_listener: Optional[QueueListener] = None
+_queue: Optional[queue.Queue] = None
+
+SHARED_PROCESSORS = [
+    structlog.stdlib.add_logger_name,
+    structlog.stdlib.add_log_level,
+    structlog.processors.TimeStamper(fmt="iso"),
+]
+
+
+class DroppingQueueHandler(QueueHandler):
+    """QueueHandler with a drop policy; formatting is left to the listener thread."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The default prepare() formats here, on the caller's thread
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+            return
+        except queue.Full:
+            pass
+        if record.levelno >= logging.WARNING:
+            try:
+                self.queue.put(record, timeout=BLOCK_SECONDS)
+                return
+            except queue.Full:
+                pass
+        _dropped.inc(level=record.levelname.lower())
+
+
+class _Listener(QueueListener):
+    def enqueue_sentinel(self) -> None:
+        # The queue may be full at shutdown; wait for the writer to make room
+        self.queue.put(self._sentinel)
+
+
+def _renderer():
+    if os.getenv("ENV") == "development":
+        return structlog.dev.ConsoleRenderer()
+    return structlog.processors.JSONRenderer()
+
+
+class _SharedRotationMixin:
+    """Write and rotate under an inter-process lock; reopen when another worker rotated the file."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._process_lock = InterProcessLock(self.baseFilename)
+
+    def _rotated_elsewhere(self) -> None:
+        pass
+
+    def emit(self, record: logging.LogRecord) -> None:
+        # Called with the handler lock held, so this process's threads are already serialised
+        try:
+            with self._process_lock:
+                if self.stream is not None and not is_current(self.stream, self.baseFilename):
+                    self.stream.close()
+                    self.stream = None
+                    self._rotated_elsewhere()
+                super().emit(record)
+        except Exception:
+            self.handleError(record)
+
+    def close(self) -> None:
+        super().close()
+        self._process_lock.close()
+
+
+class SharedRotatingFileHandler(_SharedRotationMixin, RotatingFileHandler):
+    pass
+
+
+class SharedTimedRotatingFileHandler(_SharedRotationMixin, TimedRotatingFileHandler):
+    def _rotated_elsewhere(self) -> None:
+        # The current period's rollover already happened in another worker
+        self.rolloverAt = self.computeRollover(int(time.time()))
+
+
+def _file_handler(path: str) -> logging.Handler:
+    if LOG_ROTATE_WHEN:
+        return SharedTimedRotatingFileHandler(
+            path, when=LOG_ROTATE_WHEN, backupCount=LOG_BACKUP_COUNT, encoding="utf-8"
+        )
+    return SharedRotatingFileHandler(path, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT, encoding="utf-8")
+
+
+def configure_logging(logs_dir: str = LOGS_DIR) -> None:
+    """Install the queue handler on the root logger and start the writer thread (idempotent)."""
+    global _listener, _queue
+    if _listener is not None:
+        return
+    os.makedirs(logs_dir, exist_ok=True)
+
+    structlog.configure(
+        processors=[structlog.stdlib.filter_by_level]
+        + SHARED_PROCESSORS
+        + [structlog.stdlib.ProcessorFormatter.wrap_for_formatter],
+        logger_factory=structlog.stdlib.LoggerFactory(),
+        wrapper_class=structlog.stdlib.BoundLogger,
+        cache_logger_on_first_use=True,
+    )
+    formatter = structlog.stdlib.ProcessorFormatter(
+        processor=_renderer(),
+        # stdlib loggers pass structured fields through `extra=`
+        foreign_pre_chain=SHARED_PROCESSORS + [structlog.stdlib.ExtraAdder()],
+    )
+
+    sinks = [logging.StreamHandler(), _file_handler(os.path.join(logs_dir, "app.log"))]
+    for name, logger_name in COMPONENT_LOGS.items():
+        handler = _file_handler(os.path.join(logs_dir, f"{name}.log"))
+        handler.addFilter(logging.Filter(logger_name))
+        sinks.append(handler)
+    for handler in sinks:
+        handler.setFormatter(formatter)
+
+    _queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(DroppingQueueHandler(_queue))
+    root.setLevel(LOG_LEVEL)
+
+    # Uvicorn's own handlers would write synchronously; route through the root instead
+    for name in ("uvicorn", "uvicorn.access", "uvicorn.error"):
+        logging.getLogger(name).handlers = []
+        logging.getLogger(name).propagate = True
+
+    _listener = _Listener(_queue, *sinks, respect_handler_level=True)
+    _listener.start()
+    metrics.add_collector(lambda: _queue_depth.set(_queue.qsize() if _queue is not None else 0))
+    atexit.register(stop_logging)
+
+
+def stop_logging() -> None:
+    """Flush queued records and stop the writer thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
@@ -0,0 +1,243 @@
+"""
+In-process metrics registry (counters, gauges and histograms with optional labels).
+
+Values live in this worker's memory; each worker reports its own numbers.
+render_prometheus() produces the Prometheus text exposition format for /api/metrics.
+"""
+import bisect
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, object]) -> LabelKey:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, description: str = ""):
+        self.name = name
+        self.description = description
+        self._lock = threading.Lock()
+        self._values: Dict[LabelKey, float] = {}
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(_label_key(labels), 0.0)
+
+    def samples(self) -> List[Tuple[Dict[str, str], float]]:
+        with self._lock:
+            return [(dict(key), value) for key, value in self._values.items()]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def set(self, value: float, **labels) -> None:
+        with self._lock:
+            self._values[_label_key(labels)] = float(value)
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels) -> None:
+        self.inc(-amount, **labels)
+
+
+# Latency buckets in seconds, from sub-millisecond pool checkouts to slow LLM calls
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+)
+
+
+class _HistogramValue:
+    __slots__ = ("bucket_counts", "sum", "count")
+
+    def __init__(self, size: int):
+        self.bucket_counts = [0] * size
+        self.sum = 0.0
+        self.count = 0
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, description: str = "", buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, description)
+        self.buckets: Tuple[float, ...] = tuple(sorted(buckets))
+        self._histograms: Dict[LabelKey, _HistogramValue] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = _label_key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            hist = self._histograms.get(key)
+            if hist is None:
+                hist = self._histograms[key] = _HistogramValue(len(self.buckets))
+            if index < len(self.buckets):
+                hist.bucket_counts[index] += 1
+            hist.sum += value
+            hist.count += 1
+
+    @contextmanager
+    def time(self, **labels) -> Iterator[None]:
+        """Observe the wall-clock duration of the block (also when it raises)."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def value(self, **labels) -> float:
+        """Number of observations."""
+        with self._lock:
+            hist = self._histograms.get(_label_key(labels))
+            return float(hist.count) if hist else 0.0
+
+    def samples(self) -> List[Tuple[Dict[str, str], Dict[str, object]]]:
+        """(labels, {"count", "sum", "buckets": {le: cumulative count}}) per label set."""
+        result = []
+        with self._lock:
+            for key, hist in self._histograms.items():
+                cumulative, buckets = 0, {}
+                for le, n in zip(self.buckets, hist.bucket_counts):
+                    cumulative += n
+                    buckets[le] = cumulative
+                result.append((dict(key), {"count": hist.count, "sum": hist.sum, "buckets": buckets}))
+        return result
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if math.isnan(value):
+        return "NaN"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Dict[str, str], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = sorted(labels.items())
+    if extra is not None:
+        pairs.append(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in pairs) + "}"
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Callable[[], None]] = []
+
+    def _get_or_create(self, cls, name: str, description: str):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, description)
+            elif not isinstance(metric, cls):
+                raise ValueError(f"Metric {name} already registered as {metric.kind}")
+            return metric
+
+    def counter(self, name: str, description: str = "") -> Counter:
+        return self._get_or_create(Counter, name, description)
+
+    def gauge(self, name: str, description: str = "") -> Gauge:
+        return self._get_or_create(Gauge, name, description)
+
+    def histogram(self, name: str, description: str = "", buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = Histogram(name, description, buckets)
+            elif not isinstance(metric, Histogram):
+                raise ValueError(f"Metric {name} already registered as {metric.kind}")
+            return metric
+
+    def add_collector(self, collect: Callable[[], None]) -> None:
+        """Run `collect` before every snapshot/render, for gauges that are cheaper to read than to track."""
+        with self._lock:
+            self._collectors.append(collect)
+
+    def collect(self) -> None:
+        with self._lock:
+            collectors = list(self._collectors)
+        for collect in collectors:
+            try:
+                collect()
+            except Exception:
+                pass  # a broken collector must not break the metrics endpoint
+
+    def get(self, name: str) -> Optional[_Metric]:
+        with self._lock:
+            return self._metrics.get(name)
+
+    def metrics(self) -> List[_Metric]:
+        with self._lock:
+            return list(self._metrics.values())
+
+    def snapshot(self, prefix: str = "") -> Dict[str, object]:
+        """
+        JSON-friendly view: {name: value} for unlabelled metrics, else {name: [{labels, value}]}.
+        Histogram values are {"count", "sum", "buckets"}.
+        """
+        self.collect()
+        result: Dict[str, object] = {}
+        for metric in self.metrics():
+            if not metric.name.startswith(prefix):
+                continue
+            samples = metric.samples()
+            if not samples:
+                result[metric.name] = 0.0
+            elif len(samples) == 1 and not samples[0][0]:
+                result[metric.name] = samples[0][1]
+            else:
+                result[metric.name] = [{"labels": labels, "value": value} for labels, value in samples]
+        return result
+
+    def render_prometheus(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)."""
+        self.collect()
+        lines: List[str] = []
+        for metric in sorted(self.metrics(), key=lambda m: m.name):
+            if metric.description:
+                lines.append(f"# HELP {metric.name} {_escape(metric.description)}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            samples = metric.samples()
+            if isinstance(metric, Histogram):
+                for labels, hist in samples:
+                    for le, count in hist["buckets"].items():
+                        lines.append(f"{metric.name}_bucket{_format_labels(labels, ('le', _format_value(le)))} {count}")
+                    lines.append(f"{metric.name}_bucket{_format_labels(labels, ('le', '+Inf'))} {hist['count']}")
+                    lines.append(f"{metric.name}_sum{_format_labels(labels)} {_format_value(hist['sum'])}")
+                    lines.append(f"{metric.name}_count{_format_labels(labels)} {hist['count']}")
+            else:
+                if not samples and isinstance(metric, Counter):
+                    samples = [({}, 0.0)]
+                for labels, value in samples:
+                    lines.append(f"{metric.name}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
@@ -0,0 +1,65 @@
+"""
+Files appended to by every gunicorn worker.
+
+Each worker holds its own descriptor, so size or time rotation must not run in
+two workers at once, and a worker whose file was renamed away by another one
+must reopen the path rather than keep appending to the backup. Writers take
+InterProcessLock (an flock on <file>.lock) around write + rotate and reopen
+when is_current() is False. Where fcntl is unavailable the lock is a no-op.
+"""
+import os
+from typing import IO, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+LOCK_SUFFIX = ".lock"
+
+
+def lock_path(path: str) -> str:
+    return path + LOCK_SUFFIX
+
+
+def is_lock_file(filename: str) -> bool:
+    return filename.endswith(LOCK_SUFFIX)
+
+
+def is_current(stream: IO, path: str) -> bool:
+    """False when `path` no longer names the file `stream` has open (rotated away or deleted)."""
+    try:
+        on_disk = os.stat(path)
+    except FileNotFoundError:
+        return False
+    own = os.fstat(stream.fileno())
+    return (on_disk.st_dev, on_disk.st_ino) == (own.st_dev, own.st_ino)
+
+
+class InterProcessLock:
+    """
+    Exclusive flock on lock_path(path), held for the `with` block. It excludes
+    other processes only; threads sharing one instance must be serialised by
+    the caller.
+    """
+
+    def __init__(self, path: str):
+        self.path = lock_path(path)
+        self._file: Optional[IO] = None
+
+    def __enter__(self) -> "InterProcessLock":
+        if fcntl is not None:
+            if self._file is None:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                self._file = open(self.path, "a")
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        if self._file is not None:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
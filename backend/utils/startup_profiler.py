@@ -0,0 +1,186 @@
+"""
+Startup profiler for the FastAPI backend.
+
+Records two things while the app boots:
+  1. Per-module import time (cumulative and self), via a meta-path hook
+  2. Wall-clock time of named startup phases (logging setup, routers, warm-up...)
+
+The result is written to a JSON report (logs/startup_profile.json by default)
+so slow port-binds on Hugging Face Spaces can be traced to a concrete import
+or phase instead of guessed at.
+
+Off unless STARTUP_PROFILE=1: the import hook wraps every module loader, which
+code that checks the loader's type (importlib.resources, zipimport) does not
+expect, so it is meant for diagnosing a slow boot rather than for production.
+"""
+from __future__ import annotations
+
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from importlib.abc import MetaPathFinder
+from typing import Dict, List, Optional
+
+STARTUP_PROFILE_ENABLED = os.getenv("STARTUP_PROFILE", "0").lower() in ("1", "true", "yes")
+STARTUP_PROFILE_PATH = os.getenv("STARTUP_PROFILE_PATH", os.path.join("logs", "startup_profile.json"))
+# Only modules at least this slow (cumulative) are kept in the report
+STARTUP_PROFILE_MIN_MS = float(os.getenv("STARTUP_PROFILE_MIN_MS", "5"))
+
+
+class _TimedLoader:
+    """Wraps a module loader so exec_module is timed."""
+
+    def __init__(self, loader, profiler: "StartupProfiler"):
+        self._loader = loader
+        self._profiler = profiler
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        self._profiler._enter_import(module.__name__)
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._profiler._exit_import(module.__name__)
+
+
+class _TimingFinder(MetaPathFinder):
+    def __init__(self, profiler: "StartupProfiler"):
+        self._profiler = profiler
+
+    def find_spec(self, fullname, path, target=None):
+        # Delegate to the remaining finders, then wrap whatever loader they return
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is None:
+                continue
+            if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                spec.loader = _TimedLoader(spec.loader, self._profiler)
+            return spec
+        return None
+
+
+class StartupProfiler:
+    def __init__(self, enabled: bool = STARTUP_PROFILE_ENABLED, path: str = STARTUP_PROFILE_PATH):
+        self.enabled = enabled
+        self.path = path
+        self._finder: Optional[_TimingFinder] = None
+        self._lock = threading.Lock()
+        self._started_at: Optional[float] = None
+        self._local = threading.local()  # per-thread stack of [name, start, child_seconds]
+        self._imports: Dict[str, Dict[str, float]] = {}
+        self._phases: List[Dict[str, object]] = []
+
+    # -- import timing -----------------------------------------------------
+
+    def start(self) -> None:
+        if not self.enabled or self._finder is not None:
+            return
+        self._started_at = time.perf_counter()
+        self._finder = _TimingFinder(self)
+        sys.meta_path.insert(0, self._finder)
+
+    def stop_import_tracking(self) -> None:
+        if self._finder is None:
+            return
+        try:
+            sys.meta_path.remove(self._finder)
+        except ValueError:
+            pass
+        self._finder = None
+
+    def _stack(self) -> List[List]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _enter_import(self, name: str) -> None:
+        self._stack().append([name, time.perf_counter(), 0.0])
+
+    def _exit_import(self, name: str) -> None:
+        stack = self._stack()
+        if not stack:
+            return
+        entry_name, start, child_seconds = stack.pop()
+        cumulative = time.perf_counter() - start
+        # Modules are imported from the warm-up thread as well as the main one
+        with self._lock:
+            self._imports[entry_name] = {
+                "cumulative_ms": round(cumulative * 1000, 2),
+                "self_ms": round((cumulative - child_seconds) * 1000, 2),
+            }
+        if stack:
+            stack[-1][2] += cumulative
+
+    # -- phase timing ------------------------------------------------------
+
+    @contextmanager
+    def phase(self, name: str):
+        start = time.perf_counter()
+        error = None
+        try:
+            yield
+        except Exception as e:
+            error = str(e)
+            raise
+        finally:
+            self.record_phase(name, time.perf_counter() - start, error=error)
+
+    def record_phase(self, name: str, seconds: float, error: Optional[str] = None) -> None:
+        if not self.enabled:
+            return
+        item: Dict[str, object] = {
+            "name": name,
+            "seconds": round(seconds, 4),
+            "thread": threading.current_thread().name,
+        }
+        if error:
+            item["error"] = error
+        with self._lock:
+            self._phases.append(item)
+
+    # -- reporting ---------------------------------------------------------
+
+    def report(self) -> Dict[str, object]:
+        with self._lock:
+            imports = [
+                {"module": name, **timing}
+                for name, timing in self._imports.items()
+                if timing["cumulative_ms"] >= STARTUP_PROFILE_MIN_MS
+            ]
+            phases = list(self._phases)
+        imports.sort(key=lambda item: item["cumulative_ms"], reverse=True)
+        elapsed = time.perf_counter() - self._started_at if self._started_at else None
+        return {
+            "pid": os.getpid(),
+            "seconds_since_start": round(elapsed, 4) if elapsed is not None else None,
+            "phases": phases,
+            "imports": imports,
+        }
+
+    def write_report(self, path: Optional[str] = None) -> Optional[str]:
+        if not self.enabled:
+            return None
+        target = path or self.path
+        try:
+            os.makedirs(os.path.dirname(target) or ".", exist_ok=True)
+            tmp_path = f"{target}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.report(), f, indent=2)
+            os.replace(tmp_path, target)
+            return target
+        except OSError:
+            return None
+
+
+startup_profiler = StartupProfiler()
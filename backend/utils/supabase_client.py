@@ -1,7 +1,10 @@
 import os
-from supabase import create_client, Client
+from typing import TYPE_CHECKING
 from dotenv import load_dotenv
 
+if TYPE_CHECKING:
+    from supabase import Client
+
 # Load environment variables
 dotenv_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), '.env')
 load_dotenv(dotenv_path=dotenv_path)
@@ -10,7 +13,7 @@ load_dotenv(dotenv_path=dotenv_path)
 url: str = os.getenv("SUPABASE_URL")
 key: str = os.getenv("SUPABASE_KEY")
 
-def get_supabase_client() -> Client:
+def get_supabase_client() -> "Client":
     """
     Creates and returns a new Supabase client instance.
     This ensures that each request gets its own client, preventing
@@ -18,5 +21,8 @@ def get_supabase_client() -> Client:
     """
     if not url or not key:
         raise ValueError("SUPABASE_URL and SUPABASE_KEY must be set in the environment.")
+    # Imported lazily: the supabase client stack is only needed for uploads
+    from supabase import create_client
+
     return create_client(url, key)
 
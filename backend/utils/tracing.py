@@ -0,0 +1,198 @@
+"""
+Sentry trace sampling and custom spans.
+
+Head sampling (traces_sampler) keeps a small fraction of ordinary requests:
+TRACES_SAMPLE_RATE, overridden per route by TRACES_ROUTE_SAMPLE_RATES.
+
+Routes in TRACES_TAIL_ROUTES are recorded in full and decided when they
+finish (before_send_transaction). A transaction is sent when it:
+  - ended in an error status
+  - was slower than the rolling TRACES_TAIL_PERCENTILE for its route
+  - is picked at the route's rate
+Everything else is dropped before serialisation or upload.
+
+span() is a no-op until init_sentry() has run, so call sites cost nothing
+(and sentry_sdk is never imported) when no DSN is configured.
+"""
+import logging
+import random
+import threading
+from collections import deque
+from contextlib import nullcontext
+from datetime import datetime
+from typing import Deque, Dict, List, Optional, Tuple
+
+from backend.config import (
+    PROFILES_SAMPLE_RATE,
+    TRACES_ROUTE_SAMPLE_RATES,
+    TRACES_SAMPLE_RATE,
+    TRACES_TAIL_PERCENTILE,
+    TRACES_TAIL_ROUTES,
+)
+from backend.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Durations kept per tail route; the percentile is recomputed every RECOMPUTE_EVERY transactions
+WINDOW_SIZE = 500
+RECOMPUTE_EVERY = 25
+MIN_SAMPLES = 50
+
+_sentry = None
+_tail_decisions = metrics.counter("traces_tail_decisions_total", "Tail-sampled transactions by decision")
+
+
+def parse_route_rates(spec: str) -> List[Tuple[str, float]]:
+    """'/api/chat=0.1,/api/health=0' -> [(prefix, rate)], longest prefix first."""
+    rates = []
+    for part in (spec or "").split(","):
+        prefix, _, rate = part.strip().partition("=")
+        if not prefix or not rate:
+            continue
+        try:
+            rates.append((prefix.strip(), min(1.0, max(0.0, float(rate)))))
+        except ValueError:
+            logger.warning(f"Ignoring invalid trace sample rate {part!r}")
+    return sorted(rates, key=lambda item: len(item[0]), reverse=True)
+
+
+class TraceSampler:
+    def __init__(
+        self,
+        base_rate: float = TRACES_SAMPLE_RATE,
+        route_rates: str = TRACES_ROUTE_SAMPLE_RATES,
+        tail_routes: str = TRACES_TAIL_ROUTES,
+        percentile: float = TRACES_TAIL_PERCENTILE,
+    ):
+        self.base_rate = base_rate
+        self.route_rates = parse_route_rates(route_rates)
+        self.tail_routes = sorted(
+            (r.strip() for r in (tail_routes or "").split(",") if r.strip()), key=len, reverse=True
+        )
+        self.percentile = percentile
+        self._lock = threading.Lock()
+        self._durations: Dict[str, Deque[float]] = {}
+        self._thresholds: Dict[str, float] = {}
+        self._since_recompute: Dict[str, int] = {}
+
+    def rate_for(self, path: str) -> float:
+        for prefix, rate in self.route_rates:
+            if path.startswith(prefix):
+                return rate
+        return self.base_rate
+
+    def tail_route(self, path: str) -> Optional[str]:
+        for prefix in self.tail_routes:
+            if path.startswith(prefix):
+                return prefix
+        return None
+
+    # -- head ------------------------------------------------------------------
+
+    def traces_sampler(self, sampling_context: dict) -> float:
+        parent = sampling_context.get("parent_sampled")
+        if parent is not None:
+            return 1.0 if parent else 0.0  # follow the caller's decision for distributed traces
+        path = _path_from_context(sampling_context)
+        if path is None:
+            return self.base_rate  # background work, not a request
+        if self.tail_route(path) is not None:
+            return 1.0  # recorded in full; before_send_transaction decides
+        return self.rate_for(path)
+
+    # -- tail ------------------------------------------------------------------
+
+    def _observe(self, route: str, duration: float) -> Optional[float]:
+        """Record a duration; returns the route's current threshold (None while warming up)."""
+        with self._lock:
+            window = self._durations.setdefault(route, deque(maxlen=WINDOW_SIZE))
+            window.append(duration)
+            count = self._since_recompute.get(route, 0) + 1
+            if len(window) >= MIN_SAMPLES and (count >= RECOMPUTE_EVERY or route not in self._thresholds):
+                ordered = sorted(window)
+                index = min(len(ordered) - 1, int(len(ordered) * self.percentile / 100))
+                self._thresholds[route] = ordered[index]
+                count = 0
+            self._since_recompute[route] = count
+            return self._thresholds.get(route)
+
+    def before_send_transaction(self, event: dict, hint: dict) -> Optional[dict]:
+        path = _path_from_event(event)
+        route = self.tail_route(path) if path else None
+        if route is None:
+            return event  # head-sampled already
+        duration = _duration(event)
+        threshold = self._observe(route, duration) if duration is not None else None
+        status = (event.get("contexts", {}).get("trace", {}) or {}).get("status")
+        if status not in (None, "ok"):
+            decision = "error"
+        elif threshold is not None and duration is not None and duration >= threshold:
+            decision = "slow"
+        elif random.random() < self.rate_for(path):
+            decision = "sampled"
+        else:
+            decision = "dropped"
+        _tail_decisions.inc(decision=decision)
+        return None if decision == "dropped" else event
+
+
+def _path_from_context(sampling_context: dict) -> Optional[str]:
+    scope = sampling_context.get("asgi_scope")
+    if scope and scope.get("type") in ("http", "websocket"):
+        return scope.get("path", "")
+    return None
+
+
+def _path_from_event(event: dict) -> Optional[str]:
+    url = (event.get("request") or {}).get("url")
+    if url:
+        # Absolute URL; keep only the path
+        after_scheme = url.split("://", 1)[-1]
+        slash = after_scheme.find("/")
+        return after_scheme[slash:].split("?", 1)[0] if slash >= 0 else "/"
+    name = event.get("transaction")
+    return name if name and name.startswith("/") else None
+
+
+def _timestamp(value) -> Optional[float]:
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.timestamp()
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return datetime.fromisoformat(str(value).replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return None
+
+
+def _duration(event: dict) -> Optional[float]:
+    start, end = _timestamp(event.get("start_timestamp")), _timestamp(event.get("timestamp"))
+    return end - start if start is not None and end is not None else None
+
+
+trace_sampler = TraceSampler()
+
+
+def init_sentry(dsn: str) -> None:
+    global _sentry
+    import sentry_sdk
+
+    sentry_sdk.init(
+        dsn=dsn,
+        traces_sampler=trace_sampler.traces_sampler,
+        before_send_transaction=trace_sampler.before_send_transaction,
+        profiles_sample_rate=PROFILES_SAMPLE_RATE,
+    )
+    _sentry = sentry_sdk
+
+
+def span(op: str, name: str, **data):
+    """Child span of the current transaction; free when Sentry is not initialised."""
+    if _sentry is None:
+        return nullcontext()
+    current = _sentry.start_span(op=op, name=name)
+    for key, value in data.items():
+        current.set_data(key, value)
+    return current
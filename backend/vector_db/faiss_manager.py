@@ -1,42 +1,111 @@
-from langchain_community.vectorstores import FAISS
 from ..ai_core.knowledge.embeddings import get_embeddings
-from ..ai_core.knowledge.dynamic_loader import load_csv_data
-from ..ai_core.knowledge.static_loader import load_static_content
-from ..ai_core.knowledge.database_loader import load_database_content, make_doc_id
+from ..ai_core.knowledge.dynamic_loader import iter_csv_batches
+from ..ai_core.knowledge.csv_manifest import CsvManifest, make_csv_doc_id
+from ..ai_core.knowledge.static_loader import load_static_content, static_knowledge_paths
+from ..ai_core.knowledge.database_loader import MODEL_TO_DOC_TYPE, load_model_documents, make_doc_id
+import hashlib
+import json
 import logging
 import os
+import queue
 import threading
-from typing import List, Optional
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
 from langchain_core.documents import Document
-from backend.config import FAISS_SEARCH_K
+from backend.config import CSV_CHUNK_SIZE, FAISS_SEARCH_K, INGEST_MAX_WORKERS
+from backend.utils.metrics import metrics
+from backend.utils.tracing import span
 
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - [%(name)s] - %(levelname)s - %(message)s',
-    handlers=[logging.StreamHandler(), logging.FileHandler('faiss.log')]
-)
 logger = logging.getLogger(__name__)
 
+CSV_DATA_DIR = "backend/data"
+
 
 def _stable_ids_for_documents(documents: List[Document]) -> List[str]:
     ids = []
-    for i, doc in enumerate(documents):
+    for doc in documents:
         meta = doc.metadata or {}
         if meta.get("source") == "database" and meta.get("type") is not None and meta.get("id") is not None:
             ids.append(make_doc_id(str(meta["type"]), int(meta["id"])))
+        elif meta.get("row_hash") and meta.get("source"):
+            ids.append(make_csv_doc_id(str(meta["source"]), str(meta["row_hash"])))
         else:
-            ids.append(f"static:{meta.get('source', 'doc')}:{meta.get('type', 'x')}:{i}")
+            # Content-addressed, so editing one static entry does not shift the ids of the others
+            digest = hashlib.sha1(doc.page_content.encode("utf-8")).hexdigest()[:16]
+            ids.append(f"static:{meta.get('source', 'doc')}:{meta.get('type', 'x')}:{digest}")
     return ids
 
 
+def _dedupe_by_id(documents: List[Document]) -> Tuple[List[Document], List[str]]:
+    """Identical static entries map to one id; keep the first."""
+    unique_docs: List[Document] = []
+    unique_ids: List[str] = []
+    seen = set()
+    for doc, doc_id in zip(documents, _stable_ids_for_documents(documents)):
+        if doc_id in seen:
+            continue
+        seen.add(doc_id)
+        unique_docs.append(doc)
+        unique_ids.append(doc_id)
+    return unique_docs, unique_ids
+
+
+class _IndexSnapshot:
+    """
+    Read access to the index a rebuild is about to replace, so documents whose
+    id and text are unchanged reuse their vector instead of being re-embedded.
+    """
+
+    def __init__(self, store, lock):
+        self._store = store
+        self._lock = lock
+        self._positions = self._index_positions()
+
+    def _index_positions(self) -> Dict[str, int]:
+        return {doc_id: pos for pos, doc_id in self._store.index_to_docstore_id.items()}
+
+    def has_all(self, doc_ids: List[str]) -> bool:
+        with self._lock:
+            return all(doc_id in self._positions for doc_id in doc_ids)
+
+    def document(self, doc_id: str) -> Optional[Document]:
+        with self._lock:
+            doc = self._store.docstore.search(doc_id)
+        return doc if isinstance(doc, Document) else None
+
+    def vector(self, doc_id: str, text: str) -> Optional[List[float]]:
+        with self._lock:
+            pos = self._positions.get(doc_id)
+            if pos is None:
+                return None
+            if self._store.index_to_docstore_id.get(pos) != doc_id:
+                # CDC deleted something since the snapshot; positions shifted
+                self._positions = self._index_positions()
+                pos = self._positions.get(doc_id)
+                if pos is None:
+                    return None
+            doc = self._store.docstore.search(doc_id)
+            if not isinstance(doc, Document) or doc.page_content != text:
+                return None
+            return self._store.index.reconstruct(pos).tolist()
+
+
 class FAISSManager:
     def __init__(self):
         self.vector_store = None
-        self.embeddings = get_embeddings()
         self.profile_data = {}
         self.knowledge_version = 0
+        self.last_rebuild: Dict[str, object] = {}
+        self.csv_manifest = CsvManifest()
+        self._static_ids: Set[str] = set()
         self._store_lock = threading.RLock()
 
+    @property
+    def embeddings(self):
+        # Resolved on first use so importing the app does not load the embedding model
+        return get_embeddings()
+
     def initialize(self, documents: List[Document]):
         logger.info(f"Initializing FAISS with {len(documents)} documents")
         try:
@@ -46,6 +115,8 @@ class FAISSManager:
                 logger.warning("No documents provided for FAISS initialization")
                 return
 
+            from langchain_community.vectorstores import FAISS
+
             ids = _stable_ids_for_documents(documents)
             new_store = FAISS.from_documents(documents, self.embeddings, ids=ids)
             with self._store_lock:
@@ -56,22 +127,300 @@ class FAISSManager:
             with self._store_lock:
                 self.vector_store = None
 
+    def _load_static_source(self) -> List[List[Document]]:
+        static_docs, profile_data = load_static_content()
+        self.profile_data = profile_data
+        static_docs, _ = _dedupe_by_id(static_docs)
+        return [static_docs]
+
+    def _csv_source(self, path: str, snapshot: Optional[_IndexSnapshot], row_ids: Dict[str, List[str]]):
+        """
+        Unchanged file whose rows are all in the live index: hand back the indexed
+        documents without parsing. Otherwise stream-parse it; the consumer re-embeds
+        only rows whose id (content hash) is not already indexed.
+        """
+        filename = os.path.basename(path)
+        if snapshot is not None and self.csv_manifest.is_unchanged(path):
+            known_ids = self.csv_manifest.row_ids(filename)
+            if snapshot.has_all(known_ids):
+                carried = [doc for doc in (snapshot.document(doc_id) for doc_id in known_ids) if doc]
+                for i in range(0, len(carried), CSV_CHUNK_SIZE):
+                    yield carried[i:i + CSV_CHUNK_SIZE]
+                row_ids[path] = known_ids
+                return
+
+        ids: List[str] = []
+        for batch in iter_csv_batches(path):
+            ids.extend(_stable_ids_for_documents(batch))
+            yield batch
+        row_ids[path] = ids
+
+    def _ingest_sources(
+        self,
+        snapshot: Optional[_IndexSnapshot] = None,
+        csv_row_ids: Optional[Dict[str, List[str]]] = None,
+    ) -> List[Tuple[str, Callable[[], Iterable[List[Document]]]]]:
+        """
+        Independent, I/O-bound sources for a full rebuild: one task per CSV (streamed in chunks),
+        static JSON, and one per DB table. Each loader yields batches of Documents.
+        """
+        csv_row_ids = csv_row_ids if csv_row_ids is not None else {}
+        sources: List[Tuple[str, Callable[[], Iterable[List[Document]]]]] = []
+        os.makedirs(CSV_DATA_DIR, exist_ok=True)
+        for filename in sorted(os.listdir(CSV_DATA_DIR)):
+            if filename.endswith(".csv"):
+                path = os.path.join(CSV_DATA_DIR, filename)
+                sources.append((f"csv:{filename}", lambda path=path: self._csv_source(path, snapshot, csv_row_ids)))
+
+        sources.append(("static", self._load_static_source))
+
+        for model_cls, doc_type in MODEL_TO_DOC_TYPE.items():
+            sources.append((f"db:{doc_type}", lambda model_cls=model_cls: [load_model_documents(model_cls)]))
+        return sources
+
     def update_vector_store(self):
+        """
+        Full rebuild. Sources are loaded concurrently on a thread pool (each DB table
+        over its own pooled connection) and hand batches to this thread through a
+        bounded queue, so embedding overlaps with the remaining I/O and large CSVs
+        never sit fully in memory. Documents already in the live index with the same
+        id and text keep their vectors; CSVs unchanged per the manifest are not parsed.
+        """
         logger.info("Updating vector store (full rebuild)...")
-        csv_docs = []
-        data_dir = "backend/data"
-        os.makedirs(data_dir, exist_ok=True)
-        for filename in os.listdir(data_dir):
-            if filename.endswith(".csv"):
-                csv_docs.extend(load_csv_data(os.path.join(data_dir, filename)))
+        rebuild_start = time.perf_counter()
+        with self._store_lock:
+            snapshot = _IndexSnapshot(self.vector_store, self._store_lock) if self.vector_store is not None else None
+        csv_row_ids: Dict[str, List[str]] = {}
+        sources = self._ingest_sources(snapshot, csv_row_ids)
+        batches: "queue.Queue[Tuple[str, object]]" = queue.Queue(maxsize=INGEST_MAX_WORKERS * 2)
+        stop = threading.Event()
+        done_marker = object()
+
+        def _put(item) -> bool:
+            while not stop.is_set():
+                try:
+                    batches.put(item, timeout=0.5)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def _produce(name, loader):
+            start = time.perf_counter()
+            error = None
+            try:
+                for batch in loader():
+                    if batch and not _put((name, batch)):
+                        return
+            except Exception as e:
+                error = str(e)
+                logger.error(f"Failed to load source {name}: {e}")
+            _put((name, (done_marker, time.perf_counter() - start, error)))
+
+        texts: List[str] = []
+        vectors: List[List[float]] = []
+        metadatas: List[dict] = []
+        ids: List[str] = []
+        static_ids: Set[str] = set()
+        timings: Dict[str, Dict[str, object]] = {
+            name: {"documents": 0, "reused": 0, "embed_seconds": 0.0} for name, _ in sources
+        }
+
+        with ThreadPoolExecutor(max_workers=INGEST_MAX_WORKERS, thread_name_prefix="ingest") as pool:
+            for name, loader in sources:
+                pool.submit(_produce, name, loader)
+            try:
+                remaining = len(sources)
+                while remaining:
+                    name, item = batches.get()
+                    timing = timings[name]
+                    if isinstance(item, tuple) and item and item[0] is done_marker:
+                        remaining -= 1
+                        _, load_seconds, error = item
+                        timing["load_seconds"] = round(load_seconds, 3)
+                        timing["embed_seconds"] = round(timing["embed_seconds"], 3)
+                        if error:
+                            timing["error"] = error
+                        logger.info(
+                            f"Source {name}: {timing['documents']} docs ({timing['reused']} reused), "
+                            f"load {load_seconds:.2f}s, embed {timing['embed_seconds']:.2f}s"
+                        )
+                        continue
+
+                    embed_start = time.perf_counter()
+                    batch_ids = _stable_ids_for_documents(item)
+                    batch_vectors: List[Optional[List[float]]] = [
+                        snapshot.vector(doc_id, doc.page_content) if snapshot is not None else None
+                        for doc, doc_id in zip(item, batch_ids)
+                    ]
+                    missing = [i for i, vector in enumerate(batch_vectors) if vector is None]
+                    if missing:
+                        fresh = self.embeddings.embed_documents([item[i].page_content for i in missing])
+                        for i, vector in zip(missing, fresh):
+                            batch_vectors[i] = vector
+                    vectors.extend(batch_vectors)
+                    texts.extend(doc.page_content for doc in item)
+                    metadatas.extend(doc.metadata for doc in item)
+                    ids.extend(batch_ids)
+                    if name == "static":
+                        static_ids.update(batch_ids)
+                    timing["documents"] += len(item)
+                    timing["reused"] += len(item) - len(missing)
+                    timing["embed_seconds"] += time.perf_counter() - embed_start
+            finally:
+                # Unblock producers if embedding failed part-way
+                stop.set()
+
+        self._build_from_embeddings(texts, vectors, metadatas, ids)
+        self._static_ids = static_ids
+        self._record_csv_manifest(csv_row_ids)
+        self.last_rebuild = {
+            "total_seconds": round(time.perf_counter() - rebuild_start, 3),
+            "documents": len(ids),
+            "sources": timings,
+        }
+        logger.info(f"Vector store updated in {self.last_rebuild['total_seconds']}s.")
+
+    def _build_from_embeddings(self, texts: List[str], vectors: List[List[float]], metadatas: List[dict], ids: List[str]) -> None:
+        if not texts:
+            with self._store_lock:
+                self.vector_store = None
+            logger.warning("No documents provided for FAISS initialization")
+            return
+        try:
+            from langchain_community.vectorstores import FAISS
+
+            new_store = FAISS.from_embeddings(
+                list(zip(texts, vectors)),
+                self.embeddings,
+                metadatas=metadatas,
+                ids=ids,
+            )
+            with self._store_lock:
+                self.vector_store = new_store
+            logger.info(f"FAISS vector store initialized with {len(ids)} documents")
+        except Exception as e:
+            logger.error(f"Failed to initialize FAISS: {str(e)}")
+            with self._store_lock:
+                self.vector_store = None
+
+    def _record_csv_manifest(self, csv_row_ids: Dict[str, List[str]]) -> None:
+        present = {os.path.basename(path) for path in csv_row_ids}
+        for path, row_ids in csv_row_ids.items():
+            self.csv_manifest.record(path, row_ids)
+        for filename in self.csv_manifest.filenames():
+            if filename not in present:
+                self.csv_manifest.forget(filename)
+        try:
+            self.csv_manifest.save()
+        except OSError as e:
+            logger.warning(f"Could not write CSV manifest: {e}")
+
+    def sync_csv_sources(self) -> Dict[str, object]:
+        """
+        Incremental CSV refresh against the live index: unchanged files are skipped,
+        changed files only upsert added/changed rows and delete removed rows by id.
+        """
+        with self._store_lock:
+            if self.vector_store is None:
+                raise RuntimeError("Vector store is not initialized; run a full rebuild first")
+
+        report: Dict[str, object] = {"unchanged": [], "changed": {}, "removed_files": []}
+        os.makedirs(CSV_DATA_DIR, exist_ok=True)
+        present = set()
+        for filename in sorted(os.listdir(CSV_DATA_DIR)):
+            if not filename.endswith(".csv"):
+                continue
+            path = os.path.join(CSV_DATA_DIR, filename)
+            present.add(filename)
+            old_ids = set(self.csv_manifest.row_ids(filename))
+            indexed = self._indexed_ids(old_ids)
+            if self.csv_manifest.is_unchanged(path) and indexed == old_ids:
+                report["unchanged"].append(filename)
+                continue
+
+            new_ids: List[str] = []
+            added = 0
+            for batch in iter_csv_batches(path):
+                batch_ids = _stable_ids_for_documents(batch)
+                new_ids.extend(batch_ids)
+                fresh = [(doc, doc_id) for doc, doc_id in zip(batch, batch_ids) if doc_id not in indexed]
+                if fresh:
+                    self.upsert_documents([doc for doc, _ in fresh], [doc_id for _, doc_id in fresh])
+                    added += len(fresh)
+            removed = sorted(old_ids - set(new_ids))
+            self.delete_documents(removed)
+            self.csv_manifest.record(path, new_ids)
+            report["changed"][filename] = {"rows": len(new_ids), "upserted": added, "deleted": len(removed)}
+
+        for filename in self.csv_manifest.filenames():
+            if filename not in present:
+                self.delete_documents(self.csv_manifest.row_ids(filename))
+                self.csv_manifest.forget(filename)
+                report["removed_files"].append(filename)
+
+        self.csv_manifest.save()
+        logger.info(f"CSV sync: {report}")
+        return report
+
+    def sync_static_sources(self) -> Dict[str, object]:
+        """
+        Re-read the static knowledge JSON and apply only the difference to the live index.
+        Ids are content hashes, so unchanged entries are untouched and an edited entry
+        is one delete plus one upsert.
+        """
+        with self._store_lock:
+            if self.vector_store is None:
+                raise RuntimeError("Vector store is not initialized; run a full rebuild first")
+
+        # A file caught mid-write would parse as empty and wipe its documents; wait for the next event
+        for path in static_knowledge_paths():
+            if os.path.exists(path):
+                try:
+                    with open(path, "r", encoding="utf-8") as f:
+                        json.load(f)
+                except ValueError as e:
+                    logger.warning(f"Skipping static reload, {path} is not valid JSON yet: {e}")
+                    return {"skipped": True, "upserted": 0, "deleted": 0}
 
         static_docs, profile_data = load_static_content()
+        docs, doc_ids = _dedupe_by_id(static_docs)
+        current = dict(zip(doc_ids, docs))
+        previous = self._static_ids
+
+        removed = sorted(previous - current.keys())
+        added = [doc_id for doc_id in doc_ids if doc_id not in previous]
+        self.delete_documents(removed)
+        if added:
+            self.upsert_documents([current[doc_id] for doc_id in added], added)
+
+        self._static_ids = set(current)
         self.profile_data = profile_data
+        report = {"skipped": False, "documents": len(current), "upserted": len(added), "deleted": len(removed)}
+        logger.info(f"Static knowledge sync: {report}")
+        return report
+
+    def _indexed_ids(self, doc_ids) -> set:
+        with self._store_lock:
+            if self.vector_store is None:
+                return set()
+            docstore = self.vector_store.docstore
+            return {doc_id for doc_id in doc_ids if isinstance(docstore.search(doc_id), Document)}
 
-        db_docs = load_database_content()
-        all_docs = csv_docs + static_docs + db_docs
-        self.initialize(all_docs)
-        logger.info("Vector store updated.")
+    def indexed_documents(self, prefix: str = "") -> Dict[str, str]:
+        """{doc_id: page_content} for every indexed document whose id starts with prefix."""
+        with self._store_lock:
+            if self.vector_store is None:
+                return {}
+            docstore = self.vector_store.docstore
+            result = {}
+            for doc_id in self.vector_store.index_to_docstore_id.values():
+                if not doc_id.startswith(prefix):
+                    continue
+                doc = docstore.search(doc_id)
+                if isinstance(doc, Document):
+                    result[doc_id] = doc.page_content
+            return result
 
     def delete_documents(self, ids: List[str]) -> None:
         if not ids:
@@ -94,31 +443,49 @@ class FAISSManager:
                 self.initialize(documents)
                 return
             try:
-                # Replace existing vectors for the same ids
-                try:
-                    self.vector_store.delete(doc_ids)
-                except Exception:
-                    pass
+                # Replace existing vectors for the same ids; FAISS.delete rejects the
+                # whole call if any id is unknown, so only pass ids that are indexed
+                existing = list(self._indexed_ids(doc_ids))
+                if existing:
+                    self.vector_store.delete(existing)
                 self.vector_store.add_documents(documents, ids=doc_ids)
             except Exception as e:
                 logger.error(f"FAISS upsert failed: {e}", exc_info=True)
                 raise
 
-    def search(self, query, k=FAISS_SEARCH_K, filter=None):
+    def index_size(self) -> int:
+        with self._store_lock:
+            return self.vector_store.index.ntotal if self.vector_store is not None else 0
+
+    def embed_query(self, query: str) -> List[float]:
+        with span("vector.embed", "embed query"):
+            return self.embeddings.embed_query(query)
+
+    def search_by_vector(self, embedding: List[float], k=FAISS_SEARCH_K, filter=None):
         # No DB polling here — index is kept fresh via CDC on write.
-        logger.info(f"Searching FAISS for query: {query[:50]}...")
         with self._store_lock:
             store = self.vector_store
         if store is None:
             logger.warning("FAISS vector store not initialized")
             return []
         try:
-            results = store.similarity_search(query, k=k, filter=filter)
-            logger.info(f"Found {len(results)} results")
+            with span("vector.search", "faiss similarity_search", k=k, filter=str(filter)):
+                results = store.similarity_search_by_vector(embedding, k=k, filter=filter)
+            logger.debug(f"Found {len(results)} results")
             return results
         except Exception as e:
             logger.error(f"Error in FAISS search: {str(e)}")
             return []
 
+    def search(self, query, k=FAISS_SEARCH_K, filter=None):
+        logger.debug(f"Searching FAISS for query: {query[:50]}...")
+        if self.vector_store is None:
+            logger.warning("FAISS vector store not initialized")
+            return []
+        return self.search_by_vector(self.embed_query(query), k=k, filter=filter)
+
 
 faiss_manager = FAISSManager()
+
+_index_documents = metrics.gauge("faiss_index_documents", "Vectors in the FAISS index")
+metrics.add_collector(lambda: _index_documents.set(faiss_manager.index_size()))
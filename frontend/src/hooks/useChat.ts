@@ -6,6 +6,8 @@ export interface Conversation {
   id: string;
   title: string;
   messages: Message[];
+  // Server-side session holding this conversation's history
+  sessionId?: string;
 }
 
 // Define the return type of the hook for clear component contracts.
@@ -40,6 +42,7 @@ export const useChat = (): UseChatReturn => {
 
     let currentConversationId = activeConversationId;
     let conversationHistory: Message[] = [];
+    let sessionId: string | undefined;
 
     // If there is no active conversation, create a new one.
     if (!currentConversationId) {
@@ -56,6 +59,7 @@ export const useChat = (): UseChatReturn => {
       // Add the message to the currently active conversation.
       const activeConvo = conversations.find(c => c.id === currentConversationId);
       conversationHistory = activeConvo?.messages || [];
+      sessionId = activeConvo?.sessionId;
       
       setConversations(prev =>
         prev.map(convo =>
@@ -72,11 +76,10 @@ export const useChat = (): UseChatReturn => {
         assistant: msg.sender === 'bot' ? msg.text : '',
       }));
 
-      const payload: ChatRequestPayload = {
-        message: text,
-        history,
-        user_name: userName,
-      };
+      // With a session the server already has the history; only the new message is sent
+      const payload: ChatRequestPayload = sessionId
+        ? { message: text, user_name: userName, session_id: sessionId }
+        : { message: text, history, user_name: userName };
 
       const response = await sendMessageToBackend(payload);
       const botMessage: Message = { id: Date.now().toString() + '-bot', text: response.response, sender: 'bot', timestamp: new Date(), file_url: response.file_url };
@@ -85,7 +88,7 @@ export const useChat = (): UseChatReturn => {
       setConversations(prev =>
         prev.map(convo =>
           convo.id === currentConversationId
-            ? { ...convo, messages: [...convo.messages, botMessage] }
+            ? { ...convo, messages: [...convo.messages, botMessage], sessionId: response.session_id ?? convo.sessionId }
             : convo
         )
       );
@@ -1,4 +1,4 @@
-import { useQueries } from '@tanstack/react-query';
+import { useQueries, useQueryClient } from '@tanstack/react-query';
 import * as api from '../services/api';
 
 export interface PortfolioData {
@@ -11,45 +11,28 @@ export interface PortfolioData {
     cvs: api.CV[];
 }
 
+const COLLECTIONS = ['projects', 'skills', 'experience', 'education', 'certificates', 'moments', 'cvs'] as const;
+
 export const usePortfolioData = () => {
+    const queryClient = useQueryClient();
+
+    // Every collection is read from one GET /api/portfolio snapshot. The per-collection
+    // query keys stay the same, so admin mutations that invalidate e.g. ['projects']
+    // still refresh this page; concurrent refetches share one in-flight request and
+    // an unchanged snapshot comes back as a 304.
+    const fetchSnapshot = () =>
+        queryClient.fetchQuery({
+            queryKey: ['portfolio'],
+            queryFn: api.getPortfolio,
+            staleTime: 0,
+        });
+
     const results = useQueries({
-        queries: [
-            {
-                queryKey: ['projects'],
-                queryFn: api.getAdminProjects,
-                staleTime: 1000 * 60 * 5,
-            },
-            {
-                queryKey: ['skills'],
-                queryFn: api.getAdminSkills,
-                staleTime: 1000 * 60 * 5,
-            },
-            {
-                queryKey: ['experience'],
-                queryFn: api.getAdminExperience,
-                staleTime: 1000 * 60 * 5,
-            },
-            {
-                queryKey: ['education'],
-                queryFn: api.getAdminEducation,
-                staleTime: 1000 * 60 * 5,
-            },
-            {
-                queryKey: ['certificates'],
-                queryFn: api.getAdminCertificates,
-                staleTime: 1000 * 60 * 5,
-            },
-            {
-                queryKey: ['moments'],
-                queryFn: api.getAdminMoments,
-                staleTime: 1000 * 60 * 5,
-            },
-            {
-                queryKey: ['cvs'],
-                queryFn: api.getAdminCVs,
-                staleTime: 1000 * 60 * 5,
-            },
-        ],
+        queries: COLLECTIONS.map((key) => ({
+            queryKey: [key],
+            queryFn: async () => (await fetchSnapshot())[key],
+            staleTime: 1000 * 60 * 5,
+        })),
     });
 
     const isLoading = results.some((result) => result.isLoading);
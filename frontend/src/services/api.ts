@@ -218,13 +218,16 @@ apiClient.interceptors.response.use(
 
 export interface ChatRequestPayload {
   message: string;
-  history: { user: string; assistant: string }[];
+  // Only needed to seed a conversation the server has no session for
+  history?: { user: string; assistant: string }[];
   user_name: string;
+  session_id?: string;
 }
 
 export interface ChatResponseData {
   response: string;
   file_url?: string;
+  session_id?: string;
 }
 
 export const sendMessageToBackend = async (payload: ChatRequestPayload): Promise<ChatResponseData> => {
@@ -495,5 +498,21 @@ export const getStats = async (): Promise<Stats> => {
   return apiClient.get('/stats');
 };
 
+export interface PortfolioSnapshot {
+  version: string;
+  projects: Project[];
+  skills: TechnicalSkill[];
+  experience: WorkExperience[];
+  education: Education[];
+  certificates: Certificate[];
+  moments: MemorableMoment[];
+  cvs: CV[];
+  stats: Stats;
+}
+
+export const getPortfolio = async (): Promise<PortfolioSnapshot> => {
+  return apiClient.get('/portfolio');
+};
+
 export { };
 